@@ -1,21 +1,38 @@
 from asyncio import sleep as a_sleep
 from discord import Message, Intents, TextChannel
+from discord.abc import Messageable
 from discord.client import Client
+from discord_bot.bridge import Chat_Bridge
+from discord_bot.dispatcher import Discord_Dispatcher, PRIORITY_BULK, PRIORITY_CHAT, PRIORITY_REPLY
 import logging
-from modules.config import Config, _Ark_Server
+from modules.config import Config
+from modules.message_index import Message_Index
 from modules.rcon import Rcon_Session, TAG_DISCORD
 from modules.threading import restart, stop
 from time import time
-from typing import Union
+from typing import Optional, Union
 
 logger = logging.getLogger("main")
 
+_index: Optional[Message_Index] = None
+
+def _rebuild_index() -> None:
+    """
+    依當前設置重建訊息索引，於設置檔更新後呼叫。
+    """
+    global _index
+    config = Config.current
+    _index = Message_Index(config.channels, (config.discord.admin_role,), config.discord.prefixs)
+
+def _message_index() -> Message_Index:
+    if _index == None:
+        _rebuild_index()
+    return _index
+
+Config.subscribe(_rebuild_index)
+
 def _search_rcon(channel_id: int) -> Union[Rcon_Session, None]:
-    server_config: _Ark_Server
-    for server_config in Config.servers:
-        if channel_id == server_config.discord.chat_channel:
-            return server_config.rcon_session
-    return None
+    return _message_index().rcon_session(channel_id)
 
 class Custom_Client(Client):
     def __init__(self, *args, **kwargs):
@@ -28,6 +45,7 @@ class Custom_Client(Client):
         if self.first_connect:
             self.first_connect = False
             logger.warning("Discord Bot Connected!")
+            self.dispatcher = Discord_Dispatcher(self._send)
             self.bg_task_1 = self.loop.create_task(self.state_update())
             self.bg_task_2 = self.loop.create_task(self.chat_update())
             self.main_thread_command = ""
@@ -67,49 +85,67 @@ class Custom_Client(Client):
 
     async def chat_update(self):
         """
-        聊天同步。
+        聊天同步，由`Chat_Bridge`於有訊息時喚醒。
         """
         logger.info("chat_update Start.")
-        while True:
-            for server_config in Config.servers:
-                rcon_session: Rcon_Session = server_config.rcon_session
-                mes = rcon_session.get(TAG_DISCORD)
-                channel: TextChannel = None
-                chat_content = None
-                while mes != None:
-                    arg = mes["args"]
-                    if arg["type"] == "chat":
-                        if channel == None:
-                            channel = self.get_channel(arg["target"])
-                            chat_content = mes["reply"]
-                        else:
-                            chat_content += f"\n{mes['reply']}"
-                    elif arg["type"] == "user_command":
-                        if type(arg["target"]) == int:
-                            channel = self.get_channel(arg["target"])
-                            await channel.send(mes["reply"])
-                        else:
-                            await arg["target"].send(mes["reply"])
-                    mes = rcon_session.get(TAG_DISCORD)
-                if chat_content != None and channel != None:
-                    await channel.send(chat_content)
-                await a_sleep(1)
+        # 合併由`Discord_Dispatcher`處理，橋接不再等待
+        self.chat_bridge = Chat_Bridge(self.loop, window=0)
+        self._attach_sessions()
+        Config.subscribe(self._attach_sessions)
+        try:
+            await self.chat_bridge.run(self._deliver)
+        finally:
+            Config.unsubscribe(self._attach_sessions)
+
+    def _attach_sessions(self) -> None:
+        """
+        監聽所有伺服器的Discord佇列，設置檔更新後重新呼叫以涵蓋新的連線。
+        """
+        for server_config in Config.servers:
+            self.chat_bridge.attach(server_config.rcon_session)
+
+    async def _deliver(self, messages: list[dict]):
+        """
+        將一批訊息交由`Discord_Dispatcher`依頻道合併與限速送出。
+        """
+        for mes in messages:
+            arg = mes["args"]
+            if arg["type"] == "chat":
+                priority = PRIORITY_BULK if arg.get("bulk", False) else PRIORITY_CHAT
+            elif arg["type"] == "user_command":
+                priority = PRIORITY_REPLY
+            else:
+                continue
+            self.dispatcher.submit(arg["target"], mes["reply"], priority)
+
+    async def _send(self, target: Union[int, Messageable], content: str):
+        """
+        送出一則訊息，`target`為頻道ID或使用者。
+        """
+        if type(target) == int:
+            channel: TextChannel = self.get_channel(target)
+            if channel == None:
+                logger.warning(f"Channel {target} not found.")
+                return
+            await channel.send(content)
+        else:
+            await target.send(content)
 
     async def on_message(self, message: Message):
         if message.author == self.user: return
         logger.debug(f"[{message.channel.name}][{message.author.display_name}]{message.content}")
-        if _search_rcon(message.channel.id) == None: return
-        if Config.discord.admin_role not in [role.id for role in message.author.roles]: return
+        index = _message_index()
+        rcon_session = index.rcon_session(message.channel.id)
+        if rcon_session == None: return
+        if not index.is_admin(role.id for role in message.author.roles): return
 
         content = message.content
         logger.info(f"[{message.channel.name}][{message.author.display_name}]{content}")
 
-        # 判斷並移除開頭
-        if not content.startswith(tuple(Config.discord.prefixs)): return
-        for prefix in Config.discord.prefixs:
-            if content.startswith(prefix):
-                content = content[len(prefix):]
-                break
+        # 判斷並移除開頭(最長的前綴)
+        prefix_length = index.prefixs.match(content)
+        if prefix_length == None: return
+        content = content[prefix_length:]
         # 指令切分
         content_list = content.split(" ")
         if content_list[0] == "del":
@@ -120,9 +156,8 @@ class Custom_Client(Client):
                 backup = False
             else:
                 backup = True
-            rcon_session = _search_rcon(message.channel.id)
             delay = 5
-            try: delay = int(content_list[2])
+            try: delay = float(content_list[2])
             except ValueError: pass
             except IndexError: pass
             reason = " ".join(content_list[3:])
@@ -135,10 +170,30 @@ class Custom_Client(Client):
                 rcon_session.save(TAG_DISCORD, backup=backup, delay=delay, reason=reason)
             elif content_list[1] == "restart":
                 rcon_session.restart(TAG_DISCORD, backup=backup, delay=delay, reason=reason)
+            elif content_list[1] == "reschedule":
+                rcon_session.reschedule(TAG_DISCORD, delay)
             elif content_list[1] == "clear":
                 rcon_session.clear(TAG_DISCORD)
             elif content_list[1] == "backup":
                 rcon_session.backup(TAG_DISCORD)
+            elif content_list[1] == "restore" and len(content_list) > 2 and content_list[2] != "":
+                # c restore <快照名稱>
+                # 查詢備份目錄需讀取檔案，不在事件迴圈中執行
+                await self.loop.run_in_executor(None, rcon_session.restore, TAG_DISCORD, content_list[2])
+            elif content_list[1] == "backups":
+                # c backups [數量]
+                limit = 10
+                if len(content_list) > 2 and content_list[2] != "":
+                    try: limit = int(content_list[2])
+                    except ValueError:
+                        self.dispatcher.submit(message.channel.id, f"數量需為整數: {content_list[2]}", PRIORITY_REPLY)
+                        return
+                backups = await self.loop.run_in_executor(None, rcon_session.backups, limit)
+                lines = [
+                    f"{entry['name']} {entry['total_bytes'] / 1048576:.1f} MiB {entry['checksum'][:12]}"
+                    for entry in backups
+                ]
+                self.dispatcher.submit(message.channel.id, "\n".join(lines) if lines else "沒有備份。", PRIORITY_REPLY)
             else:
                 target = message.author
                 # if message.author.dm_channel.can_send():
@@ -0,0 +1,95 @@
+import asyncio
+import logging
+from modules.rcon import Rcon_Session, TAG_DISCORD
+from typing import Awaitable, Callable
+
+logger = logging.getLogger("main")
+
+# 收到第一則訊息後再等待的時間(秒)，期間的訊息合併送出
+_COALESCE_WINDOW = 0.25
+
+class Chat_Bridge():
+    """
+    RCON 至Discord的訊息橋接。
+    `Rcon_Session`放入Discord佇列時以`call_soon_threadsafe`喚醒Bot事件迴圈，
+    閒置時不佔用CPU，延遲與伺服器數量無關。
+    """
+    def __init__(
+        self,
+        loop: asyncio.AbstractEventLoop,
+        window: float=_COALESCE_WINDOW
+    ) -> None:
+        """
+        初始化`Chat_Bridge()`，需於`loop`所在的線程中呼叫。
+
+        loop: :class:`asyncio.AbstractEventLoop`
+            Bot 的事件迴圈。
+        window: :class:`float`
+            合併訊息的等待時間(秒)。
+
+        return: :class:`None`
+        """
+        self.loop = loop
+        self.window = window
+        self._inbox: asyncio.Queue[Rcon_Session] = asyncio.Queue()
+        # 已排入喚醒、尚未取出訊息的連線
+        self._armed: set[int] = set()
+
+    def attach(self, rcon_session: Rcon_Session) -> None:
+        """
+        監聽`rcon_session`的Discord佇列，可於任意線程中呼叫，重複呼叫無副作用。
+        佇列中已有的訊息會立即送出。
+
+        rcon_session: :class:`Rcon_Session`
+            連線。
+
+        return: :class:`None`
+        """
+        rcon_session.queues[TAG_DISCORD].set_listener(lambda: self._notify(rcon_session))
+        self._notify(rcon_session)
+
+    def _notify(self, rcon_session: Rcon_Session) -> None:
+        """
+        於放入訊息的線程中呼叫，同一連線在取出前只喚醒一次。
+        """
+        key = id(rcon_session)
+        if key in self._armed:
+            return
+        self._armed.add(key)
+        self.loop.call_soon_threadsafe(self._inbox.put_nowait, rcon_session)
+
+    def _drain(self, rcon_session: Rcon_Session) -> list[dict]:
+        # 先解除標記再取出，取出期間放入的訊息會再次喚醒
+        self._armed.discard(id(rcon_session))
+        messages = []
+        data = rcon_session.get(TAG_DISCORD)
+        while data != None:
+            messages.append(data)
+            data = rcon_session.get(TAG_DISCORD)
+        return messages
+
+    async def run(self, deliver: Callable[[list[dict]], Awaitable[None]]) -> None:
+        """
+        持續轉發訊息。
+
+        deliver: :class:`Callable[[list[dict]], Awaitable[None]]`
+            處理一批訊息(依放入順序)的協程函式。
+
+        return: :class:`None`
+        """
+        logger.info("Chat_Bridge Start")
+        while True:
+            sessions = [await self._inbox.get()]
+            if self.window > 0:
+                await asyncio.sleep(self.window)
+            while not self._inbox.empty():
+                sessions.append(self._inbox.get_nowait())
+            messages = []
+            for rcon_session in sessions:
+                messages += self._drain(rcon_session)
+            if not messages:
+                continue
+            try:
+                await deliver(messages)
+            except Exception as e:
+                logger.error(f"Chat_Bridge deliver failed: {e!r}")
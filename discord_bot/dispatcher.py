@@ -0,0 +1,267 @@
+import asyncio
+from collections import deque
+import logging
+from typing import Any, Awaitable, Callable, Optional
+
+logger = logging.getLogger("main")
+
+# Discord 單則訊息長度上限
+MESSAGE_LIMIT = 2000
+# 收到第一則訊息後再等待的時間(秒)，期間的訊息合併送出
+_COALESCE_WINDOW = 0.25
+# 每個頻道的速率限制: 每`_RATE_PER`秒`_RATE`則
+_RATE = 5
+_RATE_PER = 5.0
+# 每個頻道最多排隊的行數，超過時由低優先權開始捨棄
+_MAX_QUEUED = 500
+# 頻道閒置超過此時間(秒)後移除其佇列與發送任務，需大於`_RATE_PER`以免重置速率限制
+_IDLE_TIMEOUT = 60.0
+
+_PRIORITY_LIST = ["reply", "chat", "bulk"]
+PRIORITY_REPLY = 0
+PRIORITY_CHAT = 1
+PRIORITY_BULK = 2
+
+def split_lines(text: str, limit: int=MESSAGE_LIMIT) -> list[str]:
+    """
+    依換行分割訊息，超過`limit`的單行再依長度切開。
+
+    text: :class:`str`
+        訊息內容。
+    limit: :class:`int`
+        單行長度上限。
+
+    return: :class:`list[str]`
+    """
+    lines = []
+    for line in text.split("\n"):
+        while len(line) > limit:
+            lines.append(line[:limit])
+            line = line[limit:]
+        lines.append(line)
+    return lines
+
+def _route_key(target: Any) -> int:
+    """
+    取得目標的ID，頻道ID直接使用，使用者等物件使用其`id`。
+
+    return: :class:`int`
+    """
+    return target if type(target) == int else target.id
+
+class _Route():
+    """
+    單一頻道(或使用者)的發送佇列與速率限制。
+    """
+    def __init__(self, target: Any, rate: int, now: float) -> None:
+        self.target = target
+        self.levels: list[deque[str]] = [deque() for _ in _PRIORITY_LIST]
+        self.tokens = float(rate)
+        self.updated = now
+        self.wake = asyncio.Event()
+        self.task: Optional[asyncio.Task] = None
+        self.sent = 0
+        self.lines = 0
+        self.dropped = [0] * len(_PRIORITY_LIST)
+        self.unreported = 0
+        self.throttled = 0.0
+
+    def depth(self) -> int:
+        return sum(len(level) for level in self.levels)
+
+    def take(self, limit: int) -> tuple[int, str]:
+        """
+        取出最高優先權的訊息，同等級的連續行合併至`limit`字內。
+
+        return: :class:`tuple[int, str]`
+            (優先權, 內容)
+        """
+        for priority, level in enumerate(self.levels):
+            if not level:
+                continue
+            lines = [level.popleft()]
+            length = len(lines[0])
+            while level and length + 1 + len(level[0]) <= limit:
+                line = level.popleft()
+                lines.append(line)
+                length += 1 + len(line)
+            return priority, "\n".join(lines)
+        return PRIORITY_BULK, ""
+
+class Discord_Dispatcher():
+    """
+    Discord 發送排程，每個頻道各自合併、分段與限速。
+    同一頻道中管理員指令回覆優先於聊天訊息，聊天訊息優先於倒數公告等大量訊息。
+    """
+    current: Optional["Discord_Dispatcher"] = None
+
+    def __init__(
+        self,
+        send: Callable[[Any, str], Awaitable[None]],
+        window: float=_COALESCE_WINDOW,
+        rate: int=_RATE,
+        per: float=_RATE_PER,
+        max_queued: int=_MAX_QUEUED,
+        limit: int=MESSAGE_LIMIT,
+        idle_timeout: float=_IDLE_TIMEOUT
+    ) -> None:
+        """
+        初始化`Discord_Dispatcher()`，需於事件迴圈所在的線程中使用。
+
+        send: :class:`Callable[[Any, str], Awaitable[None]]`
+            送出一則訊息的協程函式，參數為(目標, 內容)。
+        window: :class:`float`
+            合併訊息的等待時間(秒)。
+        rate: :class:`int`
+            每個頻道於`per`秒內最多送出的訊息數。
+        per: :class:`float`
+            速率限制的時間區間(秒)。
+        max_queued: :class:`int`
+            每個頻道最多排隊的行數。
+        limit: :class:`int`
+            單則訊息長度上限。
+        idle_timeout: :class:`float`
+            頻道閒置多久(秒)後移除其佇列與發送任務。
+
+        return: :class:`None`
+        """
+        self.send = send
+        self.window = window
+        self.rate = rate
+        self.per = per
+        self.max_queued = max_queued
+        self.limit = limit
+        self.idle_timeout = idle_timeout
+        self._routes: dict[int, _Route] = {}
+        # 已移除頻道的累計數量
+        self._retired = {"routes": 0, "sent": 0, "lines": 0, "dropped": [0] * len(_PRIORITY_LIST)}
+        Discord_Dispatcher.current = self
+
+    def submit(self, target: Any, text: str, priority: int=PRIORITY_CHAT) -> bool:
+        """
+        加入待送出的訊息。
+
+        target: :class:`Any`
+            頻道ID或可`send()`的物件。
+        text: :class:`str`
+            訊息內容。
+        priority: :class:`int`
+            優先權等級。
+
+        return: :class:`bool`
+            是否完整加入，佇列已滿而捨棄任一行時為`False`。
+        """
+        loop = asyncio.get_running_loop()
+        key = _route_key(target)
+        route = self._routes.get(key)
+        if route == None:
+            route = self._routes[key] = _Route(target, self.rate, loop.time())
+        else:
+            route.target = target
+        complete = True
+        for line in split_lines(text, self.limit):
+            if route.depth() >= self.max_queued and not self._drop(route, priority):
+                route.dropped[priority] += 1
+                route.unreported += 1
+                complete = False
+                continue
+            route.levels[priority].append(line)
+        if route.task == None:
+            route.task = loop.create_task(self._run(route))
+        route.wake.set()
+        return complete
+
+    def _drop(self, route: _Route, priority: int) -> bool:
+        """
+        捨棄一行優先權不高於`priority`的最舊訊息。
+
+        return: :class:`bool`
+            是否有空出位置。
+        """
+        for level in range(len(_PRIORITY_LIST) - 1, priority - 1, -1):
+            if route.levels[level]:
+                route.levels[level].popleft()
+                route.dropped[level] += 1
+                route.unreported += 1
+                return True
+        return False
+
+    async def _acquire(self, route: _Route) -> None:
+        """
+        等待頻道的速率限制。
+        """
+        loop = asyncio.get_running_loop()
+        while True:
+            now = loop.time()
+            route.tokens = min(float(self.rate), route.tokens + (now - route.updated) * self.rate / self.per)
+            route.updated = now
+            if route.tokens >= 1:
+                route.tokens -= 1
+                return
+            wait = (1 - route.tokens) * self.per / self.rate
+            route.throttled += wait
+            await asyncio.sleep(wait)
+
+    async def _run(self, route: _Route) -> None:
+        while True:
+            try:
+                await asyncio.wait_for(route.wake.wait(), self.idle_timeout)
+            except asyncio.TimeoutError:
+                if route.depth() == 0:
+                    self._retire(route)
+                    return
+            route.wake.clear()
+            if self.window > 0:
+                await asyncio.sleep(self.window)
+            while route.depth() > 0:
+                # 等待期間新進的訊息會一併合併
+                await self._acquire(route)
+                priority, content = route.take(self.limit)
+                if content.strip() == "":
+                    continue
+                try:
+                    await self.send(route.target, content)
+                    route.sent += 1
+                    route.lines += content.count("\n") + 1
+                except Exception as e:
+                    logger.error(f"Discord send to {route.target} failed ({_PRIORITY_LIST[priority]}): {e!r}")
+            if route.unreported:
+                logger.warning(f"Discord queue for {route.target} full, dropped {route.unreported} lines.")
+                route.unreported = 0
+
+    def _retire(self, route: _Route) -> None:
+        """
+        移除閒置頻道，保留其累計數量。
+        """
+        key = _route_key(route.target)
+        if self._routes.get(key) is route:
+            del self._routes[key]
+        self._retired["routes"] += 1
+        self._retired["sent"] += route.sent
+        self._retired["lines"] += route.lines
+        for priority, dropped in enumerate(route.dropped):
+            self._retired["dropped"][priority] += dropped
+
+    def stats(self) -> dict:
+        """
+        取得各頻道的佇列深度、送出與捨棄數量，可於任意線程中呼叫。
+
+        return: :class:`dict`
+        """
+        routes = {}
+        for key, route in list(self._routes.items()):
+            routes[str(key)] = {
+                "queued": dict(zip(_PRIORITY_LIST, (len(level) for level in route.levels))),
+                "dropped": dict(zip(_PRIORITY_LIST, route.dropped)),
+                "sent": route.sent,
+                "lines": route.lines,
+                "throttled_seconds": route.throttled
+            }
+        retired = self._retired
+        return {
+            "queued": sum(sum(route["queued"].values()) for route in routes.values()),
+            "dropped": sum(sum(route["dropped"].values()) for route in routes.values()) + sum(retired["dropped"]),
+            "sent": sum(route["sent"] for route in routes.values()) + retired["sent"],
+            "retired_routes": retired["routes"],
+            "routes": routes
+        }
@@ -1,8 +1,20 @@
+from .backup_pool import *
+from .backup_store import *
+from .chat_filter import *
+from .clock import *
 from .config import *
+from .countdown import *
 from .datetime import *
 from .json import *
 from .logging_config import *
+from .message_index import *
+from .metrics import *
+from .process_tracker import *
 from .queue import *
+from .reconnect import *
 from .rcon import *
+from .rcon_engine import *
+from .scheduler import *
+from .snapshot import *
 from .system_state import *
 from .threading import *
@@ -0,0 +1,240 @@
+from collections import deque
+from concurrent.futures import Future, ThreadPoolExecutor
+import logging
+from modules.clock import Clock
+from modules.config import Config
+from threading import Lock
+from time import monotonic, sleep
+from typing import Any, Callable, Optional
+
+logger = logging.getLogger("main")
+
+_JOB_HISTORY = 50
+
+class Io_Budget:
+    """
+    全主機共用的備份讀寫頻寬預算(令牌桶)，避免備份拖慢執行中的伺服器。
+    各線程先預扣額度再於鎖外等待，多個備份平均分享頻寬。
+    """
+    rate: float = 0.0
+    capacity: float = 0.0
+    waited: float = 0.0
+    _tokens: float = 0.0
+    _last_time: float = 0.0
+    _lock = Lock()
+
+    @classmethod
+    def configure(self, rate: float) -> None:
+        """
+        設定頻寬上限。
+
+        rate: :class:`float`
+            每秒位元組數，`0`為不限制。
+
+        return: :class:`None`
+        """
+        with self._lock:
+            if rate != self.rate:
+                self.rate = float(rate)
+                # 允許約一秒的突發量
+                self.capacity = float(rate)
+                self._tokens = min(self._tokens, self.capacity)
+
+    @classmethod
+    def consume(self, size: int) -> None:
+        """
+        取得`size`位元組的額度，不足時等待。
+
+        size: :class:`int`
+            位元組數。
+
+        return: :class:`None`
+        """
+        with self._lock:
+            if self.rate <= 0:
+                return
+            now = monotonic()
+            if self._last_time != 0.0:
+                self._tokens = min(self.capacity, self._tokens + (now - self._last_time) * self.rate)
+            self._last_time = now
+            self._tokens -= size
+            wait_time = -self._tokens / self.rate if self._tokens < 0 else 0.0
+            self.waited += wait_time
+        if wait_time > 0:
+            sleep(wait_time)
+
+class Backup_Job():
+    """
+    一個背景備份工作的進度與結果。
+    """
+    def __init__(self, name: str, server: str) -> None:
+        """
+        初始化`Backup_Job()`
+
+        name: :class:`str`
+            快照名稱。
+        server: :class:`str`
+            伺服器名稱。
+
+        return: :class:`None`
+        """
+        self.name = name
+        self.server = server
+        self.state = "queued"
+        self.queued_time = Clock.time()
+        self.start_time: Optional[float] = None
+        self.end_time: Optional[float] = None
+        self.total_bytes = 0
+        self.done_bytes = 0
+        self.error: Optional[str] = None
+        self.result: Any = None
+        self.future: Optional[Future] = None
+
+    def progress(self, done_bytes: int, total_bytes: int) -> None:
+        """
+        更新進度。
+
+        done_bytes: :class:`int`
+            已處理位元組數。
+        total_bytes: :class:`int`
+            總位元組數。
+
+        return: :class:`None`
+        """
+        self.done_bytes = done_bytes
+        self.total_bytes = total_bytes
+
+    @property
+    def elapsed(self) -> float:
+        if self.start_time == None:
+            return 0.0
+        return (self.end_time or Clock.monotonic()) - self.start_time
+
+    @property
+    def throughput(self) -> float:
+        """
+        平均處理速度(位元組/秒)。
+
+        return: :class:`float`
+        """
+        return self.done_bytes / self.elapsed if self.elapsed > 0 else 0.0
+
+    def info(self) -> dict:
+        """
+        取得工作狀態。
+
+        return: :class:`dict`
+        """
+        return {
+            "name": self.name,
+            "server": self.server,
+            "state": self.state,
+            "queued_time": self.queued_time,
+            "elapsed": self.elapsed,
+            "total_bytes": self.total_bytes,
+            "done_bytes": self.done_bytes,
+            "percent": self.done_bytes * 100 / self.total_bytes if self.total_bytes else 0.0,
+            "throughput": self.throughput,
+            "error": self.error
+        }
+
+class Backup_Pool:
+    """
+    全主機共用的背景備份線程池。
+    """
+    _executor: Optional[ThreadPoolExecutor] = None
+    _workers = 0
+    _jobs: deque = deque(maxlen=_JOB_HISTORY)
+    _lock = Lock()
+
+    @classmethod
+    def _get_executor(self) -> ThreadPoolExecutor:
+        """
+        取得線程池，設置檔的線程數變更時重建。
+        舊線程池不再接受新工作，已排入的工作仍會執行完畢。
+
+        return: :class:`ThreadPoolExecutor`
+        """
+        with self._lock:
+            workers = Config.backup_setting.workers
+            if self._executor == None or self._workers != workers:
+                if self._executor != None:
+                    logger.info(f"Backup workers changed: {self._workers} -> {workers}")
+                    self._executor.shutdown(wait=False)
+                self._executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="Backup")
+                self._workers = workers
+            return self._executor
+
+    @classmethod
+    def submit(self, job: Backup_Job, func: Callable[[Backup_Job], Any]) -> Backup_Job:
+        """
+        將備份工作交由線程池執行，立即返回。
+
+        job: :class:`Backup_Job`
+            工作資訊。
+        func: :class:`Callable[[Backup_Job], Any]`
+            實際執行的函式，以`job`為參數。
+
+        return: :class:`Backup_Job`
+        """
+        Io_Budget.configure(Config.backup_setting.max_bytes_per_sec)
+        with self._lock:
+            self._jobs.append(job)
+        job.future = self._get_executor().submit(self._run, job, func)
+        return job
+
+    @classmethod
+    def _run(self, job: Backup_Job, func: Callable[[Backup_Job], Any]) -> Any:
+        job.state = "running"
+        job.start_time = Clock.monotonic()
+        try:
+            job.result = func(job)
+            job.state = "done"
+        except Exception as e:
+            job.state = "failed"
+            job.error = repr(e)
+            logger.error(f"Backup {job.server} {job.name} failed: {e!r}")
+            raise
+        finally:
+            job.end_time = Clock.monotonic()
+        logger.info(f"Backup {job.server} {job.name} finished: {job.done_bytes} bytes in {job.elapsed:.1f} s ({job.throughput / 1048576:.1f} MiB/s)")
+        return job.result
+
+    @classmethod
+    def jobs(self) -> list[dict]:
+        """
+        取得最近的備份工作狀態。
+
+        return: :class:`list[dict]`
+        """
+        with self._lock:
+            return [job.info() for job in self._jobs]
+
+    @classmethod
+    def pending(self) -> int:
+        """
+        尚未完成的工作數量。
+
+        return: :class:`int`
+        """
+        with self._lock:
+            return sum(1 for job in self._jobs if job.state in ("queued", "running"))
+
+    @classmethod
+    def stats(self) -> dict:
+        """
+        取得線程池的佇列深度與總吞吐量。
+
+        return: :class:`dict`
+        """
+        with self._lock:
+            jobs = list(self._jobs)
+        running = [job for job in jobs if job.state == "running"]
+        return {
+            "workers": Config.backup_setting.workers,
+            "queued": sum(1 for job in jobs if job.state == "queued"),
+            "running": len(running),
+            "throughput": sum(job.throughput for job in running),
+            "max_bytes_per_sec": Io_Budget.rate,
+            "throttled_seconds": Io_Budget.waited
+        }
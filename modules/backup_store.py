@@ -0,0 +1,821 @@
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, tzinfo
+import gzip
+from hashlib import sha256
+import logging
+from modules.clock import Clock
+from modules.json import Json
+from os import listdir, makedirs, remove, replace, stat, utime, walk
+from os.path import abspath, dirname, isdir, isfile, join, relpath
+from tempfile import mkstemp
+from threading import Condition, Lock
+from typing import Callable, Optional
+
+try:
+    import zstandard
+except ImportError:
+    zstandard = None
+
+logger = logging.getLogger("main")
+
+_CHUNK_SIZE = 4 * 1024 * 1024
+_OBJECTS_DIR = "objects"
+_SNAPSHOTS_DIR = "snapshots"
+_CATALOG_FILE = "catalog.json"
+_RESTORE_SUFFIX = ".restore"
+_COMPRESSION_SUFFIX = {"none": "", "gzip": ".gz", "zstd": ".zst"}
+
+def _compress(data: bytes, compression: str, level: int) -> bytes:
+    if compression == "zstd":
+        return zstandard.ZstdCompressor(level=level).compress(data)
+    if compression == "gzip":
+        return gzip.compress(data, compresslevel=level, mtime=0)
+    return data
+
+def _decompress(data: bytes, compression: str) -> bytes:
+    if compression == "zstd":
+        if zstandard == None:
+            raise RuntimeError("zstandard is required to read zstd compressed backups.")
+        return zstandard.ZstdDecompressor().decompress(data)
+    if compression == "gzip":
+        return gzip.decompress(data)
+    return data
+
+_catalog_locks: dict[str, Lock] = {}
+_catalog_locks_lock = Lock()
+
+def _catalog_lock(root: str) -> Lock:
+    """
+    取得備份庫目錄清單的鎖，同一備份庫的多個實例共用。
+
+    return: :class:`Lock`
+    """
+    root = abspath(root)
+    with _catalog_locks_lock:
+        lock = _catalog_locks.get(root)
+        if lock == None:
+            lock = _catalog_locks[root] = Lock()
+        return lock
+
+class _Store_Usage():
+    """
+    備份庫的使用狀態，同一備份庫的多個實例共用。
+    快照與還原進行中時不回收區塊，回收期間新的快照與還原需等待。
+    """
+    def __init__(self) -> None:
+        self._condition = Condition()
+        self._active = 0
+        self._collecting = False
+
+    def enter(self) -> None:
+        with self._condition:
+            self._condition.wait_for(lambda: not self._collecting)
+            self._active += 1
+
+    def leave(self) -> None:
+        with self._condition:
+            self._active -= 1
+            self._condition.notify_all()
+
+    def begin_collect(self) -> bool:
+        """
+        開始回收區塊。
+
+        return: :class:`bool`
+            有快照或還原進行中時為`False`。
+        """
+        with self._condition:
+            if self._active > 0 or self._collecting:
+                return False
+            self._collecting = True
+            return True
+
+    def end_collect(self) -> None:
+        with self._condition:
+            self._collecting = False
+            self._condition.notify_all()
+
+_store_usages: dict[str, _Store_Usage] = {}
+
+def _store_usage(root: str) -> _Store_Usage:
+    """
+    取得備份庫的使用狀態。
+
+    return: :class:`_Store_Usage`
+    """
+    root = abspath(root)
+    with _catalog_locks_lock:
+        usage = _store_usages.get(root)
+        if usage == None:
+            usage = _store_usages[root] = _Store_Usage()
+        return usage
+
+def _manifest_checksum(file_infos: list[dict]) -> str:
+    """
+    以各檔案的路徑與雜湊值計算整份快照的校驗碼。
+
+    return: :class:`str`
+    """
+    snapshot_hash = sha256()
+    for file_info in sorted(file_infos, key=lambda file_info: file_info["path"]):
+        snapshot_hash.update(f"{file_info['path']}:{file_info['sha256']}\n".encode("utf-8"))
+    return snapshot_hash.hexdigest()
+
+def select_retained(
+    entries: list[dict],
+    hourly: int,
+    daily: int,
+    weekly: int,
+    time_zone: Optional[tzinfo]=None
+) -> set[str]:
+    """
+    以祖父-父-子(GFS)規則選出要保留的快照。
+    每一層保留最近`N`個不同時段中各自最新的一份，最新的快照一律保留。
+
+    entries: :class:`list[dict]`
+        目錄清單中的快照資訊。
+    hourly: :class:`int`
+        保留的小時數。
+    daily: :class:`int`
+        保留的天數。
+    weekly: :class:`int`
+        保留的週數。
+    time_zone: :class:`tzinfo | None`
+        劃分時段所用的時區。
+
+    return: :class:`set[str]`
+        要保留的快照名稱。
+    """
+    entries = sorted(entries, key=lambda entry: entry["created"], reverse=True)
+    keep = set()
+    if entries:
+        keep.add(entries[0]["name"])
+    tiers = (
+        (hourly, lambda moment: (moment.date(), moment.hour)),
+        (daily, lambda moment: moment.date()),
+        (weekly, lambda moment: moment.isocalendar()[:2])
+    )
+    moments = [datetime.fromtimestamp(entry["created"], time_zone) for entry in entries]
+    for count, bucket_of in tiers:
+        seen = set()
+        for entry, moment in zip(entries, moments):
+            if len(seen) >= count:
+                break
+            bucket = bucket_of(moment)
+            if bucket not in seen:
+                seen.add(bucket)
+                keep.add(entry["name"])
+    return keep
+
+class Backup_Store():
+    """
+    以內容雜湊去除重複的備份庫。
+    檔案切分為固定大小的區塊，相同內容的區塊只儲存一次，每個快照只是一份清單。
+    """
+    def __init__(
+        self,
+        root: str,
+        chunk_size: int=_CHUNK_SIZE,
+        compression: str="none",
+        level: int=3,
+        throttle: Optional[Callable[[int], None]]=None
+    ) -> None:
+        """
+        初始化`Backup_Store()`
+
+        root: :class:`str`
+            備份庫根目錄。
+        chunk_size: :class:`int`
+            區塊大小(位元組)。
+        compression: :class:`str`
+            新區塊的壓縮方式，`zstd`、`gzip`或`none`。
+        level: :class:`int`
+            壓縮等級。
+        throttle: :class:`Callable[[int], None] | None`
+            每讀取一段資料後以位元組數呼叫，可等待以限制頻寬。
+
+        return: :class:`None`
+        """
+        if compression == "zstd" and zstandard == None:
+            logger.warning("zstandard not installed, fall back to gzip.")
+            compression = "gzip"
+        if compression not in _COMPRESSION_SUFFIX:
+            raise ValueError(f"Unknown compression: {compression}")
+        self.root = root
+        self.chunk_size = chunk_size
+        self.compression = compression
+        self.level = level
+        self.throttle = throttle
+        self.objects_dir = join(root, _OBJECTS_DIR)
+        self.snapshots_dir = join(root, _SNAPSHOTS_DIR)
+        self.catalog_path = join(root, _CATALOG_FILE)
+        self._lock = _catalog_lock(root)
+        self._usage = _store_usage(root)
+
+    def _object_path(self, digest: str, compression: str="none") -> str:
+        return join(self.objects_dir, digest[:2], digest + _COMPRESSION_SUFFIX[compression])
+
+    def _find_object(self, digest: str) -> Optional[tuple[str, str]]:
+        """
+        尋找已存在的區塊，不論其壓縮方式。
+
+        return: :class:`tuple[str, str] | None`
+            (路徑, 壓縮方式)
+        """
+        for compression in _COMPRESSION_SUFFIX:
+            path = self._object_path(digest, compression)
+            if isfile(path):
+                return path, compression
+        return None
+
+    def _manifest_path(self, name: str) -> str:
+        return join(self.snapshots_dir, f"{name}.json")
+
+    def _write_object(self, digest: str, data: bytes) -> bool:
+        """
+        寫入區塊，已存在則略過。
+        每次寫入使用各自的暫存檔，多個寫入者同時寫入相同區塊時以先完成者為準。
+
+        return: :class:`bool`
+            是否實際寫入。
+        """
+        if self._find_object(digest) != None:
+            return False
+        path = self._object_path(digest, self.compression)
+        prefix_dir = join(self.objects_dir, digest[:2])
+        makedirs(prefix_dir, exist_ok=True)
+        fd, tmp_path = mkstemp(suffix=".tmp", prefix=f"{digest}.", dir=prefix_dir)
+        try:
+            with open(fd, mode="wb") as object_file:
+                object_file.write(_compress(data, self.compression, self.level))
+            if self._find_object(digest) != None:
+                return False
+            try:
+                replace(tmp_path, path)
+            except OSError:
+                # 其他寫入者已完成且檔案正被讀取時無法取代，內容相同視為成功
+                if self._find_object(digest) == None:
+                    raise
+                return False
+            return True
+        finally:
+            if isfile(tmp_path):
+                remove(tmp_path)
+
+    def _read_object(self, digest: str) -> bytes:
+        found = self._find_object(digest)
+        if found == None:
+            raise FileNotFoundError(f"Missing backup chunk: {digest}")
+        path, compression = found
+        with open(path, mode="rb") as object_file:
+            return _decompress(object_file.read(), compression)
+
+    def _load_catalog(self) -> dict[str, dict]:
+        """
+        讀取目錄清單，不存在時由快照清單重建。需持有`self._lock`。
+
+        return: :class:`dict[str, dict]`
+        """
+        if isfile(self.catalog_path):
+            return Json.load(self.catalog_path)
+        catalog = {}
+        if isdir(self.snapshots_dir):
+            for file_name in listdir(self.snapshots_dir):
+                if not file_name.endswith(".json"):
+                    continue
+                try:
+                    manifest = self.load_manifest(file_name[:-5])
+                except Exception:
+                    continue
+                catalog[manifest["name"]] = self._catalog_entry(manifest)
+        if catalog:
+            self._save_catalog(catalog)
+        return catalog
+
+    def _save_catalog(self, catalog: dict[str, dict]) -> None:
+        makedirs(self.root, exist_ok=True)
+        tmp_path = f"{self.catalog_path}.tmp"
+        Json.dump(tmp_path, catalog)
+        replace(tmp_path, self.catalog_path)
+
+    def _catalog_entry(self, manifest: dict) -> dict:
+        return {
+            "name": manifest["name"],
+            "created": manifest["created"],
+            "total_bytes": manifest["total_bytes"],
+            "stored_bytes": manifest["stored_bytes"],
+            "files": len(manifest["files"]),
+            "checksum": _manifest_checksum(manifest["files"])
+        }
+
+    def catalog(self) -> list[dict]:
+        """
+        列出目錄清單中的所有快照(由舊至新)。
+
+        return: :class:`list[dict]`
+        """
+        with self._lock:
+            catalog = self._load_catalog()
+        return sorted(catalog.values(), key=lambda entry: (entry["created"], entry["name"]))
+
+    def snapshots(self) -> list[str]:
+        """
+        列出所有快照名稱(由舊至新)。
+
+        return: :class:`list[str]`
+        """
+        return [entry["name"] for entry in self.catalog()]
+
+    def query(
+        self,
+        since: Optional[float]=None,
+        until: Optional[float]=None,
+        limit: Optional[int]=None
+    ) -> list[dict]:
+        """
+        查詢快照(由新至舊)。
+
+        since: :class:`float | None`
+            最早的建立時間(timestamp)。
+        until: :class:`float | None`
+            最晚的建立時間(timestamp)。
+        limit: :class:`int | None`
+            最多回傳的數量。
+
+        return: :class:`list[dict]`
+        """
+        result = []
+        for entry in reversed(self.catalog()):
+            if until != None and entry["created"] > until:
+                continue
+            if since != None and entry["created"] < since:
+                break
+            result.append(entry)
+            if limit != None and len(result) >= limit:
+                break
+        return result
+
+    def find(self, name: str) -> Optional[dict]:
+        """
+        以名稱或唯一的名稱開頭尋找快照。
+
+        name: :class:`str`
+            快照名稱或其開頭。
+
+        return: :class:`dict | None`
+            名稱為空或符合多個快照時為`None`。
+        """
+        if name.strip() == "":
+            return None
+        entries = self.catalog()
+        for entry in entries:
+            if entry["name"] == name:
+                return entry
+        matches = [entry for entry in entries if entry["name"].startswith(name)]
+        return matches[0] if len(matches) == 1 else None
+
+    def prune(
+        self,
+        hourly: int,
+        daily: int,
+        weekly: int,
+        time_zone: Optional[tzinfo]=None
+    ) -> list[str]:
+        """
+        依GFS規則刪除快照清單，只讀取目錄清單，區塊需透過`gc()`回收。
+
+        hourly: :class:`int`
+            保留的小時數。
+        daily: :class:`int`
+            保留的天數。
+        weekly: :class:`int`
+            保留的週數。
+        time_zone: :class:`tzinfo | None`
+            劃分時段所用的時區。
+
+        return: :class:`list[str]`
+            已刪除的快照名稱。
+        """
+        with self._lock:
+            catalog = self._load_catalog()
+            keep = select_retained(list(catalog.values()), hourly, daily, weekly, time_zone)
+            removed = [name for name in catalog if name not in keep]
+            for name in removed:
+                del catalog[name]
+                path = self._manifest_path(name)
+                if isfile(path):
+                    remove(path)
+            if removed:
+                self._save_catalog(catalog)
+        return removed
+
+    def load_manifest(self, name: str) -> dict:
+        """
+        讀取快照清單。
+
+        name: :class:`str`
+            快照名稱。
+
+        return: :class:`dict`
+        """
+        return Json.load(self._manifest_path(name))
+
+    def _latest_files(self) -> dict[str, dict]:
+        """
+        取得最新快照中的檔案資訊，用於略過未變更的檔案。
+
+        return: :class:`dict[str, dict]`
+        """
+        names = self.snapshots()
+        if not names:
+            return {}
+        try:
+            manifest = self.load_manifest(names[-1])
+        except Exception:
+            return {}
+        return {file_info["path"]: file_info for file_info in manifest["files"]}
+
+    def _expand(self, source_dir: str, paths: list[str]) -> tuple[list[str], list[str]]:
+        """
+        展開資料夾為檔案列表。
+
+        return: :class:`tuple[list[str], list[str]]`
+            (檔案, 資料夾)
+        """
+        files = []
+        dirs = []
+        for path in paths:
+            full_path = join(source_dir, path)
+            if isdir(full_path):
+                for dir_path, _, file_names in walk(full_path):
+                    dirs.append(relpath(dir_path, source_dir))
+                    files += [relpath(join(dir_path, file_name), source_dir) for file_name in file_names]
+            elif isfile(full_path):
+                files.append(path)
+        return files, dirs
+
+    def store_file(
+        self,
+        source_dir: str,
+        path: str,
+        previous: Optional[dict]=None,
+        progress: Optional[Callable[[int], None]]=None
+    ) -> tuple[dict, int]:
+        """
+        將單一檔案串流切分、壓縮並存入備份庫。
+
+        source_dir: :class:`str`
+            來源根目錄。
+        path: :class:`str`
+            相對路徑。
+        previous: :class:`dict | None`
+            上一次快照中的檔案資訊，大小與修改時間相同時直接沿用。
+        progress: :class:`Callable[[int], None] | None`
+            每處理一段資料後以處理的位元組數呼叫。
+
+        return: :class:`tuple[dict, int]`
+            (檔案資訊, 新寫入的位元組數)
+        """
+        full_path = join(source_dir, path)
+        file_stat = stat(full_path)
+        if (
+            previous != None and
+            previous["size"] == file_stat.st_size and
+            previous["mtime_ns"] == file_stat.st_mtime_ns and
+            all(self._find_object(digest) != None for digest in previous["chunks"])
+        ):
+            if progress != None:
+                progress(file_stat.st_size)
+            return previous, 0
+        file_hash = sha256()
+        chunks = []
+        written = 0
+        with open(full_path, mode="rb") as source_file:
+            while True:
+                data = source_file.read(self.chunk_size)
+                if not data:
+                    break
+                if self.throttle != None:
+                    self.throttle(len(data))
+                file_hash.update(data)
+                digest = sha256(data).hexdigest()
+                if self._write_object(digest, data):
+                    written += len(data)
+                chunks.append(digest)
+                if progress != None:
+                    progress(len(data))
+        file_info = {
+            "path": path.replace("\\", "/"),
+            "size": file_stat.st_size,
+            "mtime_ns": file_stat.st_mtime_ns,
+            "sha256": file_hash.hexdigest(),
+            "chunks": chunks
+        }
+        return file_info, written
+
+    def snapshot(
+        self,
+        source_dir: str,
+        paths: list[str],
+        name: str,
+        progress: Optional[Callable[[int, int], None]]=None
+    ) -> dict:
+        """
+        建立快照。
+
+        source_dir: :class:`str`
+            來源根目錄。
+        paths: :class:`list[str]`
+            要備份的相對路徑，資料夾會遞迴展開。
+        name: :class:`str`
+            快照名稱。
+        progress: :class:`Callable[[int, int], None] | None`
+            進度回呼，參數為(已處理位元組數, 總位元組數)。
+
+        return: :class:`dict`
+            快照清單。
+        """
+        start_time = Clock.time()
+        # 清單寫入前新區塊尚未被引用，期間不可回收
+        self._usage.enter()
+        try:
+            files, dirs = self._expand(source_dir, paths)
+            latest_files = self._latest_files()
+            file_infos = []
+            stored_bytes = 0
+            file_progress = None
+            if progress != None:
+                total_bytes = sum(stat(join(source_dir, path)).st_size for path in files)
+                done_bytes = 0
+                def file_progress(size: int):
+                    nonlocal done_bytes
+                    done_bytes += size
+                    progress(done_bytes, total_bytes)
+                progress(0, total_bytes)
+            for path in files:
+                file_info, written = self.store_file(source_dir, path, latest_files.get(path.replace("\\", "/")), file_progress)
+                file_infos.append(file_info)
+                stored_bytes += written
+            manifest = self.write_manifest(name, file_infos, dirs, start_time, stored_bytes)
+        finally:
+            self._usage.leave()
+        logger.info(f"Snapshot {name}: {len(file_infos)} files, {manifest['total_bytes']} bytes, {stored_bytes} bytes new.")
+        return manifest
+
+    def write_manifest(
+        self,
+        name: str,
+        file_infos: list[dict],
+        dirs: list[str],
+        created: float,
+        stored_bytes: int=0
+    ) -> dict:
+        """
+        寫入快照清單。
+
+        return: :class:`dict`
+        """
+        manifest = {
+            "name": name,
+            "created": created,
+            "total_bytes": sum(file_info["size"] for file_info in file_infos),
+            "stored_bytes": stored_bytes,
+            "dirs": [dir_path.replace("\\", "/") for dir_path in dirs],
+            "files": file_infos
+        }
+        makedirs(self.snapshots_dir, exist_ok=True)
+        tmp_path = f"{self._manifest_path(name)}.tmp"
+        Json.dump(tmp_path, manifest)
+        replace(tmp_path, self._manifest_path(name))
+        with self._lock:
+            catalog = self._load_catalog()
+            catalog[name] = self._catalog_entry(manifest)
+            self._save_catalog(catalog)
+        return manifest
+
+    def restore(
+        self,
+        name: str,
+        target_dir: str,
+        workers: int=1,
+        progress: Optional[Callable[[int, int], None]]=None,
+        quarantine_dir: Optional[str]=None,
+        managed: Optional[Callable[[str], bool]]=None,
+        cancelled: Optional[Callable[[], bool]]=None
+    ) -> dict:
+        """
+        將快照還原至`target_dir`，使其與快照完全一致。
+        所有檔案先平行寫入暫存檔並驗證雜湊值，全部通過後才取代原檔，
+        任一檔案失敗時原檔保持不變，暫存檔一律清除。
+        快照中沒有的檔案會移至`quarantine_dir`，未指定時直接刪除。
+
+        name: :class:`str`
+            完整的快照名稱，不接受開頭。
+        target_dir: :class:`str`
+            目標資料夾。
+        workers: :class:`int`
+            平行還原的檔案數。
+        progress: :class:`Callable[[int, int], None] | None`
+            進度回呼，參數為(已處理位元組數, 總位元組數)。
+        quarantine_dir: :class:`str | None`
+            存放快照中沒有的檔案的資料夾。
+        managed: :class:`Callable[[str], bool] | None`
+            以相對路徑判斷檔案是否屬於快照範圍，範圍外的檔案不移動，未指定時為全部檔案。
+        cancelled: :class:`Callable[[], bool] | None`
+            於寫入暫存檔期間檢查，回傳`True`時中止並拋出`InterruptedError`，原檔保持不變。
+
+        return: :class:`dict`
+            快照清單。
+        """
+        if name.strip() == "":
+            raise ValueError("Snapshot name is empty.")
+        manifest = self.load_manifest(name)
+        entry = self.find(name)
+        if entry != None and entry["checksum"] != _manifest_checksum(manifest["files"]):
+            raise ValueError(f"Manifest checksum mismatch: {name}")
+        for dir_path in manifest["dirs"]:
+            makedirs(join(target_dir, dir_path), exist_ok=True)
+        file_progress = None
+        if progress != None:
+            total_bytes = manifest["total_bytes"]
+            done_bytes = 0
+            progress_lock = Lock()
+            def file_progress(size: int):
+                nonlocal done_bytes
+                with progress_lock:
+                    done_bytes += size
+                    progress(done_bytes, total_bytes)
+            progress(0, total_bytes)
+        tmp_paths: dict[str, str] = {}
+        self._usage.enter()
+        try:
+            with ThreadPoolExecutor(max_workers=max(1, workers), thread_name_prefix="Restore") as executor:
+                futures = {
+                    join(target_dir, file_info["path"]): executor.submit(self._restore_tmp, file_info, target_dir, file_progress, cancelled)
+                    for file_info in manifest["files"]
+                }
+                error = None
+                for path, future in futures.items():
+                    try:
+                        tmp_paths[path] = future.result()
+                    except Exception as e:
+                        error = error or e
+            if error != None:
+                raise error
+            # 開始取代原檔後不再中止，避免只還原部分檔案
+            if cancelled != None and cancelled():
+                raise InterruptedError(f"Restore {name} cancelled.")
+            self._clear_extra(manifest, target_dir, quarantine_dir, managed)
+            for file_info in manifest["files"]:
+                path = join(target_dir, file_info["path"])
+                replace(tmp_paths.pop(path), path)
+                utime(path, ns=(file_info["mtime_ns"], file_info["mtime_ns"]))
+        finally:
+            self._usage.leave()
+            for tmp_path in tmp_paths.values():
+                if isfile(tmp_path):
+                    remove(tmp_path)
+        return manifest
+
+    def _clear_extra(
+        self,
+        manifest: dict,
+        target_dir: str,
+        quarantine_dir: Optional[str]=None,
+        managed: Optional[Callable[[str], bool]]=None
+    ) -> list[str]:
+        """
+        將`target_dir`中快照沒有的檔案移至`quarantine_dir`，未指定時直接刪除。
+
+        return: :class:`list[str]`
+            被移除的相對路徑。
+        """
+        expected = set(file_info["path"].replace("\\", "/") for file_info in manifest["files"])
+        extra = []
+        for dir_path, _, file_names in walk(target_dir):
+            for file_name in file_names:
+                path = relpath(join(dir_path, file_name), target_dir).replace("\\", "/")
+                if path in expected or path.endswith(_RESTORE_SUFFIX):
+                    continue
+                if managed != None and not managed(path):
+                    continue
+                extra.append(path)
+        for path in extra:
+            if quarantine_dir == None:
+                remove(join(target_dir, path))
+                continue
+            quarantine_path = join(quarantine_dir, path)
+            makedirs(dirname(quarantine_path), exist_ok=True)
+            replace(join(target_dir, path), quarantine_path)
+        if extra:
+            logger.info(f"Restore {manifest['name']}: {'quarantined' if quarantine_dir != None else 'removed'} {len(extra)} files not in snapshot.")
+        return extra
+
+    def _restore_tmp(
+        self,
+        file_info: dict,
+        target_dir: str,
+        progress: Optional[Callable[[int], None]]=None,
+        cancelled: Optional[Callable[[], bool]]=None
+    ) -> str:
+        """
+        將單一檔案還原為暫存檔並驗證雜湊值，失敗或中止時刪除暫存檔。
+
+        return: :class:`str`
+            暫存檔路徑。
+        """
+        path = join(target_dir, file_info["path"])
+        makedirs(dirname(path), exist_ok=True)
+        file_hash = sha256()
+        tmp_path = path + _RESTORE_SUFFIX
+        try:
+            with open(tmp_path, mode="wb") as target_file:
+                for digest in file_info["chunks"]:
+                    if cancelled != None and cancelled():
+                        raise InterruptedError(f"Restore cancelled: {file_info['path']}")
+                    data = self._read_object(digest)
+                    if self.throttle != None:
+                        self.throttle(len(data))
+                    file_hash.update(data)
+                    target_file.write(data)
+                    if progress != None:
+                        progress(len(data))
+            if file_hash.hexdigest() != file_info["sha256"]:
+                raise ValueError(f"Checksum mismatch: {file_info['path']}")
+        except BaseException:
+            if isfile(tmp_path):
+                remove(tmp_path)
+            raise
+        return tmp_path
+
+    def restore_file(self, file_info: dict, target_dir: str) -> None:
+        """
+        還原單一檔案並驗證雜湊值。
+
+        file_info: :class:`dict`
+            快照清單中的檔案資訊。
+        target_dir: :class:`str`
+            目標資料夾。
+
+        return: :class:`None`
+        """
+        self._usage.enter()
+        try:
+            tmp_path = self._restore_tmp(file_info, target_dir)
+        finally:
+            self._usage.leave()
+        path = join(target_dir, file_info["path"])
+        replace(tmp_path, path)
+        utime(path, ns=(file_info["mtime_ns"], file_info["mtime_ns"]))
+
+    def delete(self, name: str) -> None:
+        """
+        刪除快照清單，區塊需透過`gc()`回收。
+
+        name: :class:`str`
+            快照名稱。
+
+        return: :class:`None`
+        """
+        with self._lock:
+            catalog = self._load_catalog()
+            if catalog.pop(name, None) != None:
+                self._save_catalog(catalog)
+            path = self._manifest_path(name)
+            if isfile(path):
+                remove(path)
+
+    def gc(self) -> int:
+        """
+        回收不再被任何快照引用的區塊。
+        有快照或還原進行中時略過，留待下次回收。
+
+        return: :class:`int`
+            刪除的區塊數。
+        """
+        if not self._usage.begin_collect():
+            logger.info(f"Backup store {self.root} in use, skip gc.")
+            return 0
+        try:
+            return self._collect()
+        finally:
+            self._usage.end_collect()
+
+    def _collect(self) -> int:
+        referenced = set()
+        for name in self.snapshots():
+            for file_info in self.load_manifest(name)["files"]:
+                referenced.update(file_info["chunks"])
+        removed = 0
+        if not isdir(self.objects_dir):
+            return removed
+        for prefix in listdir(self.objects_dir):
+            prefix_dir = join(self.objects_dir, prefix)
+            for file_name in listdir(prefix_dir):
+                if file_name.endswith(".tmp"):
+                    continue
+                digest = file_name.split(".", 1)[0]
+                if digest not in referenced:
+                    remove(join(prefix_dir, file_name))
+                    removed += 1
+        return removed
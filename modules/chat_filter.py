@@ -0,0 +1,86 @@
+import re
+from typing import Optional
+
+_TRIBE_PREFIX = "部落"
+_TRIBE_ID = ", ID "
+_RICH_TEXT = "\">"
+_TRIBE_NOISE = ("部落成員", "你的部落")
+
+def split_chat(chat_message: str) -> list[str]:
+    """
+    分割`GetChat`回覆，並移除每行前後空白與空行。
+
+    chat_message: :class:`str`
+        `GetChat`回覆內容。
+
+    return: :class:`list[str]`
+    """
+    return [line for line in (line.strip(" ") for line in chat_message.split("\n")) if line != ""]
+
+class Chat_Filter():
+    """
+    預先編譯的聊天過濾器，將`m_filter_tables`中的一組規則合併為單一正規表達式。
+    """
+    def __init__(self, ban_dict: dict) -> None:
+        """
+        初始化`Chat_Filter()`
+
+        ban_dict: :class:`dict`
+            過濾字典，包含`startswith`、`include`與`endswith`。
+
+        return: :class:`None`
+        """
+        patterns = []
+        startswith = "|".join(re.escape(string) for string in ban_dict.get("startswith", []))
+        include = "|".join(re.escape(string) for string in ban_dict.get("include", []))
+        endswith = "|".join(re.escape(string) for string in ban_dict.get("endswith", []))
+        if startswith != "":
+            patterns.append(f"\\A(?:{startswith})")
+        if include != "":
+            patterns.append(f"(?:{include})")
+        if endswith != "":
+            patterns.append(f"(?:{endswith})\\Z")
+        self._pattern = re.compile("|".join(patterns)) if patterns else None
+
+    def verify(self, text: str) -> bool:
+        """
+        檢查字串是否可通過過濾。
+
+        text: :class:`str`
+            輸入字串。
+
+        return: :class:`bool`
+        """
+        return self._pattern == None or self._pattern.search(text) == None
+
+    def parse_line(self, message: str) -> Optional[str]:
+        """
+        過濾並修飾一行聊天訊息。
+
+        message: :class:`str`
+            已移除前後空白的訊息。
+
+        return: :class:`str | None`
+            可轉發的訊息，若被過濾則為`None`。
+        """
+        if not self.verify(message):
+            return None
+        if not message.startswith(_TRIBE_PREFIX):
+            return message
+        # 部落紀錄
+        id_index = message.find(_TRIBE_ID)
+        tribe = message[2:id_index]
+        rich_index = message.find(_RICH_TEXT)
+        if rich_index != -1:
+            content = message[rich_index + 2:-4]
+        else:
+            parts = message.split(": ", 3)
+            if len(parts) < 3:
+                return None
+            content = parts[2][:-1]
+            for noise in _TRIBE_NOISE:
+                content = content.replace(noise, "")
+        content = content.strip(" ")
+        if content == "":
+            return None
+        return f"<{tribe}>{content}"
@@ -0,0 +1,94 @@
+from threading import Lock
+import time as _time
+
+class Clock:
+    """
+    可替換的時鐘，排程相關程式碼皆透過此類別取得時間。
+    預設為系統時間，模擬時可切換為以固定倍率加速的虛擬時間。
+    """
+    speed: float = 1.0
+    virtual: bool = False
+    _origin_real: float = 0.0
+    _origin_time: float = 0.0
+    _origin_monotonic: float = 0.0
+    _lock = Lock()
+
+    @classmethod
+    def set_virtual(self, start_time: float, speed: float) -> None:
+        """
+        切換為虛擬時間。
+
+        start_time: :class:`float`
+            虛擬時間起點(timestamp)。
+        speed: :class:`float`
+            時間流逝倍率。
+
+        return: :class:`None`
+        """
+        with self._lock:
+            self._origin_monotonic = self.monotonic()
+            self._origin_real = _time.monotonic()
+            self._origin_time = start_time
+            self.speed = float(speed)
+            self.virtual = True
+
+    @classmethod
+    def reset(self) -> None:
+        """
+        切換回系統時間。
+
+        return: :class:`None`
+        """
+        with self._lock:
+            self.speed = 1.0
+            self.virtual = False
+
+    @classmethod
+    def _elapsed(self) -> float:
+        return (_time.monotonic() - self._origin_real) * self.speed
+
+    @classmethod
+    def time(self) -> float:
+        """
+        當前時間(timestamp)。
+
+        return: :class:`float`
+        """
+        if not self.virtual:
+            return _time.time()
+        return self._origin_time + self._elapsed()
+
+    @classmethod
+    def monotonic(self) -> float:
+        """
+        單調遞增的時間(秒)。
+
+        return: :class:`float`
+        """
+        if not self.virtual:
+            return _time.monotonic()
+        return self._origin_monotonic + self._elapsed()
+
+    @classmethod
+    def real(self, seconds: float) -> float:
+        """
+        將時鐘上的秒數換算為實際等待的秒數，可用於`Event.wait()`等逾時參數。
+
+        seconds: :class:`float`
+            時鐘上的秒數。
+
+        return: :class:`float`
+        """
+        return seconds / self.speed
+
+    @classmethod
+    def sleep(self, seconds: float) -> None:
+        """
+        依時鐘等待`seconds`秒。
+
+        seconds: :class:`float`
+            時鐘上的秒數。
+
+        return: :class:`None`
+        """
+        _time.sleep(self.real(seconds))
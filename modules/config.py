@@ -1,17 +1,36 @@
 from datetime import time as d_time, timedelta as d_timedelta, timezone as d_timezone
 import logging
+from modules.chat_filter import Chat_Filter
 from modules.json import Json
 from modules.threading import Thread
-from os.path import getmtime, isfile
-from time import sleep
-from typing import Union
-from threading import current_thread
+from os import environ, stat
+from os.path import abspath, dirname, isfile, normcase
+from time import perf_counter, sleep
+from types import MappingProxyType
+from typing import Any, Callable, Mapping, NamedTuple, Optional, Union
+from threading import Event, current_thread
+
+try:
+    from watchdog.events import FileSystemEventHandler
+    from watchdog.observers import Observer
+except ImportError:
+    FileSystemEventHandler = object
+    Observer = None
 
 logger = logging.getLogger("main")
-_FILE_PATH = "config.json"
+# 設置檔路徑，模擬與測試工具可由環境變數`ARK_CONFIG`指定獨立的設置檔
+_FILE_PATH = environ.get("ARK_CONFIG", "config.json")
+# 無法監看檔案時的輪詢間隔(秒)
+_POLL_INTERVAL = 1.0
+# 監看檔案時仍定期比對，避免漏接事件
+_WATCH_INTERVAL = 10.0
+# 收到變更後等待編輯器寫入完成
+_DEBOUNCE = 0.2
+# 必填欄位
+_REQUIRED = object()
 
 _CONFIG: dict
-modify_time = 0
+modify_time = None
 
 def _gen_config():
     """
@@ -19,7 +38,7 @@ def _gen_config():
     """
     with open("config-example.json", mode="rb") as example_file:
         EXAMPLE_DATA = example_file.read()
-    with open("config.json", mode="wb") as config_file:
+    with open(_FILE_PATH, mode="wb") as config_file:
         config_file.write(EXAMPLE_DATA)
     Config.update()
     sleep(1)
@@ -28,13 +47,19 @@ def _gen_config():
     Config.ready(False)
     current_thread().stop()
 
-def _config_patch():
+def _config_patch() -> dict:
     """
-    設置檔完整度檢查。
+    設置檔完整度檢查，僅在有缺漏時寫回設置檔。
+
+    return: :class:`dict`
+        修復後的設置。
     """
     EXAMPLE_DATA = Json.load("config-example.json")
     CONFIG_DATA = Json.load(_FILE_PATH)
-    Json.dump("config.json", __patch(EXAMPLE_DATA, CONFIG_DATA))
+    PATCHED_DATA = __patch(EXAMPLE_DATA, CONFIG_DATA)
+    if PATCHED_DATA != CONFIG_DATA:
+        Json.dump(_FILE_PATH, PATCHED_DATA)
+    return PATCHED_DATA
 
 def __patch(example: dict, config: dict):
     """
@@ -52,44 +77,206 @@ def __patch(example: dict, config: dict):
             config[key] = value
     return config
 
-class _Discord_Config(dict):
+class Config_Error(ValueError):
+    """
+    設置檔內容錯誤，`errors`包含所有錯誤欄位。
+    """
+    def __init__(self, errors: list[str]) -> None:
+        super().__init__("; ".join(errors))
+        self.errors = errors
+
+# 欄位轉換函式: (原始值, 欄位路徑, 錯誤列表, 更新前的值) -> 轉換後的值
+_Converter = Callable[[Any, str, list[str], Any], Any]
+
+def _typed(*types: type) -> _Converter:
+    """
+    檢查型別的轉換函式，`bool`不視為`int`。
+
+    return: :class:`_Converter`
+    """
+    names = "/".join(_type.__name__ for _type in types)
+    def convert(value, path: str, errors: list[str], previous=None):
+        if type(value) not in types:
+            errors.append(f"{path}: expected {names}, got {type(value).__name__}")
+            return None
+        return value
+    return convert
+
+_STR = _typed(str)
+_INT = _typed(int)
+_BOOL = _typed(bool)
+_NUMBER = _typed(int, float)
+
+def _list_of(item: _Converter) -> _Converter:
+    """
+    列表，轉換為`tuple`。
+
+    return: :class:`_Converter`
+    """
+    def convert(value, path: str, errors: list[str], previous=None):
+        if type(value) != list:
+            errors.append(f"{path}: expected list, got {type(value).__name__}")
+            return ()
+        return tuple(item(element, f"{path}[{index}]", errors) for index, element in enumerate(value))
+    return convert
+
+def _mapping_of(item: _Converter) -> _Converter:
+    """
+    以字串為鍵的字典，轉換為唯讀的`MappingProxyType`。
+
+    return: :class:`_Converter`
+    """
+    def convert(value, path: str, errors: list[str], previous=None):
+        if type(value) != dict:
+            errors.append(f"{path}: expected dict, got {type(value).__name__}")
+            return MappingProxyType({})
+        return MappingProxyType({key: item(element, f"{path}.{key}", errors) for key, element in value.items()})
+    return convert
+
+def _time_zone(value, path: str, errors: list[str], previous=None) -> Optional[d_timezone]:
+    if _NUMBER(value, path, errors) == None:
+        return None
+    return d_timezone(d_timedelta(hours=value))
+
+def _days(value, path: str, errors: list[str], previous=None) -> Optional[d_timedelta]:
+    if _NUMBER(value, path, errors) == None:
+        return None
+    return d_timedelta(days=value)
+
+class _Config_Node:
+    """
+    唯讀設置區段的基底類別。
+    欄位由`_schema`宣告，建立時一次完成驗證、轉換與衍生值計算，之後不可修改。
+    內容與更新前相同的子區段直接沿用舊物件。
+    """
+    __slots__ = ("raw",)
+    # (欄位名稱, 轉換函式, 預設值)
+    _schema: tuple[tuple[str, _Converter, Any], ...] = ()
+    # 允許於建立後設定的欄位
+    _mutable: frozenset[str] = frozenset()
+    raw: dict
+
+    def __init__(self, _config: dict, previous: Optional["_Config_Node"]=None) -> None:
+        """
+        previous: :class:`_Config_Node | None`
+            更新前的同一區段。
+
+        return: :class:`None`
+        """
+        errors: list[str] = []
+        self._build(_config, "", errors, previous)
+        if errors:
+            raise Config_Error(errors)
+
+    @classmethod
+    def _compile(self, value, path: str, errors: list[str], previous=None) -> "_Config_Node":
+        """
+        作為子區段的轉換函式。
+        """
+        node = self.__new__(self)
+        node._build(value, path, errors, previous if type(previous) == self else None)
+        return node
+
+    def _build(self, _config: dict, path: str, errors: list[str], previous: Optional["_Config_Node"]) -> None:
+        if type(_config) != dict:
+            errors.append(f"{path or 'config'}: expected dict, got {type(_config).__name__}")
+            _config = {}
+        error_count = len(errors)
+        object.__setattr__(self, "raw", _config)
+        for name, convert, default in self._schema:
+            field_path = f"{path}.{name}" if path else name
+            if name in _config:
+                if previous != None and previous.raw.get(name, _REQUIRED) == _config[name]:
+                    value = getattr(previous, name)
+                else:
+                    value = convert(_config[name], field_path, errors, None if previous == None else getattr(previous, name))
+            elif default is _REQUIRED:
+                errors.append(f"{field_path}: missing")
+                value = None
+            else:
+                value = default
+            object.__setattr__(self, name, value)
+        if len(errors) == error_count:
+            self._derive(path, errors, previous)
+
+    def _derive(self, path: str, errors: list[str], previous: Optional["_Config_Node"]) -> None:
+        """
+        計算衍生值與跨欄位檢查，僅在欄位皆正確時呼叫。
+        """
+
+    def __setattr__(self, name: str, value) -> None:
+        if name not in self._mutable:
+            raise AttributeError(f"{type(self).__name__}.{name} is read-only")
+        object.__setattr__(self, name, value)
+
+    def __delattr__(self, name: str) -> None:
+        raise AttributeError(f"{type(self).__name__}.{name} is read-only")
+
+    def __repr__(self) -> str:
+        return f"{type(self).__name__}({self.raw!r})"
+
+class _Discord_Config(_Config_Node):
+    __slots__ = ("token", "prefixs", "admin_role")
+    _schema = (
+        ("token", _STR, _REQUIRED),
+        ("prefixs", _list_of(_STR), _REQUIRED),
+        ("admin_role", _INT, _REQUIRED),
+    )
     token: str
-    prefixs: list[str] = []
+    prefixs: tuple[str, ...]
     admin_role: int
-    def __init__(self, _config: dict) -> None:
-        for item in _config.items():
-            self[item[0]] = item[1]
-        self.token = _config["token"]
-        self.prefixs = _config["prefixs"]
-        self.admin_role = _config["admin_role"]
-
-class _Rcon_Info(dict):
+
+class _Rcon_Info(_Config_Node):
+    __slots__ = ("address", "port", "password", "timeout", "m_filter", "poll_min", "poll_max", "connection")
+    _schema = (
+        ("address", _STR, _REQUIRED),
+        ("port", _INT, _REQUIRED),
+        ("password", _STR, _REQUIRED),
+        ("timeout", _NUMBER, _REQUIRED),
+        ("m_filter", _STR, _REQUIRED),
+        ("poll_min", _NUMBER, 0.2),
+        ("poll_max", _NUMBER, 5),
+    )
     address: str
     port: int
     password: str
     timeout: int
     m_filter: str
-    def __init__(self, _config: dict) -> None:
-        for item in _config.items():
-            self[item[0]] = item[1]
-        self.address = _config["address"]
-        self.port = _config["port"]
-        self.password = _config["password"]
-        self.timeout = _config["timeout"]
-        self.m_filter = _config["m_filter"]
-
-class _Discord_Info(dict):
+    poll_min: float
+    poll_max: float
+    # 變更後需要重新連線的設定
+    connection: tuple
+
+    def _derive(self, path: str, errors: list[str], previous: Optional["_Rcon_Info"]) -> None:
+        object.__setattr__(self, "connection", (self.address, self.port, self.password, self.timeout))
+
+class _Discord_Info(_Config_Node):
+    __slots__ = ("chat_channel", "state_channel", "message_forward")
+    _schema = (
+        ("chat_channel", _INT, _REQUIRED),
+        ("state_channel", _INT, _REQUIRED),
+        ("message_forward", _BOOL, _REQUIRED),
+    )
     chat_channel: int
     state_channel: int
     message_forward: bool
-    def __init__(self, _config: dict) -> None:
-        for item in _config.items():
-            self[item[0]] = item[1]
-        self.chat_channel = _config["chat_channel"]
-        self.state_channel = _config["state_channel"]
-        self.message_forward = _config["message_forward"]
-
-class _Ark_Server(dict):
+
+class _Ark_Server(_Config_Node):
+    __slots__ = ("key", "local", "dir_path", "file_name", "display_name", "rcon", "discord", "save", "restart", "clear_dino", "rcon_session")
+    _schema = (
+        ("key", _STR, _REQUIRED),
+        ("local", _BOOL, _REQUIRED),
+        ("dir_path", _STR, _REQUIRED),
+        ("file_name", _STR, _REQUIRED),
+        ("display_name", _STR, _REQUIRED),
+        ("rcon", _Rcon_Info._compile, _REQUIRED),
+        ("discord", _Discord_Info._compile, _REQUIRED),
+        ("save", _STR, _REQUIRED),
+        ("restart", _STR, _REQUIRED),
+        ("clear_dino", _BOOL, _REQUIRED),
+    )
+    # 執行期間綁定的連線，不屬於設置內容
+    _mutable = frozenset(("rcon_session",))
     key: str
     local: bool
     dir_path: str
@@ -100,114 +287,382 @@ class _Ark_Server(dict):
     save: str
     restart: str
     clear_dino: bool
-    rcon_session = None
-    def __init__(self, _config: dict) -> None:
-        for item in _config.items():
-            self[item[0]] = item[1]
-        self.key = _config["key"]
-        self.local = _config["local"]
-        self.dir_path = _config["dir_path"]
-        self.file_name = _config["file_name"]
-        self.display_name = _config["display_name"]
-        self.rcon = _Rcon_Info(_config["rcon"])
-        self.discord = _Discord_Info(_config["discord"])
-        self.save = _config["save"]
-        self.restart = _config["restart"]
-        self.clear_dino = _config["clear_dino"]
-
-class _Web_Console(dict):
+    rcon_session: Any
+
+    def _derive(self, path: str, errors: list[str], previous: Optional["_Ark_Server"]) -> None:
+        object.__setattr__(self, "rcon_session", None)
+
+class _Web_Console(_Config_Node):
+    __slots__ = ("host", "port", "debug")
+    _schema = (
+        ("host", _STR, _REQUIRED),
+        ("port", _INT, _REQUIRED),
+        ("debug", _BOOL, _REQUIRED),
+    )
     host: str
     port: int
     debug: bool
-    def __init__(self, _config: dict) -> None:
-        for item in _config.items():
-            self[item[0]] = item[1]
-        self.host = _config["host"]
-        self.port = _config["port"]
-        self.debug = _config["debug"]
-
-class _Time_Data(list[str, bool]):
+
+class _Time_Data(NamedTuple):
     time: d_time
     backup: bool
-    def __init__(self, _config: list) -> None:
-        for item in _config:
-            self.append(item)
-        self.time = d_time.fromisoformat(_config[0])
-        self.backup = _config[1]
 
-class _Time_Setting(dict):
+def _time_data(value, path: str, errors: list[str], previous=None) -> Optional[_Time_Data]:
+    """
+    排程時間，格式為`["HH:MM:SS", 是否備份]`。
+
+    return: :class:`_Time_Data | None`
+    """
+    if type(value) != list or len(value) != 2:
+        errors.append(f"{path}: expected [time, backup]")
+        return None
+    if _STR(value[0], f"{path}[0]", errors) == None or _BOOL(value[1], f"{path}[1]", errors) == None:
+        return None
+    try:
+        return _Time_Data(d_time.fromisoformat(value[0]), value[1])
+    except ValueError:
+        errors.append(f"{path}[0]: invalid time {value[0]!r}")
+        return None
+
+class _Time_Setting(_Config_Node):
+    __slots__ = ("time_zone", "save_delay", "save_concurrency", "save_tables", "restart_tables", "backup_day")
+    _schema = (
+        ("time_zone", _time_zone, _REQUIRED),
+        ("save_delay", _NUMBER, _REQUIRED),
+        ("save_concurrency", _INT, _REQUIRED),
+        ("save_tables", _mapping_of(_list_of(_time_data)), _REQUIRED),
+        ("restart_tables", _mapping_of(_list_of(_time_data)), _REQUIRED),
+        ("backup_day", _days, _REQUIRED),
+    )
     time_zone: d_timezone
     save_delay: int
-    save_tables: dict[list[_Time_Data]] = {}
-    restart_tables: dict[list[_Time_Data]] = {}
+    save_concurrency: int
+    save_tables: Mapping[str, tuple[_Time_Data, ...]]
+    restart_tables: Mapping[str, tuple[_Time_Data, ...]]
     backup_day: d_timedelta
-    def __init__(self, _config: dict) -> None:
-        for item in _config.items():
-            self[item[0]] = item[1]
-        self.time_zone = d_timezone(d_timedelta(hours=_config["time_zone"]))
-        self.save_delay = _config["save_delay"]
-        _save_tables: dict = _config["save_tables"]
-        for key in _save_tables.keys():
-            time_data = _save_tables[key]
-            self.save_tables[key] = [_Time_Data(__config) for __config in time_data]
-        _restart_tables: dict = _config["restart_tables"]
-        for key in _restart_tables.keys():
-            time_data = _restart_tables[key]
-            self.restart_tables[key] = [_Time_Data(__config) for __config in time_data]
-        self.backup_day = d_timedelta(days=_config["backup_day"])
-
-class _Other_Setting(dict):
+
+class _Backup_Setting(_Config_Node):
+    __slots__ = ("compression", "level", "workers", "keep_hourly", "keep_daily", "keep_weekly", "max_bytes_per_sec")
+    _schema = (
+        ("compression", _STR, _REQUIRED),
+        ("level", _INT, _REQUIRED),
+        ("workers", _INT, _REQUIRED),
+        ("keep_hourly", _INT, _REQUIRED),
+        ("keep_daily", _INT, _REQUIRED),
+        ("keep_weekly", _INT, _REQUIRED),
+        ("max_bytes_per_sec", _INT, _REQUIRED),
+    )
+    compression: str
+    level: int
+    workers: int
+    keep_hourly: int
+    keep_daily: int
+    keep_weekly: int
+    max_bytes_per_sec: int
+
+_FILTER_TABLE = _mapping_of(_list_of(_STR))
+
+class _Other_Setting(_Config_Node):
+    __slots__ = ("low_battery", "m_filter_tables", "m_filters", "log_level", "message", "state_message", "compiled")
+    _schema = (
+        ("low_battery", _INT, _REQUIRED),
+        ("m_filter_tables", _mapping_of(_FILTER_TABLE), _REQUIRED),
+        ("log_level", _STR, _REQUIRED),
+        ("message", _mapping_of(_STR), _REQUIRED),
+        ("state_message", _mapping_of(_STR), _REQUIRED),
+    )
     low_battery: int
-    m_filter_tables: dict[dict[list[str]]] = {}
+    m_filter_tables: Mapping[str, Mapping[str, tuple[str, ...]]]
+    m_filters: Mapping[str, Chat_Filter]
     log_level: str
-    message: dict[str] = {}
-    state_message: dict[str] = {}
-    def __init__(self, _config: dict):
-        for item in _config.items():
-            self[item[0]] = item[1]
-        self.low_battery = _config["low_battery"]
-        self.m_filter_tables = _config["m_filter_tables"].copy()
-        self.log_level = _config["log_level"]
-        self.message = _config["message"]
-        self.state_message = _config["state_message"]
-
-class Config:
+    message: Mapping[str, str]
+    state_message: Mapping[str, str]
+    # 本次重新編譯的過濾表
+    compiled: tuple[str, ...]
+
+    def _derive(self, path: str, errors: list[str], previous: Optional["_Other_Setting"]) -> None:
+        m_filters = {}
+        compiled = []
+        for key, table in self.m_filter_tables.items():
+            if previous != None and previous.m_filter_tables.get(key) == table:
+                m_filters[key] = previous.m_filters[key]
+            else:
+                m_filters[key] = Chat_Filter(table)
+                compiled.append(key)
+        object.__setattr__(self, "m_filters", MappingProxyType(m_filters))
+        object.__setattr__(self, "compiled", tuple(compiled))
+
+class _Config_Snapshot(_Config_Node):
+    """
+    完整的設置快照，更新時整體替換。
+    """
+    __slots__ = ("discord", "servers", "web_console", "time_setting", "backup_setting", "other_setting", "channels")
+    _schema = (
+        ("discord", _Discord_Config._compile, _REQUIRED),
+        ("servers", _list_of(_Ark_Server._compile), _REQUIRED),
+        ("web_console", _Web_Console._compile, _REQUIRED),
+        ("time_setting", _Time_Setting._compile, _REQUIRED),
+        ("backup_setting", _Backup_Setting._compile, _REQUIRED),
+        ("other_setting", _Other_Setting._compile, _REQUIRED),
+    )
     discord: _Discord_Config
-    servers: list[_Ark_Server] = []
+    servers: tuple[_Ark_Server, ...]
     web_console: _Web_Console
     time_setting: _Time_Setting
+    backup_setting: _Backup_Setting
     other_setting: _Other_Setting
+    # 聊天頻道 -> 伺服器
+    channels: Mapping[int, _Ark_Server]
+
+    def _derive(self, path: str, errors: list[str], previous: Optional["_Config_Snapshot"]) -> None:
+        servers = list(self.servers)
+        if previous != None and self.servers is not previous.servers:
+            # 內容未變更的伺服器沿用舊物件(與其連線)
+            old_servers = {server.key: server for server in previous.servers}
+            for index, server in enumerate(servers):
+                old_server = old_servers.get(server.key)
+                if old_server != None and old_server.raw == server.raw:
+                    servers[index] = old_server
+        keys = set()
+        for index, server in enumerate(servers):
+            server_path = f"servers[{index}]"
+            if server.key in keys:
+                errors.append(f"{server_path}.key: duplicate key {server.key!r}")
+            keys.add(server.key)
+            if server.rcon.m_filter not in self.other_setting.m_filter_tables:
+                errors.append(f"{server_path}.rcon.m_filter: unknown filter table {server.rcon.m_filter!r}")
+            if server.save != "" and server.save not in self.time_setting.save_tables:
+                errors.append(f"{server_path}.save: unknown save table {server.save!r}")
+            if server.restart != "" and server.restart not in self.time_setting.restart_tables:
+                errors.append(f"{server_path}.restart: unknown restart table {server.restart!r}")
+        self._set_servers(servers)
+
+    def _set_servers(self, servers: list[_Ark_Server]) -> None:
+        object.__setattr__(self, "servers", tuple(servers))
+        channels = {}
+        for server in servers:
+            # 聊天頻道重複時以設置檔中較前的伺服器為準
+            channels.setdefault(server.discord.chat_channel, server)
+        object.__setattr__(self, "channels", MappingProxyType(channels))
+
+    def with_servers(self, servers: list[_Ark_Server]) -> "_Config_Snapshot":
+        """
+        複製快照並替換伺服器列表。
+
+        servers: :class:`list[_Ark_Server]`
+            伺服器列表。
+
+        return: :class:`_Config_Snapshot`
+        """
+        snapshot = _Config_Snapshot.__new__(_Config_Snapshot)
+        for name in ("raw",) + self.__slots__:
+            object.__setattr__(snapshot, name, getattr(self, name))
+        snapshot._set_servers(servers)
+        return snapshot
+
+def _snapshot_property(name: str) -> property:
+    return property(lambda self: getattr(self.current, name))
+
+class _Config_Meta(type):
+    """
+    `Config.discord`等屬性皆讀取當前快照。
+    """
+    config = _snapshot_property("raw")
+    discord = _snapshot_property("discord")
+    servers = _snapshot_property("servers")
+    web_console = _snapshot_property("web_console")
+    time_setting = _snapshot_property("time_setting")
+    backup_setting = _snapshot_property("backup_setting")
+    other_setting = _snapshot_property("other_setting")
+    channels = _snapshot_property("channels")
+
+_SECTIONS = ("discord", "web_console", "time_setting", "backup_setting", "other_setting")
+
+class Config(metaclass=_Config_Meta):
+    """
+    當前設置。
+    設置檔每次載入時編譯為一份唯讀快照(`current`)並整體替換，
+    需要多個區段一致時應先取得`Config.current`再讀取。
+    """
+    current: Optional[_Config_Snapshot] = None
     updated: bool = False
     readied: Union[bool, None] = None
+    # 最近一次載入的耗時與變更項目，每次載入整體替換
+    last_reload: MappingProxyType = MappingProxyType({})
+    # 以tuple整體替換，通知期間註冊或取消不影響當次通知
+    _listeners: tuple[Callable[[], None], ...] = ()
 
     @classmethod
     def update(self):
         """
         從設置檔中更新當前設置。
+        內容未變更的區段沿用舊物件；RCON 連線資訊未變更的伺服器沿用原有連線。
+        設置有誤時拋出`Config_Error`，並保留當前設置。
         """
         global _CONFIG
-        _config_patch()
-        _CONFIG = Json.load(_FILE_PATH)
-
-        self.config = _CONFIG.copy()
-        self.discord = _Discord_Config(_CONFIG["discord"])
-        i = 0
-        for _config in _CONFIG["servers"]:
-            if len(self.servers) > i:
-                from modules.rcon import Rcon_Session
-                self.servers[i].rcon_session = Rcon_Session(self.servers[i])
-            else:
-                self.servers.append(_Ark_Server(_config))
-            i += 1
-        self.web_console = _Web_Console(_CONFIG["web_console"])
-        self.time_setting = _Time_Setting(_CONFIG["time_setting"])
-        self.other_setting = _Other_Setting(_CONFIG["other_setting"])
+        start_time = perf_counter()
+        _CONFIG = _config_patch()
+        previous = self.current
+        snapshot = _Config_Snapshot(_CONFIG, previous)
+        touched = [
+            key for key in _SECTIONS
+            if previous == None or getattr(snapshot, key) is not getattr(previous, key)
+        ]
+        if "other_setting" in touched:
+            touched += [f"m_filter_tables.{key}" for key in snapshot.other_setting.compiled]
+        server_touched, closing = self._bind_sessions(snapshot, previous)
+        touched += server_touched
+        # 整體替換，讀取端不會取得更新到一半的設置
+        self.current = snapshot
+        for rcon_session in closing:
+            rcon_session.close()
+
         self.updated = True
+        elapsed = perf_counter() - start_time
+        self.last_reload = MappingProxyType({
+            "elapsed": elapsed,
+            "touched": tuple(touched)
+        })
+        if not touched:
+            return
+        logger.info(f"Config reloaded in {elapsed * 1000:.1f} ms, touched: {', '.join(touched)}")
+        self._notify()
+
+    @classmethod
+    def _notify(self) -> None:
+        for listener in self._listeners:
+            try:
+                listener()
+            except Exception as e:
+                logger.error(f"Config listener failed: {e!r}")
+
+    @classmethod
+    def _bind_sessions(self, snapshot: _Config_Snapshot, previous: Optional[_Config_Snapshot]) -> tuple[list[str], list]:
+        """
+        依伺服器`key`比對並綁定`Rcon_Session`。
+        連線資訊變更或新增的伺服器建立新連線，其餘沿用。
+
+        return: :class:`tuple[list[str], list[Rcon_Session]]`
+            (有變更的項目, 需關閉的連線)
+        """
+        from modules.rcon import Rcon_Session
+        old_servers = {} if previous == None else {server.key: server for server in previous.servers}
+        touched: list[str] = []
+        closing = []
+        for server in snapshot.servers:
+            old_server = old_servers.pop(server.key, None)
+            if old_server is server:
+                continue
+            rcon_session = None if old_server == None else old_server.rcon_session
+            if rcon_session != None and old_server.rcon.connection == server.rcon.connection:
+                rcon_session.rebind(server)
+                touched.append(f"servers.{server.key}")
+            else:
+                if rcon_session != None:
+                    closing.append(rcon_session)
+                rcon_session = Rcon_Session(server)
+                touched.append(f"servers.{server.key}.{'new' if old_server == None else 'rcon'}")
+            server.rcon_session = rcon_session
+        for key, old_server in old_servers.items():
+            if old_server.rcon_session != None:
+                closing.append(old_server.rcon_session)
+            touched.append(f"servers.{key}.removed")
+        return touched, closing
+
+    @classmethod
+    def use_servers(self, servers: list[_Ark_Server]) -> None:
+        """
+        以指定的伺服器取代當前設置中的伺服器，供模擬與測試工具使用。
+        設置檔再次更新時會依設置檔重新比對。
+
+        servers: :class:`list[_Ark_Server]`
+            已綁定`rcon_session`的伺服器。
+
+        return: :class:`None`
+        """
+        self.current = self.current.with_servers(servers)
+        self._notify()
+
+    @classmethod
+    def subscribe(self, listener: Callable[[], None]) -> None:
+        """
+        註冊設置檔更新後呼叫的函式。
+
+        listener: :class:`Callable[[], None]`
+            回呼函式。
+
+        return: :class:`None`
+        """
+        self._listeners = self._listeners + (listener,)
+
+    @classmethod
+    def unsubscribe(self, listener: Callable[[], None]) -> bool:
+        """
+        取消註冊設置檔更新後呼叫的函式。
+
+        listener: :class:`Callable[[], None]`
+            回呼函式。
+
+        return: :class:`bool`
+            是否曾經註冊。
+        """
+        if listener not in self._listeners:
+            return False
+        listeners = list(self._listeners)
+        listeners.remove(listener)
+        self._listeners = tuple(listeners)
+        return True
 
     @classmethod
     def ready(self, value: bool):
         self.readied = value
 
+def _file_stamp() -> Optional[tuple[int, int]]:
+    """
+    設置檔的修改時間與大小。
+
+    return: :class:`tuple[int, int] | None`
+    """
+    try:
+        file_stat = stat(_FILE_PATH)
+    except FileNotFoundError:
+        return None
+    return (file_stat.st_mtime_ns, file_stat.st_size)
+
+class _Config_Watcher(FileSystemEventHandler):
+    """
+    監看設置檔所在資料夾，設置檔變更時通知更新線程。
+    """
+    def __init__(self, changed: Event) -> None:
+        super().__init__()
+        self.changed = changed
+        # `_FILE_PATH`可能為相對路徑或`ARK_CONFIG`指定的完整路徑
+        self.path = normcase(abspath(_FILE_PATH))
+
+    def on_any_event(self, event) -> None:
+        paths = (getattr(event, "src_path", ""), getattr(event, "dest_path", ""))
+        if any(normcase(abspath(path)) == self.path for path in paths if path):
+            self.changed.set()
+
+def _start_watcher(changed: Event) -> bool:
+    """
+    嘗試以檔案系統事件(inotify、ReadDirectoryChangesW等)監看設置檔。
+
+    return: :class:`bool`
+        是否成功，失敗時改為定期比對修改時間。
+    """
+    if Observer == None:
+        return False
+    try:
+        observer = Observer()
+        observer.schedule(_Config_Watcher(changed), dirname(abspath(_FILE_PATH)), recursive=False)
+        observer.daemon = True
+        observer.start()
+    except Exception as e:
+        logger.warning(f"Config watcher unavailable, fall back to polling: {e!r}")
+        return False
+    return True
+
 def auto_update():
     """
     自動更新設置檔。
@@ -217,15 +672,31 @@ def auto_update():
     if not isfile(_FILE_PATH):
         _gen_config()
     else:
-        Config.update()
+        try:
+            Config.update()
+        except Config_Error as e:
+            logger.critical("config.json is invalid:\n" + "\n".join(e.errors))
+            Config.ready(False)
+            current_thread().stop()
+    modify_time = _file_stamp()
     # 準備完成
     Config.ready(True)
+    changed = Event()
+    interval = _WATCH_INTERVAL if _start_watcher(changed) else _POLL_INTERVAL
     while True:
-        # 檢查設置檔修改時間
-        if getmtime("config.json") != modify_time:
+        if changed.wait(interval):
+            sleep(_DEBOUNCE)
+        changed.clear()
+        # 檢查設置檔修改時間與大小
+        stamp = _file_stamp()
+        if stamp == None or stamp == modify_time:
+            continue
+        try:
             Config.update()
-            modify_time = getmtime("config.json")
-        sleep(1)
+        except Exception as e:
+            # 編輯中或格式錯誤，保留目前設置直到下次變更
+            logger.error(f"Config reload failed, keep current config: {e!r}")
+        modify_time = _file_stamp()
 
 auto_update_thread = Thread(target=auto_update, name="Config_Auto_Update")
 auto_update_thread.start()
@@ -0,0 +1,288 @@
+from concurrent.futures import ThreadPoolExecutor
+from heapq import heappop, heappush
+import logging
+from modules.clock import Clock
+from modules.config import Config
+from modules.threading import Thread
+from threading import Condition, Lock
+from typing import Callable, Optional
+
+logger = logging.getLogger("main")
+
+# 倒數結束後送出存檔指令所使用的線程數，等待存檔回覆與重啟於RCON事件迴圈中進行
+_FINISH_WORKERS = 4
+
+EVENT_REASON = "reason"
+EVENT_NOTICE = "notice"
+EVENT_FINAL = "final"
+
+def format_minutes(minutes: float) -> str:
+    """
+    將分鐘數轉為公告用的文字，整數不顯示小數。
+
+    return: :class:`str`
+    """
+    minutes = round(minutes, 2)
+    return str(int(minutes)) if minutes == int(minutes) else str(minutes)
+
+def _notice_minutes(delay: float) -> list[float]:
+    """
+    倒數期間需要公告的剩餘分鐘數(由大至小)。
+    30分鐘內每5分鐘及最後5分鐘每分鐘公告，不足1分鐘的倒數於剩餘30秒時公告。
+
+    return: :class:`list[float]`
+    """
+    minutes = [
+        float(minute) for minute in range(int(delay), 0, -1)
+        if (minute % 5 == 0 and minute <= 30) or minute < 5
+    ]
+    if delay < 1 and delay > 0.5:
+        minutes.append(0.5)
+    return minutes
+
+class Countdown():
+    """
+    單一伺服器的存檔、關機或重啟倒數，不佔用線程。
+    """
+    def __init__(
+        self,
+        template: str,
+        delay: float,
+        reason: str,
+        announce: Callable[[str, str], None],
+        check: Callable[[], bool],
+        finish: Callable[[], None],
+        name: str=""
+    ) -> None:
+        """
+        初始化`Countdown()`
+
+        template: :class:`str`
+            公告樣板名稱(`Config.other_setting.message`的鍵)。
+        delay: :class:`float`
+            倒數時間(分鐘)，可為小數。
+        reason: :class:`str`
+            原因。
+        announce: :class:`Callable[[str, str], None]`
+            公告函式，參數為(已套用樣板的訊息, 原因)。
+        check: :class:`Callable[[], bool]`
+            每次公告前檢查是否可繼續，返回`False`時中止倒數。
+        finish: :class:`Callable[[], None]`
+            倒數結束後於工作線程中執行。
+        name: :class:`str`
+            名稱，用於紀錄。
+
+        return: :class:`None`
+        """
+        self.template = template
+        self.reason = reason
+        self.announce = announce
+        self.check = check
+        self.finish = finish
+        self.name = name
+        self.cancelled = False
+        self.finished = False
+        self.version = 0
+        self._events: list[tuple[float, str, float]] = []
+        self._set_delay(delay)
+
+    def _set_delay(self, delay: float) -> None:
+        now = Clock.monotonic()
+        self.delay = max(0.0, delay)
+        self.end_time = now + self.delay * 60
+        events = []
+        notices = _notice_minutes(self.delay)
+        if self.reason != "" and self.delay >= 1:
+            events.append((now, EVENT_REASON, self.delay))
+            # 附帶原因的公告已包含當前時間
+            notices = [minute for minute in notices if minute < self.delay]
+        events += [(self.end_time - minute * 60, EVENT_NOTICE, minute) for minute in notices]
+        events.append((self.end_time, EVENT_FINAL, 0.0))
+        self._events = sorted(events, key=lambda event: event[0], reverse=True)
+        self.version += 1
+
+    @property
+    def remaining(self) -> float:
+        """
+        剩餘秒數。
+
+        return: :class:`float`
+        """
+        return max(0.0, self.end_time - Clock.monotonic())
+
+    def next_time(self) -> Optional[float]:
+        return self._events[-1][0] if self._events else None
+
+    def due(self, now: float) -> list[tuple[float, str, float]]:
+        """
+        取出所有到期的事件。
+
+        return: :class:`list[tuple[float, str, float]]`
+        """
+        events = []
+        while self._events and self._events[-1][0] <= now:
+            events.append(self._events.pop())
+        return events
+
+    def info(self) -> dict:
+        return {
+            "name": self.name,
+            "template": self.template,
+            "remaining": self.remaining,
+            "reason": self.reason,
+            "cancelled": self.cancelled,
+            "finished": self.finished
+        }
+
+class Countdown_Engine:
+    """
+    全主機共用的倒數計時器，所有伺服器的倒數由同一個線程驅動。
+    同一時刻到期的公告，每個樣板只套用一次。
+    """
+    thread: Optional[Thread] = None
+    _heap: list[tuple[float, int, int, Countdown]] = []
+    _sequence = 0
+    _condition = Condition(Lock())
+    _executor: Optional[ThreadPoolExecutor] = None
+
+    @classmethod
+    def _ensure_started(self) -> None:
+        if self.thread == None:
+            self._executor = ThreadPoolExecutor(max_workers=_FINISH_WORKERS, thread_name_prefix="Save_Job")
+            self.thread = Thread(target=self._run, name="Countdown")
+            self.thread.start()
+
+    @classmethod
+    def _push(self, countdown: Countdown) -> None:
+        next_time = countdown.next_time()
+        if next_time != None:
+            self._sequence += 1
+            heappush(self._heap, (next_time, self._sequence, countdown.version, countdown))
+
+    @classmethod
+    def start(self, countdown: Countdown) -> Countdown:
+        """
+        開始倒數。
+
+        countdown: :class:`Countdown`
+            倒數。
+
+        return: :class:`Countdown`
+        """
+        with self._condition:
+            self._ensure_started()
+            self._push(countdown)
+            self._condition.notify()
+        return countdown
+
+    @classmethod
+    def cancel(self, countdown: Countdown) -> bool:
+        """
+        立即取消倒數，已進入存檔流程時無法取消。
+
+        countdown: :class:`Countdown`
+            倒數。
+
+        return: :class:`bool`
+            是否成功取消。
+        """
+        with self._condition:
+            if countdown.finished:
+                return False
+            countdown.cancelled = True
+            self._condition.notify()
+        return True
+
+    @classmethod
+    def reschedule(self, countdown: Countdown, delay: float) -> bool:
+        """
+        重新設定剩餘倒數時間。
+
+        countdown: :class:`Countdown`
+            倒數。
+        delay: :class:`float`
+            新的倒數時間(分鐘)。
+
+        return: :class:`bool`
+            是否成功。
+        """
+        with self._condition:
+            if countdown.finished or countdown.cancelled:
+                return False
+            countdown._set_delay(delay)
+            self._push(countdown)
+            self._condition.notify()
+        return True
+
+    @classmethod
+    def pending(self) -> int:
+        """
+        進行中的倒數數量。
+
+        return: :class:`int`
+        """
+        with self._condition:
+            return len({id(item[3]) for item in self._heap if not item[3].cancelled})
+
+    @classmethod
+    def _run(self) -> None:
+        logger.info("Countdown Start")
+        while True:
+            with self._condition:
+                while True:
+                    # 丟棄已取消或已重設的項目
+                    while self._heap and (self._heap[0][3].cancelled or self._heap[0][2] != self._heap[0][3].version):
+                        heappop(self._heap)
+                    now = Clock.monotonic()
+                    if self._heap and self._heap[0][0] <= now:
+                        break
+                    self._condition.wait(Clock.real(self._heap[0][0] - now) if self._heap else None)
+                due: list[tuple[Countdown, int, list]] = []
+                while self._heap and self._heap[0][0] <= now:
+                    _, _, version, countdown = heappop(self._heap)
+                    if not countdown.cancelled and version == countdown.version:
+                        due.append((countdown, version, countdown.due(now)))
+            rendered: dict[tuple[str, float], str] = {}
+            for countdown, version, events in due:
+                self._tick(countdown, version, events, rendered)
+
+    @classmethod
+    def _tick(
+        self,
+        countdown: Countdown,
+        version: int,
+        events: list[tuple[float, str, float]],
+        rendered: dict[tuple[str, float], str]
+    ) -> None:
+        """
+        處理單一倒數到期的事件。
+
+        rendered: :class:`dict[tuple[str, float], str]`
+            本次計時已套用的樣板。
+        """
+        if not events:
+            return
+        # 同時到期多個公告時只保留最新一則
+        event = events[-1]
+        try:
+            if not countdown.check():
+                countdown.cancelled = True
+                return
+            template = "saving" if event[1] == EVENT_FINAL else countdown.template
+            key = (template, event[2])
+            message = rendered.get(key)
+            if message == None:
+                message = rendered[key] = Config.other_setting.message[template].replace("$TIME", format_minutes(event[2]))
+            with_reason = event[1] != EVENT_FINAL and any(item[1] == EVENT_REASON for item in events)
+            countdown.announce(message, countdown.reason if with_reason else "")
+        except Exception as e:
+            logger.error(f"Countdown {countdown.name} failed: {e!r}")
+        with self._condition:
+            # 公告期間被取消或重設
+            if countdown.cancelled or countdown.version != version:
+                return
+            if event[1] == EVENT_FINAL:
+                countdown.finished = True
+                self._executor.submit(countdown.finish)
+            else:
+                self._push(countdown)
@@ -1,6 +1,7 @@
 from datetime import datetime, time, timedelta
 from time import sleep
-from typing import Union
+from typing import Optional, Union
+from modules.clock import Clock
 from modules.config import Config
 
 class My_Datetime:
@@ -11,7 +12,7 @@ class My_Datetime:
         return: :class:`datetime`
         """
         while not Config.updated: sleep(0.1)
-        return datetime.now(Config.time_setting.time_zone).replace(tzinfo=None)
+        return datetime.fromtimestamp(Clock.time(), Config.time_setting.time_zone).replace(tzinfo=None)
 
     def in_range(
         target: Union[str, time],
@@ -41,5 +42,15 @@ class My_Datetime:
         end_time = start_time + time_range
         return now_time >= start_time and now_time <= end_time
     
-    def fileformat(timestamp: datetime=now()):
+    def fileformat(timestamp: Optional[datetime]=None) -> str:
+        """
+        將時間轉為可作為檔名的字串。
+
+        timestamp: :class:`datetime | None`
+            時間，預設為當前時間。
+
+        return: :class:`str`
+        """
+        if timestamp == None:
+            timestamp = My_Datetime.now()
         return timestamp.replace(microsecond=0, tzinfo=None).isoformat().replace(":", "_")
\ No newline at end of file
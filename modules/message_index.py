@@ -0,0 +1,93 @@
+from typing import Any, Iterable, Mapping, Optional
+
+# 前綴樹中標記完整前綴的鍵，單一字元的鍵不會與之衝突
+_END = ""
+
+class Prefix_Trie():
+    """
+    指令前綴樹，一次掃描即可找出訊息開頭最長的前綴，耗時與前綴數量無關。
+    """
+    def __init__(self, prefixs: Iterable[str]) -> None:
+        """
+        初始化`Prefix_Trie()`
+
+        prefixs: :class:`Iterable[str]`
+            指令前綴。
+
+        return: :class:`None`
+        """
+        self._root: dict = {}
+        for prefix in prefixs:
+            node = self._root
+            for char in prefix:
+                node = node.setdefault(char, {})
+            node[_END] = True
+
+    def match(self, content: str) -> Optional[int]:
+        """
+        取得`content`開頭最長前綴的長度。
+
+        content: :class:`str`
+            訊息內容。
+
+        return: :class:`int | None`
+            無符合的前綴時為`None`。
+        """
+        node = self._root
+        length = 0 if _END in node else None
+        for index, char in enumerate(content):
+            node = node.get(char)
+            if node == None:
+                break
+            if _END in node:
+                length = index + 1
+        return length
+
+class Message_Index():
+    """
+    Discord 訊息處理所需的索引，設置檔更新時整體重建。
+    """
+    def __init__(
+        self,
+        channels: Mapping[int, Any],
+        admin_roles: Iterable[int],
+        prefixs: Iterable[str]
+    ) -> None:
+        """
+        初始化`Message_Index()`
+
+        channels: :class:`Mapping[int, _Ark_Server]`
+            聊天頻道對應的伺服器，即`Config.current.channels`。
+        admin_roles: :class:`Iterable[int]`
+            管理員身分組。
+        prefixs: :class:`Iterable[str]`
+            指令前綴。
+
+        return: :class:`None`
+        """
+        self.channels = channels
+        self.admin_roles = frozenset(admin_roles)
+        self.prefixs = Prefix_Trie(prefixs)
+
+    def rcon_session(self, channel_id: int) -> Optional[Any]:
+        """
+        取得聊天頻道所屬伺服器的連線。
+
+        channel_id: :class:`int`
+            頻道ID。
+
+        return: :class:`Rcon_Session | None`
+        """
+        server = self.channels.get(channel_id)
+        return None if server == None else server.rcon_session
+
+    def is_admin(self, role_ids: Iterable[int]) -> bool:
+        """
+        是否具有任一管理員身分組。
+
+        role_ids: :class:`Iterable[int]`
+            使用者的身分組ID。
+
+        return: :class:`bool`
+        """
+        return not self.admin_roles.isdisjoint(role_ids)
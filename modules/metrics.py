@@ -0,0 +1,171 @@
+from bisect import bisect_left
+from typing import Optional
+
+_LATENCY_BUCKETS = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0)
+
+class Histogram():
+    """
+    固定區間的數值分布統計。
+    """
+    def __init__(self, buckets: tuple[float]=_LATENCY_BUCKETS) -> None:
+        """
+        初始化`Histogram()`
+
+        buckets: :class:`tuple[float]`
+            各區間上限，最後另有一個無上限區間。
+
+        return: :class:`None`
+        """
+        self.buckets = buckets
+        self.counts = [0] * (len(buckets) + 1)
+        self.count = 0
+        self.total = 0.0
+        self.max = 0.0
+
+    def observe(self, value: float) -> None:
+        """
+        記錄一筆數值。
+
+        value: :class:`float`
+            數值。
+
+        return: :class:`None`
+        """
+        self.counts[bisect_left(self.buckets, value)] += 1
+        self.count += 1
+        self.total += value
+        if value > self.max:
+            self.max = value
+
+    def quantile(self, q: float) -> float:
+        """
+        以區間上限估計分位數。
+
+        q: :class:`float`
+            分位(0~1)。
+
+        return: :class:`float`
+        """
+        if self.count == 0:
+            return 0.0
+        target = q * self.count
+        seen = 0
+        for index, count in enumerate(self.counts):
+            seen += count
+            if seen >= target:
+                return self.buckets[index] if index < len(self.buckets) else self.max
+        return self.max
+
+    def snapshot(self) -> dict:
+        """
+        取得統計資料。
+
+        return: :class:`dict`
+        """
+        return {
+            "count": self.count,
+            "avg": self.total / self.count if self.count else 0.0,
+            "max": self.max,
+            "p50": self.quantile(0.5),
+            "p95": self.quantile(0.95),
+            "p99": self.quantile(0.99),
+            "buckets": dict(zip([str(bucket) for bucket in self.buckets] + ["inf"], self.counts))
+        }
+
+class Duration_Estimate():
+    """
+    以指數移動平均估計耗時。
+    """
+    def __init__(self, alpha: float=0.3) -> None:
+        """
+        初始化`Duration_Estimate()`
+
+        alpha: :class:`float`
+            新數值的權重(0~1)。
+
+        return: :class:`None`
+        """
+        self.alpha = alpha
+        self.value: Optional[float] = None
+        self.last: Optional[float] = None
+        self.count = 0
+
+    def observe(self, seconds: float) -> None:
+        """
+        記錄一次耗時。
+
+        seconds: :class:`float`
+            耗時(秒)。
+
+        return: :class:`None`
+        """
+        self.last = seconds
+        self.value = seconds if self.value == None else self.value + self.alpha * (seconds - self.value)
+        self.count += 1
+
+    def snapshot(self) -> dict:
+        return {
+            "estimate": self.value,
+            "last": self.last,
+            "count": self.count
+        }
+
+class Rcon_Metrics():
+    """
+    單一伺服器的RCON統計資料，除存檔與備份耗時外只在RCON事件迴圈中寫入。
+    """
+    def __init__(self) -> None:
+        self.latency: dict[str, Histogram] = {}
+        self.queue_wait = Histogram()
+        self.bytes_in = 0
+        self.bytes_out = 0
+        self.connects = 0
+        self.disconnects = 0
+        self.getchat_empty = 0
+        self.getchat_non_empty = 0
+        self.save_duration = Duration_Estimate()
+        self.backup_duration = Duration_Estimate()
+
+    def observe_command(self, command: str, latency: float) -> None:
+        """
+        記錄指令延遲，依指令名稱分類。
+
+        command: :class:`str`
+            指令或分類名稱。
+        latency: :class:`float`
+            延遲(秒)。
+
+        return: :class:`None`
+        """
+        name = command.split(" ", 1)[0].lower()
+        histogram = self.latency.get(name)
+        if histogram == None:
+            histogram = self.latency[name] = Histogram()
+        histogram.observe(latency)
+
+    def observe_getchat(self, empty: bool) -> None:
+        if empty:
+            self.getchat_empty += 1
+        else:
+            self.getchat_non_empty += 1
+
+    def snapshot(self) -> dict:
+        """
+        取得統計資料。
+
+        return: :class:`dict`
+        """
+        getchat_total = self.getchat_empty + self.getchat_non_empty
+        return {
+            "latency": {name: histogram.snapshot() for name, histogram in list(self.latency.items())},
+            "queue_wait": self.queue_wait.snapshot(),
+            "bytes_in": self.bytes_in,
+            "bytes_out": self.bytes_out,
+            "connects": self.connects,
+            "disconnects": self.disconnects,
+            "getchat_empty": self.getchat_empty,
+            "getchat_non_empty": self.getchat_non_empty,
+            "getchat_empty_ratio": self.getchat_empty / getchat_total if getchat_total else 0.0,
+            "save_duration": self.save_duration.snapshot(),
+            "backup_duration": self.backup_duration.snapshot()
+        }
@@ -0,0 +1,97 @@
+from os import sep
+from os.path import normcase, normpath
+import psutil
+from threading import Lock
+from time import monotonic
+
+_PROCESS_NAMES = ("shootergameserver.exe", "shootergameserver")
+_REFRESH_INTERVAL = 2.0
+_EXPECT_INTERVAL = 0.5
+_EXPECT_TIMEOUT = 300
+
+def _normalize(path: str) -> str:
+    return normcase(normpath(path.replace("\\", "/")))
+
+def _install_key(path: str) -> str:
+    return _normalize(path).rstrip(sep) + sep
+
+class Process_Tracker:
+    """
+    共用的ShooterGameServer程序索引。
+    所有伺服器共用同一次掃描，已知的PID只檢查是否仍在運行。
+    """
+    _lock = Lock()
+    _processes: dict[int, tuple[str, psutil.Process]] = {}
+    _expected: dict[str, float] = {}
+    _last_refresh: float = 0.0
+
+    @classmethod
+    def _refresh(self) -> None:
+        """
+        重新掃描所有ShooterGameServer程序。
+
+        return: :class:`None`
+        """
+        processes = {}
+        for process in psutil.process_iter(["name", "exe"]):
+            name = (process.info["name"] or "").lower()
+            exe = process.info["exe"]
+            if name not in _PROCESS_NAMES or exe == None:
+                continue
+            processes[process.pid] = (_normalize(exe), process)
+        self._processes = processes
+        self._last_refresh = monotonic()
+
+    @classmethod
+    def _find(self, key: str) -> bool:
+        alive = False
+        for pid, (exe, process) in list(self._processes.items()):
+            if not exe.startswith(key):
+                continue
+            if process.is_running():
+                alive = True
+            else:
+                del self._processes[pid]
+        return alive
+
+    @classmethod
+    def is_alive(self, path: str) -> bool:
+        """
+        檢查安裝於`path`的ARK Server是否正在運行。
+
+        path: :class:`str`
+            ARK 安裝路徑。
+
+        return: :class:`bool`
+        """
+        key = _install_key(path)
+        with self._lock:
+            if self._find(key):
+                self._expected.pop(key, None)
+                return True
+            now = monotonic()
+            expect_time = self._expected.get(key)
+            if expect_time != None and now - expect_time > _EXPECT_TIMEOUT:
+                del self._expected[key]
+                expect_time = None
+            interval = _REFRESH_INTERVAL if expect_time == None else _EXPECT_INTERVAL
+            if now - self._last_refresh < interval:
+                return False
+            self._refresh()
+            if self._find(key):
+                self._expected.pop(key, None)
+                return True
+            return False
+
+    @classmethod
+    def expect(self, path: str) -> None:
+        """
+        標記伺服器即將啟動，在找到程序前以較短間隔掃描。
+
+        path: :class:`str`
+            ARK 安裝路徑。
+
+        return: :class:`None`
+        """
+        with self._lock:
+            self._expected[_install_key(path)] = monotonic()
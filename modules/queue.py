@@ -1,11 +1,167 @@
+from collections import deque
 import queue
+from threading import Lock
+from time import monotonic
+from typing import Any, Callable, Optional
 
 class Queue(queue.Queue):
     """
     可清除式佇列。
     新增:
      - clear(): 清除佇列。
+     - set_listener(): 放入項目後通知，取代輪詢。
     """
+    _listener: Optional[Callable[[], None]] = None
+
     def clear(self):
         while not self.empty():
-            self.get()
\ No newline at end of file
+            self.get()
+
+    def set_listener(self, listener: Optional[Callable[[], None]]) -> None:
+        """
+        設定放入項目後呼叫的函式，於放入項目的線程中執行，應避免阻塞。
+
+        listener: :class:`Callable[[], None] | None`
+            回呼函式，`None`為取消。
+
+        return: :class:`None`
+        """
+        self._listener = listener
+
+    def put(self, item: Any, block: bool=True, timeout: Optional[float]=None) -> None:
+        super().put(item, block, timeout)
+        listener = self._listener
+        if listener != None:
+            listener()
+
+class Schedule_Queue():
+    """
+    優先權排程佇列。
+     - 依等級取出，數字越小越優先。
+     - 同等級中依`group`輪流取出，避免單一來源佔滿佇列。
+     - 超過期限的項目不會被取出，並交由`on_expire`處理。
+    """
+    def __init__(
+        self,
+        levels: int,
+        on_expire: Optional[Callable[[Any], None]]=None
+    ) -> None:
+        """
+        初始化`Schedule_Queue()`
+
+        levels: :class:`int`
+            優先權等級數量。
+        on_expire: :class:`Callable | None`
+            項目逾期時的回呼函式。
+
+        return: :class:`None`
+        """
+        self.on_expire = on_expire
+        self._lock = Lock()
+        self._levels: list[dict[Any, deque]] = [{} for _ in range(levels)]
+        self._size = 0
+        self._stats = [
+            {"depth": 0, "count": 0, "dropped": 0, "wait_total": 0.0, "wait_max": 0.0}
+            for _ in range(levels)
+        ]
+
+    def put(
+        self,
+        item: Any,
+        level: int,
+        group: Any=0,
+        deadline: Optional[float]=None
+    ) -> None:
+        """
+        加入項目。
+
+        item: :class:`Any`
+            項目。
+        level: :class:`int`
+            優先權等級。
+        group: :class:`Any`
+            公平分配用的群組。
+        deadline: :class:`float | None`
+            期限(秒)，超過後不再執行。
+
+        return: :class:`None`
+        """
+        now = monotonic()
+        expire_time = None if deadline == None else now + deadline
+        with self._lock:
+            self._levels[level].setdefault(group, deque()).append((item, now, expire_time))
+            self._stats[level]["depth"] += 1
+            self._size += 1
+
+    def get(self) -> Any:
+        """
+        取出下一個項目，若無則回傳`None`。
+
+        return: :class:`Any`
+        """
+        expired = []
+        result = None
+        now = monotonic()
+        with self._lock:
+            for level, groups in enumerate(self._levels):
+                while groups and result == None:
+                    group = next(iter(groups))
+                    items = groups.pop(group)
+                    item, put_time, expire_time = items.popleft()
+                    if items:
+                        groups[group] = items
+                    stats = self._stats[level]
+                    stats["depth"] -= 1
+                    self._size -= 1
+                    if expire_time != None and now > expire_time:
+                        stats["dropped"] += 1
+                        expired.append(item)
+                        continue
+                    wait = now - put_time
+                    stats["count"] += 1
+                    stats["wait_total"] += wait
+                    stats["wait_max"] = max(stats["wait_max"], wait)
+                    result = item
+                if result != None:
+                    break
+        if self.on_expire != None:
+            for item in expired:
+                self.on_expire(item)
+        return result
+
+    def empty(self) -> bool:
+        return self._size == 0
+
+    def qsize(self) -> int:
+        return self._size
+
+    def clear(self) -> list:
+        """
+        清除佇列。
+
+        return: :class:`list`
+            被清除的項目。
+        """
+        items = []
+        with self._lock:
+            for level, groups in enumerate(self._levels):
+                for group_items in groups.values():
+                    items += [item for item, _, _ in group_items]
+                groups.clear()
+                self._stats[level]["depth"] = 0
+            self._size = 0
+        return items
+
+    def stats(self) -> list[dict]:
+        """
+        取得各等級的佇列深度與等待時間統計。
+
+        return: :class:`list[dict]`
+        """
+        with self._lock:
+            result = []
+            for stats in self._stats:
+                stats = stats.copy()
+                stats["wait_avg"] = stats["wait_total"] / stats["count"] if stats["count"] else 0.0
+                result.append(stats)
+            return result
@@ -1,26 +1,49 @@
+import asyncio
+from concurrent.futures import Future
 import logging
+from modules.backup_pool import Backup_Job, Backup_Pool, Io_Budget
+from modules.backup_store import Backup_Store
+from modules.chat_filter import split_chat
+from modules.clock import Clock
 from modules.config import Config, _Ark_Server, _Rcon_Info
+from modules.countdown import Countdown, Countdown_Engine, format_minutes
 from modules.datetime import My_Datetime
-from modules.queue import Queue
+from modules.metrics import Rcon_Metrics
+from modules.process_tracker import Process_Tracker
+from modules.queue import Queue, Schedule_Queue
+from modules.reconnect import Connect_Budget, Reconnect_Supervisor
+from modules.rcon_engine import Adaptive_Poll, Rcon_Connection, Rcon_Engine
+from modules.snapshot import take_snapshot, wait_settled
 from modules.threading import Thread
-from os import system, makedirs, listdir
-from os.path import join, isdir
-from rcon.source import Client
-from shutil import copyfile, copytree, rmtree
-from subprocess import Popen, PIPE, DEVNULL
-from threading import current_thread
-from time import sleep
+from os import system, listdir
+from os.path import basename, exists, join, isdir, getmtime
+import re
+from shutil import rmtree
+from threading import Event
+from time import sleep, monotonic
 from typing import Optional, Union
 
 logger = logging.getLogger("main")
 ark_logger = logging.getLogger("ark")
 
 _WHILE_SLEEP = 0.2
+_SAVE_TIMEOUT = 600
+# 倒數公告延遲超過此時間(秒)後捨棄，避免連線恢復後送出過時的剩餘時間
+_BROADCAST_DEADLINE = 30
+_STATE_INTERVAL = 1.0
+_EMPTY_REPLY = "Server received, But no response!!"
+_DATE_PREFIX = re.compile(r"\d{4}-\d{2}-\d{2}")
 _TAG_LIST = ["Discord", "Web", "System"]
 TAG_DISCORD = 0
 TAG_WEB = 1
 TAG_SYSTEM = 2
 
+# `GetChat`輪詢不經過執行佇列，於佇列清空或超過最長輪詢間隔時直接送出
+_PRIORITY_LIST = ["interactive", "broadcast", "bulk"]
+PRIORITY_INTERACTIVE = 0
+PRIORITY_BROADCAST = 1
+PRIORITY_BULK = 2
+
 _MODE_LIST = ["save", "stop", "restart"]
 _MODE_LIST_ZH = ["儲存", "關閉", "重啟"]
 MODE_SAVE = 0
@@ -38,86 +61,34 @@ def tag_verify(tag: int) -> bool:
     """
     return tag in range(len(_TAG_LIST))
 
-def _text_retouch(text: str) -> Union[str, None]:
-    """
-    修正字串前後空白。
-
-    text: :class:`str`
-        輸入字串。
+_class_list_cache: dict = {"mtime": None, "class_list": []}
 
-    return: :class:`str | None`
+def _load_class_list(path: str="classlist") -> list[str]:
     """
-    if text == "": return None
-    while text[0] == " ":
-        text = text[1:]
-        if text == "": return None
-    while text[-1] == " ":
-        text = text[:-1]
-        if text == "": return None
-    return text
-
-def _text_verify(text: str, ban_dict: dict) -> bool:
-    """
-    過濾字串。
+    讀取野生恐龍類別清單，僅於檔案修改時間變更時重新讀取。
 
-    text: :class:`str`
-        輸入字串。
-    ban_dict: :class:`dict`
-        過濾字典。
-    
-    return: :class:`bool`
-    """
-    if len(ban_dict["startswith"]) != 0:
-        if text.startswith(tuple(ban_dict["startswith"])): return False
-    for string in  ban_dict["include"]:
-        if string in text: return False
-    if len(ban_dict["endswith"]) != 0:
-        if text.endswith(tuple(ban_dict["endswith"])): return False
-    return True
-
-def _process_info(name: str="") -> Union[list, None]:
-    """
-    取得程序資訊。
+    path: :class:`str`
+        清單路徑。
 
-    name: :class:`str`
-        程序名稱。
-    
-    return: :class:`list | None`
+    return: :class:`list[str]`
     """
-    raw_info = Popen(f"wmic process where (name=\"{name}\") get name, executablepath, processid", shell=False, stdout=PIPE, stderr=DEVNULL).stdout.read().decode("utf-8").split("\r\r\n")[:-2]
-    if "ExecutablePath" in raw_info[0] and "Name" in raw_info[0] and "ProcessId" in raw_info[0]:
-        s_path = raw_info[0].find("ExecutablePath")
-        s_name = raw_info[0].find("Name")
-        s_pid = raw_info[0].find("ProcessId")
-        result = []
-        for i in range(1, len(raw_info)):
-            if raw_info[i][s_pid:].replace(" ", "") != "":
-                result.append(
-                    {
-                        "Path": raw_info[i][s_path:s_name - 2],
-                        "Name": raw_info[i][s_name:s_pid - 2],
-                        "PID": int(raw_info[i][s_pid:].replace(" ", "")),
-                    }
-                )
-        return result
-    else:
-        return None
+    mtime = getmtime(path)
+    if _class_list_cache["mtime"] != mtime:
+        with open(path, mode="r", encoding="utf-8") as class_file:
+            class_list = [class_name.strip() for class_name in class_file.read().split("\n")]
+        _class_list_cache["class_list"] = [class_name for class_name in class_list if class_name != ""]
+        _class_list_cache["mtime"] = mtime
+    return _class_list_cache["class_list"]
 
-def _ark_is_alive(path: str) -> bool:
+def _failed_future() -> Future:
     """
-    檢查ARK Server是否正在運行。
+    產生RCON未連線時的失敗結果。
 
-    path: :class:`str`
-        ARK 執行檔路徑。
-
-    return: :class:`bool`
+    return: :class:`Future`
     """
-    alive_list = _process_info("ShooterGameServer.exe")
-    if alive_list != None:
-        for alive_process in alive_list:
-            if path in alive_process["Path"]:
-                return True
-    return False
+    future = Future()
+    future.set_exception(ConnectionError("RCON is not connected."))
+    return future
 
 class Rcon_Session():
     """
@@ -135,7 +106,7 @@ class Rcon_Session():
 
         return: :class:`None`
         """
-        self.in_queue = Queue()
+        self.in_queue = Schedule_Queue(len(_PRIORITY_LIST), self._expire_request)
         self.queues: list[Queue] = []
         for _ in _TAG_LIST:
             self.queues.append(Queue())
@@ -144,18 +115,35 @@ class Rcon_Session():
         self.server_alive = False
         self.server_first_connect = True
         self.server_config: _Ark_Server = server_config
-        session_thread = Thread(target=self._session, name=f"RCON_{self.server_config.display_name}")
-        session_thread.start()
+        self._wake = asyncio.Event()
+        self.poll = Adaptive_Poll(server_config.rcon.poll_min, server_config.rcon.poll_max)
+        self.supervisor = Reconnect_Supervisor()
+        self.metrics = Rcon_Metrics()
+        self.session_task = Rcon_Engine.submit(self._session())
 
         self.save_thread = Thread()
+        # 要求還原線程在取代存檔前中止
+        self.restore_cancel = Event()
+        self.countdown: Optional[Countdown] = None
+
+    @property
+    def poll_interval(self) -> float:
+        """
+        當前`GetChat`輪詢間隔(秒)。
+
+        return: :class:`float`
+        """
+        return self.poll.interval
 
     def add(
         self,
         command: str,
         tag: int,
         args: Optional[dict]={},
-        reply: bool=True
-    ) -> None:
+        reply: bool=True,
+        priority: Optional[int]=None,
+        deadline: Optional[float]=None
+    ) -> Optional[Future]:
         """
         新增指令至執行佇列。
         
@@ -164,11 +152,17 @@ class Rcon_Session():
         tag: :class:`int`
             發起者識別標籤。
         args: :class:`dict`
-            附加自訂參數。
+            附加自訂參數。Discord 為`type`(`chat`或`user_command`)、`target`(目標頻道)
+            與選用的`bulk`(排在聊天與指令回覆之後)；System 為`type`(識別標籤)與`content`(自訂內容)。
         reply: :class:`bool`
-            是否回傳伺服器回覆內容。
+            是否將伺服器回覆內容放入發起者的佇列。
+        priority: :class:`int | None`
+            優先權等級，預設依指令與發起者決定。
+        deadline: :class:`float | None`
+            期限(秒)，超過後捨棄指令。
 
-        return: :class:`None`
+        return: :class:`Future | None`
+            伺服器回覆，可使用`result(timeout)`等待，或以`asyncio.wrap_future()`轉換後`await`。
         """
         if not tag_verify(tag):
             return None
@@ -183,30 +177,81 @@ class Rcon_Session():
                         }
                     }
                 )
-            return
+            return _failed_future()
         logger.debug(f"Receive Command: {command}")
+        if priority == None:
+            if command.startswith("Broadcast"):
+                priority = PRIORITY_BROADCAST
+            elif tag == TAG_SYSTEM:
+                priority = PRIORITY_BULK
+            else:
+                priority = PRIORITY_INTERACTIVE
+        future = Future()
         self.in_queue.put(
             {
                 "command": command,
                 "tag": tag,
                 "need_reply": reply,
-                "args": args
-            }
+                "args": args,
+                "future": future,
+                "queued": monotonic()
+            },
+            priority,
+            tag,
+            deadline
         )
+        Rcon_Engine.call_soon(self._wake.set)
+        return future
+
+    def add_batch(
+        self,
+        commands: list[str],
+        tag: int,
+        args: Optional[dict]={},
+        reply: bool=False,
+        priority: int=PRIORITY_BULK,
+        deadline: Optional[float]=None
+    ) -> Optional[Future]:
         """
-        Discord Args:
-        args:
-        {
-            "type": "",   #chat, user_command
-            "target": 0   #Target Channel
-        }
-        System Args:
-        args:
-        {
-            "type": "",     #id_tag
-            "content": ""   #Custom Content
-        }
+        新增一批指令至執行佇列，執行時連續送出，不穿插聊天輪詢。
+        
+        commands: :class:`list[str]`
+            欲新增的指令列表。
+        tag: :class:`int`
+            發起者識別標籤。
+        args: :class:`dict`
+            附加自訂參數。
+        reply: :class:`bool`
+            是否將伺服器回覆內容放入發起者的佇列。
+        priority: :class:`int`
+            優先權等級。
+        deadline: :class:`float | None`
+            期限(秒)，超過後捨棄指令。
+
+        return: :class:`Future | None`
+            與`commands`順序相同的回覆列表。
         """
+        if not tag_verify(tag):
+            return None
+        if self.rcon_alive == False:
+            return _failed_future()
+        logger.debug(f"Receive Batch: {len(commands)} commands")
+        future = Future()
+        self.in_queue.put(
+            {
+                "commands": list(commands),
+                "tag": tag,
+                "need_reply": reply,
+                "args": args,
+                "future": future,
+                "queued": monotonic()
+            },
+            priority,
+            tag,
+            deadline
+        )
+        Rcon_Engine.call_soon(self._wake.set)
+        return future
 
     def get(
         self,
@@ -233,7 +278,7 @@ class Rcon_Session():
         self,
         tag: int,
         backup: bool,
-        delay: int=0,
+        delay: float=0,
         reason: str=""
     ) -> None:
         """
@@ -243,8 +288,8 @@ class Rcon_Session():
             發起者識別標籤。
         backup: :class:`bool`
             存檔後是否進行備份。
-        delay: :class:`int`
-            倒數時間(分鐘)。
+        delay: :class:`float`
+            倒數時間(分鐘)，可為小數。
         reason: :class:`str`
             原因。
 
@@ -256,7 +301,7 @@ class Rcon_Session():
         self,
         tag: int,
         backup: bool,
-        delay: int=0,
+        delay: float=0,
         reason: str=""
     ) -> None:
         """
@@ -266,8 +311,8 @@ class Rcon_Session():
             發起者識別標籤。
         backup: :class:`bool`
             關閉後是否進行備份。
-        delay: :class:`int`
-            倒數時間(分鐘)。
+        delay: :class:`float`
+            倒數時間(分鐘)，可為小數。
         reason: :class:`str`
             原因。
 
@@ -279,7 +324,7 @@ class Rcon_Session():
         self,
         tag: int,
         backup: bool,
-        delay: int=0,
+        delay: float=0,
         reason: str=""
     ) -> None:
         """
@@ -289,8 +334,8 @@ class Rcon_Session():
             發起者識別標籤。
         backup: :class:`bool`
             關閉後是否進行備份。
-        delay: :class:`int`
-            倒數時間(分鐘)。
+        delay: :class:`float`
+            倒數時間(分鐘)，可為小數。
         reason: :class:`str`
             原因。
 
@@ -334,6 +379,7 @@ class Rcon_Session():
             _cmd_file.write(command_content)
             _cmd_file.close()
         system("start cmd /c \"" + _cmd_path + "\"")
+        Process_Tracker.expect(self.server_config.dir_path)
         self.server_first_connect = True
     
     def clear(
@@ -341,7 +387,7 @@ class Rcon_Session():
         tag: int
     ) -> None:
         """
-        清除當前所有命令與停止存檔線程。
+        清除當前所有命令，並要求還原線程在取代存檔前中止。
         
         tag: :class:`int`
             發起者識別標籤。
@@ -350,11 +396,12 @@ class Rcon_Session():
         """
         if not tag_verify(tag):
             return 
-        self.in_queue.clear()
-        try:
-            self.save_thread.stop()
-        except SystemExit: raise SystemExit
-        except Exception as e: logger.info(f"清除所有指令失敗。(來自{_TAG_LIST[tag]}) Exception: {e}")
+        self._drop_requests()
+        if self.countdown != None and Countdown_Engine.cancel(self.countdown):
+            self.countdown = None
+        if self.save_thread.is_alive():
+            # 不強制停止線程，還原中途被終止會留下只還原一半的存檔
+            self.restore_cancel.set()
         logger.info(f"清除所有指令。(來自{_TAG_LIST[tag]})")
         if tag == TAG_DISCORD:
             self.queues[TAG_DISCORD].put(
@@ -366,55 +413,309 @@ class Rcon_Session():
                     }
                 }
             )
-    
-    def backup(
+
+    def rebind(
         self,
-        tag: int
+        server_config: _Ark_Server
     ) -> None:
+        """
+        套用更新後的伺服器資料，保留現有連線。
+        僅限連線資訊(位址、埠、密碼、逾時)未變更時使用。
+
+        server_config: :class:`_Ark_Server`
+            新的伺服器資料。
+
+        return: :class:`None`
+        """
+        rcon = server_config.rcon
+        if (rcon.poll_min, rcon.poll_max) != (self.server_config.rcon.poll_min, self.server_config.rcon.poll_max):
+            self.poll = Adaptive_Poll(rcon.poll_min, rcon.poll_max)
+        self.server_config = server_config
+
+    def close(self) -> None:
+        """
+        停止連線並捨棄所有尚未執行的指令，用於伺服器被移除或連線資訊變更時。
+        已進入存檔流程的工作會繼續完成。
+
+        return: :class:`None`
+        """
+        self.session_task.cancel()
+        self._drop_requests()
+        if self.countdown != None and Countdown_Engine.cancel(self.countdown):
+            self.countdown = None
+        self.rcon_alive = False
+        self.server_alive = False
+        logger.info(f"RCON_{self.server_config.display_name} Closed")
+
+    def backup(
+        self,
+        tag: int,
+        staging_dir: Optional[str]=None
+    ) -> Optional[Backup_Job]:
+        """
+        將存檔備份交由背景線程池處理，立即返回。
+        
+        tag: :class:`int`
+            發起者識別標籤。
+        staging_dir: :class:`str | None`
+            已由`_take_snapshot()`建立的時間點副本，未提供時於背景建立。
+
+        return: :class:`Backup_Job | None`
+        """
         if not tag_verify(tag):
-            return
+            return None
         logger.info(f"From:{_TAG_LIST[tag]} Receive Command:backup")
+        name = basename(staging_dir) if staging_dir != None else My_Datetime.fileformat()
+        job = Backup_Job(name, self.server_config.display_name)
+        return Backup_Pool.submit(job, lambda job: self._backup_job(tag, job, staging_dir))
+
+    def backups(self, limit: Optional[int]=None) -> list[dict]:
+        """
+        查詢此伺服器的備份(由新至舊)。
+
+        limit: :class:`int | None`
+            最多回傳的數量。
+
+        return: :class:`list[dict]`
+        """
+        return self._backup_store().query(limit=limit)
+
+    def _backup_store(self, throttle: bool=True) -> Backup_Store:
+        return Backup_Store(
+            join(self.server_config.dir_path, "ShooterGame\\Backup\\Store"),
+            compression=Config.backup_setting.compression,
+            level=Config.backup_setting.level,
+            throttle=Io_Budget.consume if throttle else None
+        )
+
+    def _is_save_file(self, path: str) -> bool:
+        """
+        是否為`_take_snapshot()`會備份的存檔，`path`為相對於`SavedArks`的路徑。
+        `ServerPaintingsCache`資料夾會整個備份，其中的檔案皆屬之。
+
+        path: :class:`str`
+            相對路徑。
+
+        return: :class:`bool`
+        """
+        parts = path.replace("\\", "/").split("/")
+        if parts[0] == "ServerPaintingsCache":
+            return True
+        if len(parts) > 1:
+            return False
+        return path == self.server_config.file_name or path.endswith((".arkprofile", "arktribe", "arktributetribe"))
+
+    def _take_snapshot(self, name: Optional[str]=None) -> str:
+        """
+        等待地圖存檔寫入完成後，建立存檔的時間點副本。
+        副本優先使用reflink，不支援時於存檔後立即完整複製(受`Io_Budget`限制)，
+        之後的備份只讀取副本，不持有伺服器寫入的檔案。
+
+        name: :class:`str | None`
+            快照名稱，預設為當前時間，重複時加上編號。
+
+        return: :class:`str`
+            暫存資料夾路徑。
+        """
         source_dir = join(self.server_config.dir_path, "ShooterGame\\Saved\\SavedArks")
-        backup_dir = join(self.server_config.dir_path, "ShooterGame\\Backup\\SavedArks", My_Datetime.fileformat())
+        staging_root = join(self.server_config.dir_path, "ShooterGame\\Backup\\Staging")
+        if not wait_settled(join(source_dir, self.server_config.file_name)):
+            logger.warning(f"[{self.server_config.display_name}]Save file not settled, snapshot anyway.")
+        name = name or My_Datetime.fileformat()
+        existing = set(self._backup_store().snapshots())
+        unique_name = name
+        index = 1
+        while unique_name in existing or exists(join(staging_root, unique_name)):
+            unique_name = f"{name}_{index}"
+            index += 1
+        staging_dir = join(staging_root, unique_name)
+        paths = [filename for filename in listdir(source_dir) if self._is_save_file(filename)]
+        if self.server_config.file_name not in paths:
+            paths.insert(0, self.server_config.file_name)
+        Io_Budget.configure(Config.backup_setting.max_bytes_per_sec)
+        try:
+            methods = take_snapshot(source_dir, paths, staging_dir, Io_Budget.consume)
+        except Exception:
+            rmtree(staging_dir, True, None)
+            raise
+        logger.info(f"[{self.server_config.display_name}]Snapshot {unique_name} staged: {methods}")
+        return staging_dir
+
+    def _backup_job(
+        self,
+        tag: int,
+        job: Backup_Job,
+        staging_dir: Optional[str]=None
+    ) -> dict:
+        """
+        將時間點副本存入去重複備份庫。
+        
+        tag: :class:`int`
+            發起者識別標籤。
+        job: :class:`Backup_Job`
+            工作資訊。
+        staging_dir: :class:`str | None`
+            時間點副本，未提供時先行建立。
+
+        return: :class:`dict`
+            快照清單。
+        """
+        if staging_dir == None:
+            staging_dir = self._take_snapshot(job.name)
+            job.name = basename(staging_dir)
+        store = self._backup_store()
+        try:
+            manifest = store.snapshot(staging_dir, listdir(staging_dir), job.name, job.progress)
+        finally:
+            rmtree(staging_dir, True, None)
+        # 清除過期備份
+        removed = store.prune(
+            Config.backup_setting.keep_hourly,
+            Config.backup_setting.keep_daily,
+            Config.backup_setting.keep_weekly,
+            Config.time_setting.time_zone
+        )
+        if removed:
+            logger.info(f"[{self.server_config.display_name}]Pruned {len(removed)} snapshots, {store.gc()} chunks removed.")
+        # 舊版備份資料夾，名稱開頭為日期
         backup_root_dir = join(self.server_config.dir_path, "ShooterGame\\Backup\\SavedArks")
-        if not isdir(backup_dir):
-            makedirs(backup_dir)
-        source_file = join(source_dir, self.server_config.file_name)
-        backup_file = join(backup_dir, self.server_config.file_name)
-        copyfile(source_file, backup_file)
-        for filename in listdir(source_dir):
-            if filename.endswith((".arkprofile", "arktribe", "arktributetribe")):
-                source_file = join(source_dir, filename)
-                backup_file = join(backup_dir, filename)
-                copyfile(source_file, backup_file)
-            elif filename == "ServerPaintingsCache":
-                source_file = join(source_dir, filename)
-                backup_file = join(backup_dir, filename)
-                copytree(source_file, backup_file, dirs_exist_ok=True)
-        timeout_date = (My_Datetime.now() - Config.time_setting.backup_day).isoformat().split("T")[0]
-        for dir_name in listdir(backup_root_dir):
-            if timeout_date in dir_name:
-                rmtree(join(backup_root_dir, dir_name), True, None)
+        if isdir(backup_root_dir):
+            timeout_date = (My_Datetime.now() - Config.time_setting.backup_day).isoformat().split("T")[0]
+            for dir_name in listdir(backup_root_dir):
+                if _DATE_PREFIX.match(dir_name) and dir_name[:10] <= timeout_date:
+                    rmtree(join(backup_root_dir, dir_name), True, None)
+        self.metrics.backup_duration.observe(job.elapsed)
+        if tag == TAG_DISCORD:
+            self.queues[TAG_DISCORD].put(
+                {
+                    "reply": f"[{self.server_config.display_name}]備份完成。({job.done_bytes / 1048576:.1f} MiB, {job.throughput / 1048576:.1f} MiB/s)",
+                    "args": {
+                        "type": "chat",
+                        "target": self.server_config.discord.chat_channel
+                    }
+                }
+            )
+        return manifest
+
+    def restore(
+        self,
+        tag: int,
+        name: str
+    ) -> bool:
+        """
+        還原備份。伺服器執行中時會先關閉，還原後重新啟動。
+        
+        tag: :class:`int`
+            發起者識別標籤。
+        name: :class:`str`
+            快照名稱或其開頭。
+
+        return: :class:`bool`
+            是否已開始還原。
+        """
+        if not tag_verify(tag):
+            return False
+        logger.info(f"From:{_TAG_LIST[tag]} Receive Command:restore {name}")
+        entry = None if name.strip() == "" else self._backup_store().find(name)
+        if entry == None:
+            reply = f"[{self.server_config.display_name}]找不到備份或名稱不唯一: {name}。"
+        elif self.save_thread.is_alive() or self.countdown != None:
+            reply = f"[{self.server_config.display_name}]正在進行其他操作，無法還原。"
+        elif self.server_alive and not self.rcon_alive:
+            reply = f"[{self.server_config.display_name}]RCON 未連線，無法還原。"
+        else:
+            self.restore_cancel.clear()
+            self.save_thread = Thread(target=self._restore_job, args=(tag, entry["name"]), name=f"RCON_{self.server_config.display_name}_RESTORE")
+            self.save_thread.start()
+            return True
+        logger.warning(reply)
+        if tag == TAG_DISCORD:
+            self.queues[TAG_DISCORD].put(
+                {
+                    "reply": reply,
+                    "args": {
+                        "type": "chat",
+                        "target": self.server_config.discord.chat_channel
+                    }
+                }
+            )
+        return False
+
+    def _restore_job(
+        self,
+        tag: int,
+        name: str
+    ) -> None:
+        """
+        關閉伺服器、平行還原快照並驗證雜湊值，再重新啟動。
+        
+        tag: :class:`int`
+            發起者識別標籤。
+        name: :class:`str`
+            快照名稱。
+
+        return: :class:`None`
+        """
+        restart = self.server_alive
+        if restart:
+            self.add("DoExit", TAG_SYSTEM, reply=False)
+            end_time = Clock.monotonic() + _SAVE_TIMEOUT
+            while self.server_alive and Clock.monotonic() < end_time and not self.restore_cancel.is_set():
+                sleep(_WHILE_SLEEP)
+        if self.restore_cancel.is_set():
+            reply = f"[{self.server_config.display_name}]還原已取消，存檔未變更。"
+            logger.warning(reply)
+            if restart and not self.server_alive:
+                self.start(TAG_SYSTEM)
+        elif self.server_alive:
+            reply = f"[{self.server_config.display_name}]還原失敗: 伺服器未關閉。"
+            logger.warning(reply)
+        else:
+            source_dir = join(self.server_config.dir_path, "ShooterGame\\Saved\\SavedArks")
+            start_time = Clock.monotonic()
+            try:
+                # 還原時不限制頻寬，以縮短停機時間
+                # 快照中沒有的存檔移至隔離資料夾，不直接刪除
+                manifest = self._backup_store(throttle=False).restore(
+                    name,
+                    source_dir,
+                    Config.backup_setting.workers,
+                    quarantine_dir=join(self.server_config.dir_path, "ShooterGame\\Backup\\Quarantine", f"{My_Datetime.fileformat()}_{name}"),
+                    managed=self._is_save_file,
+                    cancelled=self.restore_cancel.is_set
+                )
+                elapsed = Clock.monotonic() - start_time
+                reply = f"[{self.server_config.display_name}]已還原備份 {name}。({manifest['total_bytes'] / 1048576:.1f} MiB, {elapsed:.1f} s)"
+                logger.info(reply)
+            except InterruptedError:
+                reply = f"[{self.server_config.display_name}]還原已取消，存檔未變更。"
+                logger.warning(reply)
+            except Exception as e:
+                reply = f"[{self.server_config.display_name}]還原失敗: {e}"
+                logger.error(f"{reply} Exception: {e!r}")
+            if restart:
+                self.start(TAG_SYSTEM)
         if tag == TAG_DISCORD:
             self.queues[TAG_DISCORD].put(
                 {
-                    "reply": "備份完成。",
+                    "reply": reply,
                     "args": {
                         "type": "chat",
                         "target": self.server_config.discord.chat_channel
                     }
                 }
             )
+
     def _save(
         self,
         tag: int,
         backup: bool,
         mode: int,
-        delay: int,
+        delay: float,
         reason: str
     ) -> None:
         """
-        驗證是否可進行存檔、關機與重啟。
+        驗證是否可進行存檔、關機與重啟，並交由`Countdown_Engine`倒數。
         
         tag: :class:`int`
             發起者識別標籤。
@@ -422,8 +723,8 @@ class Rcon_Session():
             存檔後是否進行備份。
         mode: :class:`int`
             模式。
-        delay: :class:`int`
-            倒數時間(分鐘)。
+        delay: :class:`float`
+            倒數時間(分鐘)，可為小數。
         reason: :class:`str`
             原因。
 
@@ -431,11 +732,21 @@ class Rcon_Session():
         """
         if not tag_verify(tag):
             return
-        if self.rcon_alive != False and not self.save_thread.is_alive():
-            self.save_thread = Thread(target=self._save_job, args=(tag, backup, mode, delay, reason), name=f"RCON_{self.server_config.display_name}_{_MODE_LIST[mode].upper()}")
-            self.save_thread.start()
+        if self.rcon_alive != False and self.countdown == None and not self.save_thread.is_alive():
+            logger.info(f"From:{_TAG_LIST[tag]} Receive Command:{_MODE_LIST[mode]} {delay} Reason:{reason}")
+            self.countdown = Countdown_Engine.start(
+                Countdown(
+                    _MODE_LIST[mode],
+                    delay,
+                    reason,
+                    self._countdown_announce,
+                    self._countdown_check,
+                    lambda: self._save_job(tag, backup, mode),
+                    f"{self.server_config.display_name}_{_MODE_LIST[mode].upper()}"
+                )
+            )
         elif tag == TAG_DISCORD:
-            if self.rcon_alive != False:
+            if self.rcon_alive == False:
                 self.queues[TAG_DISCORD].put(
                     {
                         "reply": f"[{self.server_config.display_name}]RCON 未連線，無法{_MODE_LIST_ZH[mode]}。",
@@ -445,7 +756,7 @@ class Rcon_Session():
                         }
                     }
                 )
-            elif self.save_thread.is_alive():
+            else:
                 self.queues[TAG_DISCORD].put(
                     {
                         "reply": f"[{self.server_config.display_name}]已經正在{_MODE_LIST_ZH[mode]}中。",
@@ -456,121 +767,286 @@ class Rcon_Session():
                     }
                 )
 
-    def _save_job(
+    def reschedule(
         self,
         tag: int,
-        backup: bool,
-        mode: int,
-        delay: int,
-        reason: str
-    ) -> None:
+        delay: float
+    ) -> bool:
         """
-        進行存檔、關機與重啟。
+        重新設定進行中的倒數。
         
         tag: :class:`int`
             發起者識別標籤。
-        backup: :class:`bool`
-            存檔後是否進行備份。
-        mode: :class:`int`
-            模式。
-        delay: :class:`int`
-            倒數時間(分鐘)。
-        reason: :class:`str`
-            原因。
+        delay: :class:`float`
+            新的倒數時間(分鐘)。
 
-        return: :class:`dict | None`
+        return: :class:`bool`
+            是否成功。
         """
-        logger.info(f"From:{_TAG_LIST[tag]} Receive Command:{_MODE_LIST[mode]} {delay} Reason:{reason}")
-        def _rcon_test():
-            if self.rcon_alive == False:
-                self.queues[TAG_DISCORD].put(
-                    {
-                        "reply": f"[{self.server_config.display_name}]儲存失敗: RCON失去連線。",
-                        "args": {
-                            "type": "chat",
-                            "target": self.server_config.discord.chat_channel
-                        }
+        if not tag_verify(tag):
+            return False
+        countdown = self.countdown
+        result = countdown != None and Countdown_Engine.reschedule(countdown, delay)
+        logger.info(f"From:{_TAG_LIST[tag]} Receive Command:reschedule {delay} Result:{result}")
+        if tag == TAG_DISCORD:
+            self.queues[TAG_DISCORD].put(
+                {
+                    "reply": f"[{self.server_config.display_name}]倒數已重設為 {format_minutes(delay)} 分鐘。" if result else f"[{self.server_config.display_name}]沒有可重設的倒數。",
+                    "args": {
+                        "type": "chat",
+                        "target": self.server_config.discord.chat_channel
                     }
-                )
-                logger.warning("儲存失敗: RCON失去連線。")
-                current_thread().stop()
-        if reason != "" and delay >= 1:
-            ark_message = Config.other_setting.message[_MODE_LIST[mode]].replace('$TIME', str(delay))
+                }
+            )
+        return result
+
+    def _countdown_announce(self, message: str, reason: str) -> None:
+        """
+        於遊戲內與Discord公告倒數訊息。
+
+        message: :class:`str`
+            已套用樣板的訊息。
+        reason: :class:`str`
+            原因，空字串時不附加。
+
+        return: :class:`None`
+        """
+        ark_message = message
+        _discord_message = f"\n[{self.server_config.display_name}]".join(message.split("\n"))
+        if reason != "":
             ark_message += f"\n原因:{reason}\nReason:{reason}"
-            self.add(f"Broadcast {ark_message}", TAG_SYSTEM, reply=False)
-            _discord_message = f"\n[{self.server_config.display_name}]".join(Config.other_setting.message[_MODE_LIST[mode]].replace("$TIME", str(delay)).split("\n"))
             _discord_message += f"\n[{self.server_config.display_name}]原因:{reason}\n[{self.server_config.display_name}]Reason:{reason}"
+        self.add(f"Broadcast {ark_message}", TAG_SYSTEM, reply=False, deadline=Clock.real(_BROADCAST_DEADLINE))
+        self.queues[TAG_DISCORD].put(
+            {
+                "reply": f"[{self.server_config.display_name}]{_discord_message}",
+                "args": {
+                    "type": "chat",
+                    "target": self.server_config.discord.chat_channel,
+                    # 大量訊息，排在聊天與指令回覆之後
+                    "bulk": True
+                }
+            }
+        )
+
+    def _countdown_check(self) -> bool:
+        """
+        倒數期間檢查RCON連線，失去連線時中止。
+
+        return: :class:`bool`
+        """
+        if self.rcon_alive == False:
+            self.countdown = None
             self.queues[TAG_DISCORD].put(
                 {
-                    "reply": f"[{self.server_config.display_name}]{_discord_message}",
+                    "reply": f"[{self.server_config.display_name}]儲存失敗: RCON失去連線。",
                     "args": {
                         "type": "chat",
                         "target": self.server_config.discord.chat_channel
                     }
                 }
             )
-            sleep(60)
-            delay -= 1
-        # 通知
-        while delay > 0:
-            _rcon_test()
-            if (delay %5 == 0 and delay <= 30) or delay < 5:
-                self.add(f"Broadcast {Config.other_setting.message[_MODE_LIST[mode]].replace('$TIME', str(delay))}", TAG_SYSTEM, reply=False)
-                _discord_message = f"\n[{self.server_config.display_name}]".join(Config.other_setting.message[_MODE_LIST[mode]].replace("$TIME", str(delay)).split("\n"))
-                self.queues[TAG_DISCORD].put(
-                    {
-                        "reply": f"[{self.server_config.display_name}]{_discord_message}",
-                        "args": {
-                            "type": "chat",
-                            "target": self.server_config.discord.chat_channel
-                        }
-                    }
-                )
-            sleep(60)
-            delay -= 1
-        self.add(f"Broadcast {Config.other_setting.message['saving'].replace('$TIME', str(delay))}", TAG_SYSTEM, reply=False)
-        _discord_message = f"\n[{self.server_config.display_name}]".join(Config.other_setting.message["saving"].replace("$TIME", str(delay)).split("\n"))
+            logger.warning("儲存失敗: RCON失去連線。")
+            return False
+        return True
+
+    def _save_job(
+        self,
+        tag: int,
+        backup: bool,
+        mode: int
+    ) -> None:
+        """
+        倒數結束後送出存檔指令，於`Countdown_Engine`的工作線程中執行。
+        需等待存檔回覆的備份、關機與重啟交由`_save_finish()`於事件迴圈中進行，不佔用工作線程。
+        
+        tag: :class:`int`
+            發起者識別標籤。
+        backup: :class:`bool`
+            存檔後是否進行備份。
+        mode: :class:`int`
+            模式。
+
+        return: :class:`None`
+        """
+        finishing = False
+        try:
+            save_future = self._save_steps()
+            if backup or mode >= MODE_STOP:
+                Rcon_Engine.submit(self._save_finish(tag, backup, mode, save_future))
+                finishing = True
+        except Exception as e:
+            logger.error(f"[{self.server_config.display_name}]{_MODE_LIST_ZH[mode]}失敗: {e!r}")
+        finally:
+            if not finishing:
+                self.countdown = None
+
+    def _save_steps(self) -> Future:
+        """
+        依設定清除野生恐龍並送出存檔指令。
+
+        return: :class:`Future`
+            存檔指令的回覆。
+        """
+        if self.server_config.clear_dino:
+            commands = [f"DestroyWildDinoClasses \"{class_name}\" 1" for class_name in _load_class_list()]
+            commands.append("DestroyWildDinos")
+            self.add_batch(commands, TAG_SYSTEM)
+        save_future = self.add("save", TAG_SYSTEM, reply=False)
+        save_time = Clock.monotonic()
+        save_future.add_done_callback(lambda future: self._observe_save(future, save_time))
+        return save_future
+
+    async def _save_finish(
+        self,
+        tag: int,
+        backup: bool,
+        mode: int,
+        save_future: Future
+    ) -> None:
+        """
+        等待存檔完成後備份、關機與重啟，每個等待皆有上限。
+
+        tag: :class:`int`
+            發起者識別標籤。
+        backup: :class:`bool`
+            存檔後是否進行備份。
+        mode: :class:`int`
+            模式。
+        save_future: :class:`Future`
+            存檔指令的回覆。
+
+        return: :class:`None`
+        """
+        loop = asyncio.get_running_loop()
+        try:
+            # 等待存檔完成後才建立快照與關機
+            try:
+                await asyncio.wait_for(asyncio.wrap_future(save_future), Clock.real(_SAVE_TIMEOUT))
+            except Exception as e:
+                self._save_failed(mode, "未收到存檔回覆。", e)
+                return
+            if backup:
+                try:
+                    self.backup(tag, await loop.run_in_executor(None, self._take_snapshot))
+                except Exception as e:
+                    logger.error(f"[{self.server_config.display_name}]Snapshot failed: {e!r}")
+
+            # 停止
+            if mode < MODE_STOP:
+                return
+            self.add("DoExit", TAG_SYSTEM, reply=False)
+
+            # 重啟
+            if mode < MODE_RESTART:
+                return
+            end_time = Clock.monotonic() + _SAVE_TIMEOUT
+            while self.server_alive and Clock.monotonic() < end_time:
+                await asyncio.sleep(_WHILE_SLEEP)
+            if self.server_alive:
+                self._save_failed(mode, "伺服器未關閉。")
+                return
+            await loop.run_in_executor(None, self.start, tag)
+        except Exception as e:
+            logger.error(f"[{self.server_config.display_name}]{_MODE_LIST_ZH[mode]}失敗: {e!r}")
+        finally:
+            self.countdown = None
+
+    def _save_failed(self, mode: int, reason: str, error: Optional[Exception]=None) -> None:
         self.queues[TAG_DISCORD].put(
             {
-                "reply": f"[{self.server_config.display_name}]{_discord_message}",
+                "reply": f"[{self.server_config.display_name}]{_MODE_LIST_ZH[mode]}失敗: {reason}",
                 "args": {
                     "type": "chat",
                     "target": self.server_config.discord.chat_channel
                 }
             }
         )
+        logger.warning(f"{_MODE_LIST_ZH[mode]}失敗: {reason}" + ("" if error == None else f" Exception: {error!r}"))
+    
+    def _observe_save(self, future: Future, save_time: float) -> None:
+        if not future.cancelled() and future.exception() == None:
+            self.metrics.save_duration.observe(Clock.monotonic() - save_time)
 
-        # 存檔
-        if self.server_config.clear_dino:
-            with open("classlist", mode="r", encoding="utf-8") as class_file:
-                class_list = class_file.read().split("\n")
-            for class_name in class_list:
-                self.add(f"DestroyWildDinoClasses \"{class_name}\" 1", TAG_SYSTEM, reply=False)
-            self.add(f"DestroyWildDinos", TAG_SYSTEM, reply=False)
-        self.add("save", TAG_SYSTEM, {"type": "id_tag", "content": "Finish"})
+    def io_estimate(self, backup: bool) -> Optional[float]:
+        """
+        依過去的紀錄估計一次存檔(與備份)佔用磁碟的時間。
 
+        backup: :class:`bool`
+            是否包含備份。
+
+        return: :class:`float | None`
+            秒數，尚無紀錄時為`None`。
+        """
+        save_duration = self.metrics.save_duration.value
+        if save_duration == None:
+            return None
         if backup:
-            self.backup(tag)
+            backup_duration = self.metrics.backup_duration.value
+            if backup_duration == None:
+                return None
+            return save_duration + backup_duration
+        return save_duration
 
-        # 停止
-        if mode < MODE_STOP:
-            return
-        while True:
-            save_finish = self.get(TAG_SYSTEM)
-            if save_finish != None:
-                if save_finish["args"].get("type") == "id_tag" and save_finish["args"].get("content") == "Finish":
-                    break
-            sleep(_WHILE_SLEEP)
-        self.add("DoExit", TAG_SYSTEM)
-
-        # 重啟
-        if mode < MODE_RESTART:
-            return
-        while self.server_alive:
-            sleep(_WHILE_SLEEP)
-        self.start(tag)
-    
-    def _session(
+    def _drop_requests(self) -> None:
+        """
+        清空執行佇列，並取消所有尚未執行的指令。
+
+        return: :class:`None`
+        """
+        for requests in self.in_queue.clear():
+            requests["future"].cancel()
+
+    def _expire_request(self, requests: dict) -> None:
+        """
+        捨棄逾期的指令。
+
+        requests: :class:`dict`
+            指令資料。
+
+        return: :class:`None`
+        """
+        ark_logger.info(f"From:{_TAG_LIST[requests['tag']]} Drop Expired Command:{requests.get('command', 'Batch')}")
+        if requests["future"].set_running_or_notify_cancel():
+            requests["future"].set_exception(TimeoutError("Command expired before execution."))
+
+    def metrics_info(self) -> dict:
+        """
+        取得RCON統計資料，包含指令延遲、佇列、傳輸量與重連狀態。
+
+        return: :class:`dict`
+        """
+        info = self.metrics.snapshot()
+        info["rcon_alive"] = self.rcon_alive
+        info["server_alive"] = self.server_alive
+        info["poll_interval"] = self.poll_interval
+        info["queue"] = self.queue_stats()
+        info["reconnect"] = self.supervisor.info()
+        return info
+
+    def queue_stats(self) -> dict[str, dict]:
+        """
+        取得各優先權等級的佇列深度與等待時間統計。
+
+        return: :class:`dict[str, dict]`
+        """
+        return dict(zip(_PRIORITY_LIST, self.in_queue.stats()))
+
+    async def _wait(self, timeout: float) -> None:
+        """
+        等待新指令或逾時。
+
+        timeout: :class:`float`
+            最長等待時間(秒)。
+
+        return: :class:`None`
+        """
+        try:
+            await asyncio.wait_for(self._wake.wait(), timeout)
+        except asyncio.TimeoutError: pass
+        self._wake.clear()
+
+    async def _session(
         self,
     ):
         logger.info(f"RCON_{self.server_config.display_name} Start")
@@ -579,25 +1055,50 @@ class Rcon_Session():
         while True:
             try:
                 if not self.server_alive:
-                    self.in_queue.clear()
-                with Client(
+                    self._drop_requests()
+                async with Rcon_Connection(
                     host=_ip_address,
                     port=config.port,
                     timeout=config.timeout,
-                    passwd=config.password
+                    passwd=config.password,
+                    metrics=self.metrics
                 ) as client:
+                    self.metrics.connects += 1
                     self.rcon_alive = True
                     self.server_alive = True
                     self.server_first_connect = False
                     logger.warning("RCON Connected!")
+                    last_poll = monotonic()
                     while True:
                         if not self.in_queue.empty():
+                            self.poll.burst()
+                        # 聊天輪詢為最低優先，但不超過最長輪詢間隔
+                        while monotonic() - last_poll < self.poll.max_interval:
                             requests = self.in_queue.get()
+                            if requests == None:
+                                break
+                            future: Future = requests.pop("future")
+                            if not future.set_running_or_notify_cancel():
+                                continue
                             tag = requests["tag"]
                             need_reply = requests["need_reply"]
-                            command = requests["command"]
-                            ark_logger.info(f"From:{_TAG_LIST[tag]} Receive Command:{command} Args:{requests.get('args', 'No Args')}")
-                            reply = client.run(command)
+                            start_time = monotonic()
+                            self.metrics.queue_wait.observe(start_time - requests.pop("queued"))
+                            try:
+                                if "commands" in requests:
+                                    command = f"Batch({len(requests['commands'])})"
+                                    ark_logger.info(f"From:{_TAG_LIST[tag]} Receive Command:{command} Args:{requests.get('args', 'No Args')}")
+                                    reply = await client.run_many(requests["commands"])
+                                    self.metrics.observe_command("batch", monotonic() - start_time)
+                                else:
+                                    command = requests["command"]
+                                    ark_logger.info(f"From:{_TAG_LIST[tag]} Receive Command:{command} Args:{requests.get('args', 'No Args')}")
+                                    reply = await client.run(command)
+                                    self.metrics.observe_command(command, monotonic() - start_time)
+                            except Exception as e:
+                                future.set_exception(e)
+                                raise
+                            future.set_result(reply)
                             requests["reply"] = reply
                             del requests["tag"]
                             del requests["need_reply"]
@@ -606,100 +1107,128 @@ class Rcon_Session():
                             ark_logger.info(f"From:{_TAG_LIST[tag]} {command} Reply:{reply}")
 
                         # 取得聊天訊息
-                        chat_message = client.run("GetChat")
-                        if "Server received, But no response!!" in chat_message:
-                            continue
-                        # 分割訊息
-                        chat_message_list = chat_message.split("\n")
-                        for message in chat_message_list:
-                            # 轉錄訊息
-                            message = _text_retouch(message)
-                            if message == None:
-                                continue
-                            ark_logger.info(message)
-                            if _text_verify(message, Config.other_setting.m_filter_tables[config.m_filter]):
-                                # 修飾訊息
-                                if message.startswith("部落"):
-                                    tribe = message[2:message.find(", ID ")]
-                                    if message.find("\">") != -1:
-                                        message = message[message.find("\">")+2:-4]
-                                    else:
-                                        message = message.split(": ")[2][: -1]
-                                        message = message.replace("部落成員", "")
-                                        message = message.replace("你的部落", "")
-                                    message = _text_retouch(message)
-                                    if message == None:
-                                        continue
-                                    message = f"<{tribe}>{message}"
-                                # 送出訊息
-                                self.queues[TAG_DISCORD].put(
-                                    {
-                                        "reply": f"[{self.server_config.display_name}]{message}",
-                                        "args": {
-                                            "type": "chat",
-                                            "target": self.server_config.discord.chat_channel
-                                        }
-                                    }
-                                )
-                        sleep(_WHILE_SLEEP)
-            except SystemExit:
-                raise SystemExit
+                        last_poll = monotonic()
+                        chat_message = await client.run("GetChat")
+                        self.metrics.observe_command("GetChat", monotonic() - last_poll)
+                        self.metrics.observe_getchat(_EMPTY_REPLY in chat_message)
+                        if _EMPTY_REPLY in chat_message:
+                            self.poll.idle()
+                        else:
+                            self.poll.burst()
+                            # 過濾表可能於設置檔更新後變更
+                            self._chat_forward(chat_message, self.server_config.rcon)
+                        await self._wait(self.poll.interval)
             except Exception as e:
                 logger.debug(f"RCON Exception: {e}")
-                _ip_address = self._session_connect(config)
+                if self.rcon_alive:
+                    self.metrics.disconnects += 1
+                _ip_address = await self._session_connect(config)
 
-    def _session_connect(self, config: _Rcon_Info) -> str:
-        # 閃斷測試
-        for _ in range(5):
-            try:
-                with Client(
-                    host=config.address,
-                    port=config.port,
-                    timeout=config.timeout,
-                    passwd=config.password
-                ) as client:
-                    client.run("")
-                    return config.address
-            except SystemError: raise SystemError
-            except: sleep(1)
-        # 本地端測試
-        try:
-            with Client(
-                host="127.0.0.1",
-                port=config.port,
-                timeout=config.timeout,
-                passwd=config.password
-            ) as client:
-                client.run("")
-                self.rcon_alive = None
-                self.clear(TAG_SYSTEM)
-                self.stop(TAG_SYSTEM, False, 1)
-                return "127.0.0.1"
-        except SystemError: raise SystemError
-        except: pass
-        self.rcon_alive = False
-        logger.warning("RCON Disconnected!")
+    def _chat_forward(self, chat_message: str, config: _Rcon_Info) -> None:
+        """
+        過濾並轉發聊天訊息至Discord。
+
+        chat_message: :class:`str`
+            `GetChat`回覆內容。
+        config: :class:`_Rcon_Info`
+            RCON 設定。
+
+        return: :class:`None`
+        """
+        chat_filter = Config.other_setting.m_filters[config.m_filter]
+        for message in split_chat(chat_message):
+            ark_logger.info(message)
+            message = chat_filter.parse_line(message)
+            if message != None:
+                # 送出訊息
+                self.queues[TAG_DISCORD].put(
+                    {
+                        "reply": f"[{self.server_config.display_name}]{message}",
+                        "args": {
+                            "type": "chat",
+                            "target": self.server_config.discord.chat_channel
+                        }
+                    }
+                )
+
+    async def _try_connect(self, host: str, config: _Rcon_Info) -> None:
+        """
+        嘗試建立一次RCON連線。
+
+        host: :class:`str`
+            伺服器位址。
+        config: :class:`_Rcon_Info`
+            RCON 設定。
+
+        return: :class:`None`
+        """
+        async with Rcon_Connection(
+            host=host,
+            port=config.port,
+            timeout=config.timeout,
+            passwd=config.password
+        ) as client:
+            await client.run("")
+
+    def _process_alive(self) -> bool:
+        """
+        伺服器程序是否執行中。
+
+        return: :class:`bool`
+        """
+        return Process_Tracker.is_alive(self.server_config.dir_path)
+
+    async def _session_connect(self, config: _Rcon_Info) -> str:
+        """
+        依重連控制的退避與斷路狀態重試連線，並更新`rcon_alive`與`server_alive`。
+
+        config: :class:`_Rcon_Info`
+            RCON 設定。
+
+        return: :class:`str`
+            可連線的位址。
+        """
+        loop = asyncio.get_running_loop()
+        supervisor = self.supervisor
+        supervisor.failure()
+        local_tested = False
         while True:
-            try:
-                if _ark_is_alive(self.server_config.dir_path) and not self.server_alive:
+            if supervisor.failures >= supervisor.failure_threshold and not local_tested:
+                local_tested = True
+                # 本地端測試
+                try:
+                    await Connect_Budget.acquire()
+                    await self._try_connect("127.0.0.1", config)
+                    supervisor.success()
+                    self.rcon_alive = None
+                    self.clear(TAG_SYSTEM)
+                    self.stop(TAG_SYSTEM, False, 1)
+                    return "127.0.0.1"
+                except Exception: pass
+                self.rcon_alive = False
+                logger.warning("RCON Disconnected!")
+            if self.rcon_alive == False:
+                server_alive = await loop.run_in_executor(None, self._process_alive)
+                if server_alive and not self.server_alive:
                     self.server_alive = True
+                    supervisor.probe()
                     logger.warning("Server Up!")
-                # 嘗試重連
-                with Client(
-                    host=config.address,
-                    port=config.port,
-                    timeout=config.timeout,
-                    passwd=config.password
-                ) as client:
-                    client.run("")
-                    return config.address
-            except SystemExit:
-                raise SystemExit
-            except:
-                if not _ark_is_alive(self.server_config.dir_path) and self.server_alive:
+                elif not server_alive and self.server_alive:
                     self.server_alive = False
                     logger.warning("Server Down!")
-            sleep(_WHILE_SLEEP)
+            delay = supervisor.delay()
+            if delay > 0:
+                await asyncio.sleep(min(delay, _STATE_INTERVAL))
+                continue
+            # 嘗試重連
+            await Connect_Budget.acquire()
+            supervisor.attempt()
+            try:
+                await self._try_connect(config.address, config)
+                supervisor.success()
+                return config.address
+            except Exception:
+                supervisor.failure()
 
 # if (remove_message(conv_string)): 
 # if conv_string.startswith("部落"):
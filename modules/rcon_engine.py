@@ -0,0 +1,313 @@
+import asyncio
+from asyncio import AbstractEventLoop, StreamReader, StreamWriter
+from concurrent.futures import Future
+import logging
+from modules.threading import Thread
+from struct import pack, unpack
+from threading import Lock
+from typing import Any, Callable, Coroutine, Optional
+
+logger = logging.getLogger("main")
+
+_SERVERDATA_AUTH = 3
+_SERVERDATA_AUTH_RESPONSE = 2
+_SERVERDATA_EXECCOMMAND = 2
+_SERVERDATA_RESPONSE_VALUE = 0
+_MAX_REQUEST_ID = 2 ** 31 - 1
+_PIPELINE_WINDOW = 64
+
+class Rcon_Auth_Error(ConnectionError):
+    """
+    RCON 密碼驗證失敗。
+    """
+
+def _pack_packet(request_id: int, packet_type: int, payload: bytes) -> bytes:
+    """
+    封裝Source RCON封包。
+
+    request_id: :class:`int`
+        請求編號。
+    packet_type: :class:`int`
+        封包類型。
+    payload: :class:`bytes`
+        封包內容。
+
+    return: :class:`bytes`
+    """
+    body = pack("<ii", request_id, packet_type) + payload + b"\x00\x00"
+    return pack("<i", len(body)) + body
+
+async def _read_packet(reader: StreamReader) -> tuple[int, int, bytes]:
+    """
+    讀取一個Source RCON封包。
+
+    reader: :class:`StreamReader`
+        連線讀取端。
+
+    return: :class:`tuple[int, int, bytes]`
+        (請求編號, 封包類型, 封包內容)
+    """
+    size, = unpack("<i", await reader.readexactly(4))
+    data = await reader.readexactly(size)
+    request_id, packet_type = unpack("<ii", data[:8])
+    return request_id, packet_type, data[8:-2]
+
+class Rcon_Connection():
+    """
+    非同步Source RCON連線。
+    """
+    def __init__(
+        self,
+        host: str,
+        port: int,
+        passwd: str,
+        timeout: Optional[float]=None,
+        encoding: str="utf-8",
+        metrics: Optional[Any]=None
+    ) -> None:
+        """
+        初始化`Rcon_Connection()`
+
+        host: :class:`str`
+            伺服器位址。
+        port: :class:`int`
+            RCON 連接埠。
+        passwd: :class:`str`
+            RCON 密碼。
+        timeout: :class:`float | None`
+            逾時時間(秒)。
+        encoding: :class:`str`
+            文字編碼。
+        metrics: :class:`Rcon_Metrics | None`
+            傳輸量統計。
+
+        return: :class:`None`
+        """
+        self.host = host
+        self.port = port
+        self.passwd = passwd
+        self.timeout = timeout
+        self.encoding = encoding
+        self.metrics = metrics
+        self._reader: Optional[StreamReader] = None
+        self._writer: Optional[StreamWriter] = None
+        self._request_id = 0
+        self._lock = asyncio.Lock()
+
+    async def __aenter__(self) -> "Rcon_Connection":
+        await self.connect()
+        return self
+
+    async def __aexit__(self, *_) -> None:
+        await self.close()
+
+    def _send(self, request_id: int, packet_type: int, payload: bytes) -> None:
+        data = _pack_packet(request_id, packet_type, payload)
+        if self.metrics != None:
+            self.metrics.bytes_out += len(data)
+        self._writer.write(data)
+
+    async def _receive(self) -> tuple[int, int, bytes]:
+        packet = await _read_packet(self._reader)
+        if self.metrics != None:
+            self.metrics.bytes_in += len(packet[2]) + 14
+        return packet
+
+    def _next_id(self) -> int:
+        self._request_id = self._request_id % _MAX_REQUEST_ID + 1
+        return self._request_id
+
+    async def connect(self) -> None:
+        """
+        建立連線並登入。
+
+        return: :class:`None`
+        """
+        self._reader, self._writer = await asyncio.wait_for(
+            asyncio.open_connection(self.host, self.port),
+            self.timeout
+        )
+        try:
+            await asyncio.wait_for(self._login(), self.timeout)
+        except BaseException:
+            await self.close()
+            raise
+
+    async def _login(self) -> None:
+        request_id = self._next_id()
+        self._send(request_id, _SERVERDATA_AUTH, self.passwd.encode(self.encoding))
+        await self._writer.drain()
+        while True:
+            response_id, packet_type, _ = await self._receive()
+            if packet_type != _SERVERDATA_AUTH_RESPONSE:
+                continue
+            if response_id == -1:
+                raise Rcon_Auth_Error("RCON authentication failed.")
+            return
+
+    async def run(self, command: str) -> str:
+        """
+        執行指令並回傳伺服器回覆。
+
+        command: :class:`str`
+            指令。
+
+        return: :class:`str`
+        """
+        async with self._lock:
+            return await asyncio.wait_for(self._run(command), self.timeout)
+
+    async def _run(self, command: str) -> str:
+        request_id = self._next_id()
+        self._send(request_id, _SERVERDATA_EXECCOMMAND, command.encode(self.encoding))
+        await self._writer.drain()
+        while True:
+            response_id, _, payload = await self._receive()
+            if response_id == request_id:
+                return payload.decode(self.encoding, errors="replace")
+
+    async def run_many(self, commands: list[str], window: int=_PIPELINE_WINDOW) -> list[str]:
+        """
+        以管線方式連續送出多個指令，依請求編號對應回覆。
+
+        commands: :class:`list[str]`
+            指令列表。
+        window: :class:`int`
+            同時等待回覆的最大指令數。
+
+        return: :class:`list[str]`
+            與`commands`順序相同的回覆。
+        """
+        async with self._lock:
+            replies: list[str] = []
+            for i in range(0, len(commands), window):
+                chunk = commands[i:i + window]
+                replies += await asyncio.wait_for(self._run_many(chunk), self.timeout)
+            return replies
+
+    async def _run_many(self, commands: list[str]) -> list[str]:
+        pending: dict[int, int] = {}
+        for index, command in enumerate(commands):
+            request_id = self._next_id()
+            pending[request_id] = index
+            self._send(request_id, _SERVERDATA_EXECCOMMAND, command.encode(self.encoding))
+        await self._writer.drain()
+        replies = [""] * len(commands)
+        while pending:
+            response_id, _, payload = await self._receive()
+            index = pending.pop(response_id, None)
+            if index != None:
+                replies[index] = payload.decode(self.encoding, errors="replace")
+        return replies
+
+    async def close(self) -> None:
+        """
+        關閉連線。
+
+        return: :class:`None`
+        """
+        if self._writer == None:
+            return
+        writer = self._writer
+        self._reader = self._writer = None
+        writer.close()
+        try:
+            await writer.wait_closed()
+        except Exception: pass
+
+class Adaptive_Poll():
+    """
+    自適應輪詢間隔，閒置時指數退避，有活動時立即回到最短間隔。
+    """
+    def __init__(
+        self,
+        min_interval: float,
+        max_interval: float,
+        factor: float=2.0
+    ) -> None:
+        """
+        初始化`Adaptive_Poll()`
+
+        min_interval: :class:`float`
+            最短輪詢間隔(秒)。
+        max_interval: :class:`float`
+            最長輪詢間隔(秒)。
+        factor: :class:`float`
+            閒置時的退避倍率。
+
+        return: :class:`None`
+        """
+        self.min_interval = min_interval
+        self.max_interval = max(min_interval, max_interval)
+        self.factor = factor
+        self.interval = min_interval
+
+    def idle(self) -> float:
+        """
+        回覆為空，延長輪詢間隔。
+
+        return: :class:`float`
+        """
+        self.interval = min(self.interval * self.factor, self.max_interval)
+        return self.interval
+
+    def burst(self) -> float:
+        """
+        有新訊息或指令，回到最短輪詢間隔。
+
+        return: :class:`float`
+        """
+        self.interval = self.min_interval
+        return self.interval
+
+class Rcon_Engine:
+    """
+    共用的RCON事件迴圈，所有伺服器的連線都在同一個線程中執行。
+    """
+    loop: Optional[AbstractEventLoop] = None
+    thread: Optional[Thread] = None
+    _lock = Lock()
+
+    @classmethod
+    def get_loop(self) -> AbstractEventLoop:
+        """
+        取得事件迴圈，若尚未啟動則啟動。
+
+        return: :class:`AbstractEventLoop`
+        """
+        with self._lock:
+            if self.loop == None:
+                self.loop = asyncio.new_event_loop()
+                self.thread = Thread(target=self._run, name="RCON_Engine")
+                self.thread.start()
+        return self.loop
+
+    @classmethod
+    def _run(self) -> None:
+        asyncio.set_event_loop(self.loop)
+        logger.info("RCON_Engine Start")
+        self.loop.run_forever()
+
+    @classmethod
+    def submit(self, coro: Coroutine) -> Future:
+        """
+        將協程交由事件迴圈執行。
+
+        coro: :class:`Coroutine`
+            協程。
+
+        return: :class:`Future`
+        """
+        return asyncio.run_coroutine_threadsafe(coro, self.get_loop())
+
+    @classmethod
+    def call_soon(self, callback: Callable, *args: Any) -> None:
+        """
+        於事件迴圈中呼叫`callback`，可於任意線程中使用。
+
+        callback: :class:`Callable`
+            回呼函式。
+
+        return: :class:`None`
+        """
+        self.get_loop().call_soon_threadsafe(callback, *args)
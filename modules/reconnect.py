@@ -0,0 +1,146 @@
+import asyncio
+from random import uniform
+from time import monotonic
+
+STATE_CLOSED = "closed"
+STATE_OPEN = "open"
+STATE_HALF_OPEN = "half_open"
+
+class Connect_Budget:
+    """
+    全主機共用的連線次數預算(令牌桶)，避免大量伺服器同時重連。
+    """
+    rate: float = 2.0
+    capacity: float = 5.0
+    _tokens: float = 5.0
+    _last_time: float = 0.0
+
+    @classmethod
+    def _fill(self) -> None:
+        now = monotonic()
+        if self._last_time != 0.0:
+            self._tokens = min(self.capacity, self._tokens + (now - self._last_time) * self.rate)
+        self._last_time = now
+
+    @classmethod
+    async def acquire(self) -> None:
+        """
+        取得一次連線嘗試的額度，不足時等待。
+        只可在RCON事件迴圈中使用。
+
+        return: :class:`None`
+        """
+        self._fill()
+        while self._tokens < 1:
+            await asyncio.sleep((1 - self._tokens) / self.rate)
+            self._fill()
+        self._tokens -= 1
+
+class Reconnect_Supervisor():
+    """
+    單一伺服器的重連控制，包含指數退避、隨機抖動與斷路器。
+     - closed: 正常，失敗後依指數退避重試。
+     - open: 連續失敗達門檻，暫停重試`open_timeout`秒。
+     - half_open: 暫停結束，允許一次試探連線。
+    """
+    def __init__(
+        self,
+        base_delay: float=1.0,
+        max_delay: float=30.0,
+        failure_threshold: int=5,
+        open_timeout: float=30.0
+    ) -> None:
+        """
+        初始化`Reconnect_Supervisor()`
+
+        base_delay: :class:`float`
+            首次重試延遲(秒)。
+        max_delay: :class:`float`
+            最長重試延遲(秒)。
+        failure_threshold: :class:`int`
+            觸發斷路的連續失敗次數。
+        open_timeout: :class:`float`
+            斷路後暫停重試的時間(秒)。
+
+        return: :class:`None`
+        """
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+        self.failure_threshold = failure_threshold
+        self.open_timeout = open_timeout
+        self.state = STATE_CLOSED
+        self.failures = 0
+        self.attempts = 0
+        self.reconnects = 0
+        self._next_attempt = 0.0
+
+    def delay(self) -> float:
+        """
+        距離下次允許嘗試的秒數，0 表示可以立即嘗試。
+
+        return: :class:`float`
+        """
+        remain = self._next_attempt - monotonic()
+        if remain > 0:
+            return remain
+        if self.state == STATE_OPEN:
+            self.state = STATE_HALF_OPEN
+        return 0.0
+
+    def attempt(self) -> None:
+        """
+        記錄一次連線嘗試。
+
+        return: :class:`None`
+        """
+        self.attempts += 1
+
+    def success(self) -> None:
+        """
+        連線成功，重設狀態。
+
+        return: :class:`None`
+        """
+        if self.failures > 0:
+            self.reconnects += 1
+        self.state = STATE_CLOSED
+        self.failures = 0
+        self._next_attempt = 0.0
+
+    def failure(self) -> None:
+        """
+        連線失敗，計算下次嘗試時間。
+
+        return: :class:`None`
+        """
+        self.failures += 1
+        if self.state == STATE_HALF_OPEN or self.failures >= self.failure_threshold:
+            self.state = STATE_OPEN
+            delay = self.open_timeout
+        else:
+            delay = min(self.max_delay, self.base_delay * 2 ** (self.failures - 1))
+        self._next_attempt = monotonic() + delay * uniform(0.5, 1.0)
+
+    def probe(self) -> None:
+        """
+        外部提示伺服器可能已恢復(例如程序剛啟動)，允許立即試探。
+
+        return: :class:`None`
+        """
+        if self.state == STATE_OPEN:
+            self.state = STATE_HALF_OPEN
+        self._next_attempt = 0.0
+
+    def info(self) -> dict:
+        """
+        取得目前狀態。
+
+        return: :class:`dict`
+        """
+        return {
+            "state": self.state,
+            "failures": self.failures,
+            "attempts": self.attempts,
+            "reconnects": self.reconnects,
+            "retry_in": max(0.0, self._next_attempt - monotonic())
+        }
@@ -0,0 +1,229 @@
+from datetime import datetime, timedelta
+from heapq import heapify, heappop, heappush
+import logging
+from modules.clock import Clock
+from modules.config import Config, _Time_Data
+from modules.rcon import TAG_SYSTEM
+from modules.threading import Thread
+from threading import Event, Lock
+from typing import Mapping, Optional
+
+logger = logging.getLogger("main")
+
+_OFFSET = timedelta(minutes=-5)
+# 存檔提前5分鐘觸發，延遲5分鐘內仍可在目標時間前完成
+_MISFIRE_GRACE = timedelta(minutes=5)
+# 最長睡眠時間，避免系統時間被調整後錯過排程
+_MAX_SLEEP = 60.0
+
+# 排程種類，與`modules.rcon`的`MODE_*`不同，僅用於排程表
+JOB_SAVE = "save"
+JOB_RESTART = "restart"
+
+def next_fire_time(
+    time_data: _Time_Data,
+    now: datetime,
+    offset: timedelta=_OFFSET,
+    grace: timedelta=timedelta(0)
+) -> datetime:
+    """
+    計算`time_data`在`now - grace`之後的下一次觸發時間。
+
+    time_data: :class:`_Time_Data`
+        排程時間。
+    now: :class:`datetime`
+        當前時間(需包含時區)。
+    offset: :class:`timedelta`
+        相對目標時間的提前量。
+    grace: :class:`timedelta`
+        已過觸發時間但仍視為到期的範圍。
+
+    return: :class:`datetime`
+    """
+    fire_time = datetime.combine(now.date(), time_data.time, tzinfo=now.tzinfo) + offset - timedelta(days=1)
+    while fire_time <= now - grace:
+        fire_time += timedelta(days=1)
+    return fire_time
+
+def plan_offsets(durations: list[float], slots: int) -> list[float]:
+    """
+    將工作依最長優先(LPT)分配至`slots`個並行位置，使總時間最短且同時進行的工作不超過`slots`個。
+
+    durations: :class:`list[float]`
+        各工作的耗時(秒)。
+    slots: :class:`int`
+        同時進行的工作上限。
+
+    return: :class:`list[float]`
+        各工作相對開始時間(秒)，順序與`durations`相同。
+    """
+    free_times = [0.0] * max(1, slots)
+    offsets = [0.0] * len(durations)
+    for index in sorted(range(len(durations)), key=lambda index: durations[index], reverse=True):
+        start_time = heappop(free_times)
+        offsets[index] = start_time
+        heappush(free_times, start_time + durations[index])
+    return offsets
+
+class Save_Scheduler:
+    """
+    自動存檔與重啟排程。
+    所有排程的下一次觸發時間預先計算並放入堆積，線程只睡到最早的一筆，
+    設置檔更新時才重新計算。
+    """
+    thread: Optional[Thread] = None
+    _heap: list[tuple] = []
+    # 是否需要依設置檔重新計算，首次計算時沒有可沿用的項目
+    _reload = True
+    _built = False
+    _wake = Event()
+    _lock = Lock()
+    _sequence = 0
+
+    @classmethod
+    def start(self) -> None:
+        """
+        啟動排程線程。
+
+        return: :class:`None`
+        """
+        with self._lock:
+            if self.thread != None:
+                return
+            self.thread = Thread(target=self._run, name="Auto_Save")
+        Config.subscribe(self.reload)
+        self.thread.start()
+
+    @classmethod
+    def reload(self) -> None:
+        """
+        要求重新計算排程，可於任意線程中呼叫。
+        未變更的排程沿用原本的觸發時間，不會因重新計算而略過當次排程。
+
+        return: :class:`None`
+        """
+        with self._lock:
+            self._reload = True
+        self._wake.set()
+
+    @classmethod
+    def _now(self) -> datetime:
+        return datetime.fromtimestamp(Clock.time(), Config.time_setting.time_zone)
+
+    @classmethod
+    def _build(
+        self,
+        now: datetime,
+        tables: list[tuple[str, Mapping[str, tuple[_Time_Data, ...]]]],
+        previous: Optional[list[tuple]]=None
+    ) -> list[tuple]:
+        """
+        建立排程堆積。
+        `previous`中仍存在的排程沿用其觸發時間；重新載入時新增的排程若在`_MISFIRE_GRACE`內到期，仍會執行。
+
+        now: :class:`datetime`
+            當前時間(需包含時區)。
+        tables: :class:`list[tuple[str, Mapping[str, tuple[_Time_Data, ...]]]]`
+            (種類, 排程表)
+        previous: :class:`list[tuple] | None`
+            重新載入前的排程堆積，首次建立時為`None`。
+
+        return: :class:`list[tuple]`
+            (觸發時間, 序號, 種類, 表格名稱, 排程時間)
+        """
+        pending: dict[tuple, list[datetime]] = {}
+        for fire_time, _, mode, key, time_data in previous or []:
+            pending.setdefault((mode, key, time_data), []).append(fire_time)
+        grace = timedelta(0) if previous == None else _MISFIRE_GRACE
+        heap = []
+        for mode, mode_tables in tables:
+            for key, time_datas in mode_tables.items():
+                for time_data in time_datas:
+                    fire_times = pending.get((mode, key, time_data))
+                    fire_time = fire_times.pop() if fire_times else next_fire_time(time_data, now, grace=grace)
+                    self._sequence += 1
+                    heap.append((fire_time, self._sequence, mode, key, time_data))
+        heapify(heap)
+        return heap
+
+    @classmethod
+    def _tables(self) -> list[tuple[str, Mapping[str, tuple[_Time_Data, ...]]]]:
+        time_setting = Config.time_setting
+        return [(JOB_SAVE, time_setting.save_tables), (JOB_RESTART, time_setting.restart_tables)]
+
+    @classmethod
+    def upcoming(self, limit: int=10) -> list[dict]:
+        """
+        取得即將執行的排程。
+
+        limit: :class:`int`
+            最多回傳的數量。
+
+        return: :class:`list[dict]`
+        """
+        with self._lock:
+            heap = list(self._heap)
+        return [
+            {
+                "time": fire_time.isoformat(),
+                "mode": mode,
+                "table": key,
+                "backup": time_data.backup
+            }
+            for fire_time, _, mode, key, time_data in sorted(heap)[:limit]
+        ]
+
+    @classmethod
+    def _fire(self, mode: str, key: str, time_data: _Time_Data) -> None:
+        """
+        對使用`key`表格的所有伺服器執行排程。
+        依各伺服器實測的存檔與備份耗時錯開，同時進行的不超過`save_concurrency`台，
+        尚無紀錄的伺服器以`save_delay`分鐘估計。
+
+        return: :class:`None`
+        """
+        server_configs = [
+            server_config for server_config in Config.servers
+            if (server_config.save if mode == JOB_SAVE else server_config.restart) == key
+        ]
+        durations = []
+        for server_config in server_configs:
+            estimate = server_config.rcon_session.io_estimate(time_data.backup)
+            durations.append(estimate if estimate != None else Config.time_setting.save_delay * 60)
+        offsets = plan_offsets(durations, Config.time_setting.save_concurrency)
+        for server_config, offset in zip(server_configs, offsets):
+            rcon_session = server_config.rcon_session
+            delay = offset / 60
+            if mode == JOB_SAVE:
+                rcon_session.save(TAG_SYSTEM, time_data.backup, delay)
+            else:
+                rcon_session.restart(TAG_SYSTEM, time_data.backup, delay)
+        logger.info(f"Schedule {mode} table {key} at {time_data.time} fired for {len(server_configs)} servers, window {max((offset + duration for offset, duration in zip(offsets, durations)), default=0):.0f} s.")
+
+    @classmethod
+    def _run(self) -> None:
+        logger.info("Auto_Save Start")
+        while True:
+            self._wake.clear()
+            now = self._now()
+            with self._lock:
+                if self._reload:
+                    self._heap = self._build(now, self._tables(), self._heap if self._built else None)
+                    self._reload = False
+                    self._built = True
+                due = []
+                while self._heap and self._heap[0][0] <= now:
+                    fire_time, _, mode, key, time_data = heappop(self._heap)
+                    due.append((fire_time, mode, key, time_data))
+                    self._sequence += 1
+                    heappush(self._heap, (next_fire_time(time_data, now), self._sequence, mode, key, time_data))
+                timeout = (self._heap[0][0] - now).total_seconds() if self._heap else _MAX_SLEEP
+            for fire_time, mode, key, time_data in due:
+                if now - fire_time > _MISFIRE_GRACE:
+                    logger.warning(f"Schedule {mode} table {key} at {time_data.time} missed by {now - fire_time}, skipped.")
+                    continue
+                try:
+                    self._fire(mode, key, time_data)
+                except Exception as e:
+                    logger.error(f"Schedule {mode} table {key} failed: {e!r}")
+            self._wake.wait(Clock.real(min(max(timeout, 0.0), _MAX_SLEEP)))
@@ -0,0 +1,172 @@
+import logging
+from modules.clock import Clock
+from os import makedirs, remove, stat, walk
+from os.path import dirname, isdir, isfile, join, relpath
+from shutil import copystat
+from typing import Callable, Optional
+
+try:
+    import fcntl
+except ImportError:
+    fcntl = None
+
+logger = logging.getLogger("main")
+
+_FICLONE = 0x40049409
+_SETTLE_INTERVAL = 1.0
+_SETTLE_STABLE = 2
+_SETTLE_TIMEOUT = 120
+_COPY_CHUNK = 1024 * 1024
+# 複製期間來源被改寫時重試的次數
+_COPY_RETRY = 2
+
+def wait_settled(
+    path: str,
+    interval: float=_SETTLE_INTERVAL,
+    stable: int=_SETTLE_STABLE,
+    timeout: float=_SETTLE_TIMEOUT
+) -> bool:
+    """
+    等待檔案大小與修改時間不再變動。
+
+    path: :class:`str`
+        檔案路徑。
+    interval: :class:`float`
+        檢查間隔(秒)。
+    stable: :class:`int`
+        連續相同的次數。
+    timeout: :class:`float`
+        最長等待時間(秒)。
+
+    return: :class:`bool`
+        是否在時限內穩定。
+    """
+    end_time = Clock.monotonic() + timeout
+    last = None
+    count = 0
+    while Clock.monotonic() < end_time:
+        try:
+            file_stat = stat(path)
+            current = (file_stat.st_size, file_stat.st_mtime_ns)
+        except FileNotFoundError:
+            current = None
+        if current != None and current == last:
+            count += 1
+            if count >= stable:
+                return True
+        else:
+            count = 0
+        last = current
+        Clock.sleep(interval)
+    return False
+
+def _reflink(source: str, target: str) -> bool:
+    """
+    以寫入時複製(reflink)建立檔案，僅部分檔案系統支援。
+
+    return: :class:`bool`
+    """
+    if fcntl == None:
+        return False
+    try:
+        with open(source, mode="rb") as source_file, open(target, mode="wb") as target_file:
+            fcntl.ioctl(target_file.fileno(), _FICLONE, source_file.fileno())
+        copystat(source, target)
+        return True
+    except OSError:
+        if isfile(target):
+            remove(target)
+        return False
+
+def _file_stamp(path: str) -> tuple[int, int]:
+    file_stat = stat(path)
+    return file_stat.st_size, file_stat.st_mtime_ns
+
+def _copy(
+    source: str,
+    target: str,
+    throttle: Optional[Callable[[int], None]]=None
+) -> None:
+    """
+    完整複製檔案，複製前後比對來源大小與修改時間，來源被改寫時重新複製。
+
+    throttle: :class:`Callable[[int], None] | None`
+        每讀取一段資料後以位元組數呼叫，可等待以限制頻寬。
+    """
+    for _ in range(_COPY_RETRY + 1):
+        stamp = _file_stamp(source)
+        remaining = stamp[0]
+        with open(source, mode="rb") as source_file, open(target, mode="wb") as target_file:
+            while remaining > 0:
+                data = source_file.read(min(_COPY_CHUNK, remaining))
+                if not data:
+                    break
+                remaining -= len(data)
+                if throttle != None:
+                    throttle(len(data))
+                target_file.write(data)
+        if _file_stamp(source) == stamp:
+            copystat(source, target)
+            return
+    remove(target)
+    raise OSError(f"Source changed during copy: {source}")
+
+def point_in_time_copy(
+    source: str,
+    target: str,
+    throttle: Optional[Callable[[int], None]]=None
+) -> str:
+    """
+    建立檔案的時間點副本，優先使用reflink，不支援時完整複製。
+    不使用硬連結，副本不與伺服器寫入的檔案共用內容，也不需在複製後持有來源檔案。
+
+    source: :class:`str`
+        來源檔案。
+    target: :class:`str`
+        目標檔案。
+    throttle: :class:`Callable[[int], None] | None`
+        完整複製時每讀取一段資料後以位元組數呼叫，可等待以限制頻寬。
+
+    return: :class:`str`
+        使用的方式，`reflink`或`copy`。
+    """
+    makedirs(dirname(target), exist_ok=True)
+    if _reflink(source, target):
+        return "reflink"
+    _copy(source, target, throttle)
+    return "copy"
+
+def take_snapshot(
+    source_dir: str,
+    paths: list[str],
+    staging_dir: str,
+    throttle: Optional[Callable[[int], None]]=None
+) -> dict[str, int]:
+    """
+    將`paths`以時間點副本的方式放入暫存資料夾。
+
+    source_dir: :class:`str`
+        來源根目錄。
+    paths: :class:`list[str]`
+        相對路徑，資料夾會遞迴處理。
+    staging_dir: :class:`str`
+        暫存資料夾。
+    throttle: :class:`Callable[[int], None] | None`
+        完整複製時每讀取一段資料後以位元組數呼叫，可等待以限制頻寬。
+
+    return: :class:`dict[str, int]`
+        各方式使用的次數。
+    """
+    methods = {"reflink": 0, "copy": 0}
+    makedirs(staging_dir, exist_ok=True)
+    for path in paths:
+        full_path = join(source_dir, path)
+        if isdir(full_path):
+            for dir_path, _, file_names in walk(full_path):
+                makedirs(join(staging_dir, relpath(dir_path, source_dir)), exist_ok=True)
+                for file_name in file_names:
+                    file_path = join(dir_path, file_name)
+                    methods[point_in_time_copy(file_path, join(staging_dir, relpath(file_path, source_dir)), throttle)] += 1
+        elif isfile(full_path):
+            methods[point_in_time_copy(full_path, join(staging_dir, path), throttle)] += 1
+    return methods
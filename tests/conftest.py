@@ -0,0 +1,22 @@
+from os import remove, _exit
+from os.path import abspath, dirname, join
+import sys
+
+ROOT = dirname(dirname(abspath(__file__)))
+sys.path.insert(0, ROOT)
+sys.path.insert(0, join(ROOT, "tools"))
+
+from isolated_config import use_isolated_config
+# 於匯入`modules`之前指定，不對設置檔中的實際伺服器建立連線
+CONFIG_PATH = use_isolated_config(ROOT)
+
+_exit_status = 0
+
+def pytest_sessionfinish(session, exitstatus):
+    global _exit_status
+    _exit_status = int(exitstatus)
+
+def pytest_unconfigure(config):
+    remove(CONFIG_PATH)
+    # 背景線程(設置檔、RCON_Engine)不會自行結束
+    _exit(_exit_status)
@@ -0,0 +1,44 @@
+"""
+排程重新載入測試。
+
+用法(於專案根目錄):
+    python -m pytest -q tests
+"""
+from datetime import datetime, time as d_time, timedelta, timezone
+import modules
+from modules.config import _Time_Data
+from modules.rcon import MODE_SAVE
+from modules.scheduler import JOB_RESTART, JOB_SAVE, Save_Scheduler, next_fire_time
+
+TIME_ZONE = timezone(timedelta(hours=8))
+NOON = _Time_Data(d_time(12, 0), False)
+# 12:00 的排程提前5分鐘於11:55觸發
+DUE = datetime(2024, 1, 1, 11, 55, tzinfo=TIME_ZONE)
+
+def _tables(*time_datas: _Time_Data) -> list:
+    return [(JOB_SAVE, {"0": time_datas}), (JOB_RESTART, {})]
+
+def test_first_build_skips_past_entries():
+    heap = Save_Scheduler._build(DUE + timedelta(seconds=30), _tables(NOON))
+    assert heap[0][0] == DUE + timedelta(days=1)
+
+def test_reload_at_due_minute_keeps_pending_entry():
+    previous = Save_Scheduler._build(DUE - timedelta(hours=1), _tables(NOON))
+    assert previous[0][0] == DUE
+    heap = Save_Scheduler._build(DUE + timedelta(seconds=30), _tables(NOON, _Time_Data(d_time(18, 0), False)), previous)
+    assert heap[0][0] == DUE
+
+def test_reload_fires_new_entry_within_grace():
+    now = DUE + timedelta(minutes=2)
+    heap = Save_Scheduler._build(now, _tables(NOON), [])
+    assert heap[0][0] == DUE
+    assert next_fire_time(NOON, now + timedelta(minutes=10), grace=timedelta(minutes=5)) == DUE + timedelta(days=1)
+
+def test_reload_keeps_fired_entry_for_tomorrow():
+    tomorrow = DUE + timedelta(days=1)
+    previous = [(tomorrow, 0, JOB_SAVE, "0", NOON)]
+    heap = Save_Scheduler._build(DUE + timedelta(seconds=30), _tables(NOON), previous)
+    assert heap[0][0] == tomorrow
+
+def test_package_mode_constants():
+    assert modules.MODE_SAVE == MODE_SAVE == 0
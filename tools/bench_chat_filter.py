@@ -0,0 +1,123 @@
+"""
+聊天過濾效能測試。
+
+比較舊版逐條比對(`_text_retouch` + `_text_verify`)與`Chat_Filter`的每秒處理訊息數。
+
+用法:
+    python tools/bench_chat_filter.py [--corpus ark-logs/discord.log] [--lines 200000] [--table 0]
+"""
+from argparse import ArgumentParser
+from os.path import join
+from random import Random
+from time import perf_counter
+import json
+
+from isolated_config import ROOT, load_module
+
+def _text_retouch(text):
+    if text == "": return None
+    while text[0] == " ":
+        text = text[1:]
+        if text == "": return None
+    while text[-1] == " ":
+        text = text[:-1]
+        if text == "": return None
+    return text
+
+def _text_verify(text, ban_dict):
+    if len(ban_dict["startswith"]) != 0:
+        if text.startswith(tuple(ban_dict["startswith"])): return False
+    for string in  ban_dict["include"]:
+        if string in text: return False
+    if len(ban_dict["endswith"]) != 0:
+        if text.endswith(tuple(ban_dict["endswith"])): return False
+    return True
+
+def legacy_parse(chat_message, ban_dict):
+    result = []
+    for message in chat_message.split("\n"):
+        message = _text_retouch(message)
+        if message == None:
+            continue
+        if _text_verify(message, ban_dict):
+            if message.startswith("部落"):
+                tribe = message[2:message.find(", ID ")]
+                if message.find("\">") != -1:
+                    message = message[message.find("\">")+2:-4]
+                else:
+                    message = message.split(": ")[2][: -1]
+                    message = message.replace("部落成員", "")
+                    message = message.replace("你的部落", "")
+                message = _text_retouch(message)
+                if message == None:
+                    continue
+                message = f"<{tribe}>{message}"
+            result.append(message)
+    return result
+
+def compiled_parse(chat_message, chat_filter, split_chat):
+    result = []
+    for message in split_chat(chat_message):
+        message = chat_filter.parse_line(message)
+        if message != None:
+            result.append(message)
+    return result
+
+def synthetic_corpus(ban_dict, lines, seed=0):
+    random = Random(seed)
+    names = ["Alice", "Bob", "小明", "Survivor", "阿龍"]
+    samples = [
+        "{name} ({name}): hello everyone",
+        "{name} ({name}): 有人要一起去打王嗎？",
+        "SERVER: Server will save in 5 min.",
+        "部落 Dragons, ID 123456789: Day 12, 08:15:30: <RichColor Color=\"1, 0, 0, 1\">{name} 被自動摧毀了！</>)",
+        "部落 Dragons, ID 123456789: Day 12, 08:15:30: 部落成員 {name} 放置了 存儲箱 ",
+        "部落 Dragons, ID 123456789: Day 12, 08:15:30: 你的部落 {name} 升級了 地基 ",
+        "{name} has entered your zone.",
+    ]
+    samples += [f"{{name}}: {string}" for string in ban_dict["include"]]
+    padding = " " * 40
+    return [
+        padding + random.choice(samples).format(name=random.choice(names)) + padding
+        for _ in range(lines)
+    ]
+
+def run(label, func, batches):
+    start = perf_counter()
+    forwarded = 0
+    for batch in batches:
+        forwarded += len(func(batch))
+    elapsed = perf_counter() - start
+    total = sum(batch.count("\n") + 1 for batch in batches)
+    print(f"{label:<10}{total / elapsed:>14,.0f} messages/s  ({forwarded} forwarded, {elapsed:.3f} s)")
+    return forwarded
+
+def main():
+    parser = ArgumentParser()
+    parser.add_argument("--corpus", help="以行為單位的聊天紀錄，未指定時使用合成資料。")
+    parser.add_argument("--lines", type=int, default=200000)
+    parser.add_argument("--batch", type=int, default=20, help="每次GetChat回覆的行數。")
+    parser.add_argument("--table", default="0", help="config-example.json中的m_filter_tables鍵值。")
+    args = parser.parse_args()
+
+    with open(join(ROOT, "config-example.json"), mode="r", encoding="utf-8") as example_file:
+        ban_dict = json.load(example_file)["other_setting"]["m_filter_tables"][args.table]
+    if args.corpus:
+        with open(args.corpus, mode="r", encoding="utf-8") as corpus_file:
+            lines = corpus_file.read().split("\n")
+        lines = (lines * (args.lines // max(len(lines), 1) + 1))[:args.lines]
+    else:
+        lines = synthetic_corpus(ban_dict, args.lines)
+    batches = ["\n".join(lines[i:i + args.batch]) for i in range(0, len(lines), args.batch)]
+
+    chat_filter_module = load_module("chat_filter", "modules", "chat_filter.py")
+    chat_filter = chat_filter_module.Chat_Filter(ban_dict)
+    split_chat = chat_filter_module.split_chat
+
+    legacy = run("legacy", lambda batch: legacy_parse(batch, ban_dict), batches)
+    compiled = run("compiled", lambda batch: compiled_parse(batch, chat_filter, split_chat), batches)
+    if legacy != compiled:
+        print(f"WARNING: forwarded count differs ({legacy} != {compiled})")
+
+if __name__ == "__main__":
+    main()
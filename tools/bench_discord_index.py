@@ -0,0 +1,130 @@
+"""
+Discord 訊息路由效能測試。
+
+比較舊版逐一掃描(`_search_rcon`兩次、身分組列表與前綴逐一比對)與`Message_Index`，
+輸出不同伺服器與前綴數量下，每則訊息的處理延遲。
+
+用法:
+    python tools/bench_discord_index.py [--servers 5 50 500] [--prefixs 2 20] [--messages 100000]
+"""
+from argparse import ArgumentParser
+from random import Random
+from time import perf_counter_ns
+from types import SimpleNamespace
+
+from isolated_config import load_module
+
+ADMIN_ROLE = 1000
+
+def fake_servers(count):
+    return [
+        SimpleNamespace(
+            discord=SimpleNamespace(chat_channel=10000 + i),
+            rcon_session=SimpleNamespace(name=f"Server{i}")
+        )
+        for i in range(count)
+    ]
+
+def fake_channels(servers):
+    # 模擬`Config.current.channels`
+    channels = {}
+    for server in servers:
+        channels.setdefault(server.discord.chat_channel, server)
+    return channels
+
+def fake_prefixs(count):
+    return ["!"] + [f"ark{i}!" for i in range(count - 1)]
+
+def fake_messages(servers, prefixs, count, seed=0):
+    random = Random(seed)
+    messages = []
+    for _ in range(count):
+        # 約半數訊息來自非伺服器頻道
+        if random.random() < 0.5:
+            channel_id = random.choice(servers).discord.chat_channel
+        else:
+            channel_id = random.randrange(1, 10000)
+        roles = [SimpleNamespace(id=random.randrange(1, 999)) for _ in range(random.randrange(1, 8))]
+        if random.random() < 0.8:
+            roles.append(SimpleNamespace(id=ADMIN_ROLE))
+        prefix = random.choice(prefixs) if random.random() < 0.8 else ""
+        messages.append(
+            SimpleNamespace(
+                channel=SimpleNamespace(id=channel_id),
+                author=SimpleNamespace(roles=roles),
+                content=f"{prefix}c saveworld 5"
+            )
+        )
+    return messages
+
+def legacy_route(message, servers, admin_role, prefixs):
+    def search_rcon(channel_id):
+        for server_config in servers:
+            if channel_id == server_config.discord.chat_channel:
+                return server_config.rcon_session
+        return None
+    if search_rcon(message.channel.id) == None: return None
+    if admin_role not in [role.id for role in message.author.roles]: return None
+    content = message.content
+    if not content.startswith(tuple(prefixs)): return None
+    for prefix in prefixs:
+        if content.startswith(prefix):
+            content = content[len(prefix):]
+            break
+    return search_rcon(message.channel.id), content
+
+def indexed_route(message, index):
+    rcon_session = index.rcon_session(message.channel.id)
+    if rcon_session == None: return None
+    if not index.is_admin(role.id for role in message.author.roles): return None
+    prefix_length = index.prefixs.match(message.content)
+    if prefix_length == None: return None
+    return rcon_session, message.content[prefix_length:]
+
+def measure(route, messages):
+    latencies = []
+    routed = 0
+    for message in messages:
+        start = perf_counter_ns()
+        result = route(message)
+        latencies.append(perf_counter_ns() - start)
+        if result != None:
+            routed += 1
+    latencies.sort()
+    return latencies, routed
+
+def _percentile(values, percent):
+    return values[min(len(values) - 1, int(len(values) * percent))]
+
+def main():
+    parser = ArgumentParser()
+    parser.add_argument("--servers", type=int, nargs="+", default=[5, 50, 500])
+    parser.add_argument("--prefixs", type=int, nargs="+", default=[2, 20])
+    parser.add_argument("--messages", type=int, default=100000)
+    args = parser.parse_args()
+
+    Message_Index = load_module("message_index", "modules", "message_index.py").Message_Index
+    print(f"{'servers':>8}{'prefixs':>8}  {'':<8}{'p50 ns':>10}{'p95 ns':>10}{'p99 ns':>10}{'mean ns':>10}")
+    for server_count in args.servers:
+        for prefix_count in args.prefixs:
+            servers = fake_servers(server_count)
+            prefixs = fake_prefixs(prefix_count)
+            messages = fake_messages(servers, prefixs, args.messages)
+            index = Message_Index(fake_channels(servers), (ADMIN_ROLE,), prefixs)
+            results = {}
+            for label, route in (
+                ("legacy", lambda message: legacy_route(message, servers, ADMIN_ROLE, prefixs)),
+                ("indexed", lambda message: indexed_route(message, index))
+            ):
+                latencies, routed = measure(route, messages)
+                results[label] = routed
+                print(
+                    f"{server_count:>8}{prefix_count:>8}  {label:<8}"
+                    f"{_percentile(latencies, 0.5):>10}{_percentile(latencies, 0.95):>10}"
+                    f"{_percentile(latencies, 0.99):>10}{sum(latencies) / len(latencies):>10.0f}"
+                )
+            if results["legacy"] != results["indexed"]:
+                print(f"WARNING: routed count differs ({results['legacy']} != {results['indexed']})")
+
+if __name__ == "__main__":
+    main()
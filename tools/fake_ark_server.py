@@ -0,0 +1,216 @@
+"""
+本地端ARK RCON模擬伺服器。
+
+使用與`rcon.source.Client`相同的Source RCON協定，提供`GetChat`、`SaveWorld`、`DoExit`、
+`ListPlayers`、`DestroyWildDinoClasses`等指令的腳本化回覆，並可設定延遲與斷線。
+
+用法:
+    python tools/fake_ark_server.py --port 27020 --password test [--latency 0.01] [--chat-rate 1]
+"""
+from argparse import ArgumentParser
+import asyncio
+from random import Random
+from struct import pack, unpack
+from time import perf_counter
+from typing import Callable, Optional, Union
+
+SERVERDATA_AUTH = 3
+SERVERDATA_AUTH_RESPONSE = 2
+SERVERDATA_EXECCOMMAND = 2
+SERVERDATA_RESPONSE_VALUE = 0
+EMPTY_REPLY = "Server received, But no response!! \n "
+
+DEFAULT_RESPONSES: dict[str, Union[str, Callable[["Fake_Ark_Server", str], str]]] = {
+    "saveworld": "World Saved \n ",
+    "save": "World Saved \n ",
+    "doexit": "Exiting... \n ",
+    "listplayers": lambda server, _: server.list_players(),
+    "destroywilddinoclasses": EMPTY_REPLY,
+    "destroywilddinos": "All Wild Dinos Destroyed \n ",
+    "broadcast": EMPTY_REPLY,
+    "": EMPTY_REPLY,
+}
+
+def pack_packet(request_id: int, packet_type: int, payload: bytes) -> bytes:
+    body = pack("<ii", request_id, packet_type) + payload + b"\x00\x00"
+    return pack("<i", len(body)) + body
+
+async def read_packet(reader: asyncio.StreamReader) -> tuple[int, int, bytes]:
+    size, = unpack("<i", await reader.readexactly(4))
+    data = await reader.readexactly(size)
+    request_id, packet_type = unpack("<ii", data[:8])
+    return request_id, packet_type, data[8:-2]
+
+class Fake_Ark_Server():
+    """
+    模擬的ShooterGameServer RCON端。
+    """
+    def __init__(
+        self,
+        host: str="127.0.0.1",
+        port: int=0,
+        password: str="",
+        latency: float=0.0,
+        disconnect_rate: float=0.0,
+        responses: Optional[dict]=None,
+        seed: Optional[int]=None,
+        on_command: Optional[Callable[["Fake_Ark_Server", str], None]]=None
+    ) -> None:
+        """
+        初始化`Fake_Ark_Server()`
+
+        host: :class:`str`
+            監聽位址。
+        port: :class:`int`
+            監聽連接埠，0 表示自動分配。
+        password: :class:`str`
+            RCON 密碼。
+        latency: :class:`float`
+            每個指令的回覆延遲(秒)。
+        disconnect_rate: :class:`float`
+            每個指令後主動斷線的機率。
+        responses: :class:`dict | None`
+            額外或覆寫的指令回覆，鍵為小寫指令名稱。
+        seed: :class:`int | None`
+            隨機種子。
+        on_command: :class:`Callable[[Fake_Ark_Server, str], None] | None`
+            收到指令時呼叫，於事件迴圈中執行。
+
+        return: :class:`None`
+        """
+        self.host = host
+        self.port = port
+        self.password = password
+        self.latency = latency
+        self.disconnect_rate = disconnect_rate
+        self.responses = DEFAULT_RESPONSES.copy()
+        self.responses.update(responses or {})
+        self.players: list[str] = []
+        self.chat: list[str] = []
+        self.log: list[tuple[float, str]] = []
+        self.commands = 0
+        self.connections = 0
+        self.running = True
+        self.on_command = on_command
+        self._random = Random(seed)
+        self._server: Optional[asyncio.base_events.Server] = None
+        self._writers: set[asyncio.StreamWriter] = set()
+
+    async def start(self) -> int:
+        """
+        開始監聽，回傳實際連接埠。
+
+        return: :class:`int`
+        """
+        self._server = await asyncio.start_server(self._handle, self.host, self.port)
+        self.port = self._server.sockets[0].getsockname()[1]
+        self.running = True
+        return self.port
+
+    async def stop(self) -> None:
+        """
+        停止監聽並中斷所有連線，模擬伺服器關閉。
+
+        return: :class:`None`
+        """
+        self.running = False
+        if self._server != None:
+            self._server.close()
+            await self._server.wait_closed()
+            self._server = None
+        for writer in list(self._writers):
+            writer.close()
+
+    def push_chat(self, line: str) -> None:
+        """
+        新增一行聊天訊息，於下次`GetChat`時回傳。
+
+        line: :class:`str`
+            訊息。
+
+        return: :class:`None`
+        """
+        self.chat.append(line)
+
+    def list_players(self) -> str:
+        if not self.players:
+            return "No Players Connected \n "
+        return "\n".join(f"{i}. {name}, {76561190000000000 + i}" for i, name in enumerate(self.players)) + "\n "
+
+    def reply(self, command: str) -> str:
+        """
+        產生指令回覆。
+
+        command: :class:`str`
+            指令。
+
+        return: :class:`str`
+        """
+        name = command.split(" ", 1)[0].lower()
+        if name == "getchat":
+            if not self.chat:
+                return EMPTY_REPLY
+            chat, self.chat = self.chat, []
+            return "\n".join(chat) + "\n "
+        response = self.responses.get(name, EMPTY_REPLY)
+        if callable(response):
+            return response(self, command)
+        return response
+
+    async def _handle(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        self.connections += 1
+        self._writers.add(writer)
+        try:
+            while self.running:
+                request_id, packet_type, payload = await read_packet(reader)
+                if packet_type == SERVERDATA_AUTH:
+                    valid = payload.decode("utf-8") == self.password
+                    writer.write(pack_packet(request_id, SERVERDATA_RESPONSE_VALUE, b""))
+                    writer.write(pack_packet(request_id if valid else -1, SERVERDATA_AUTH_RESPONSE, b""))
+                    await writer.drain()
+                    if not valid:
+                        break
+                    continue
+                command = payload.decode("utf-8")
+                self.commands += 1
+                self.log.append((perf_counter(), command))
+                if self.on_command != None:
+                    self.on_command(self, command)
+                if self.latency > 0:
+                    await asyncio.sleep(self.latency)
+                writer.write(pack_packet(request_id, SERVERDATA_RESPONSE_VALUE, self.reply(command).encode("utf-8")))
+                await writer.drain()
+                if command.lower() == "doexit":
+                    asyncio.get_running_loop().create_task(self.stop())
+                    break
+                if self.disconnect_rate > 0 and self._random.random() < self.disconnect_rate:
+                    break
+        except (asyncio.IncompleteReadError, ConnectionError):
+            pass
+        finally:
+            self._writers.discard(writer)
+            writer.close()
+
+async def _main(args) -> None:
+    server = Fake_Ark_Server(args.host, args.port, args.password, args.latency, args.disconnect_rate)
+    port = await server.start()
+    print(f"Fake ARK RCON listening on {args.host}:{port}")
+    i = 0
+    while True:
+        await asyncio.sleep(1 / args.chat_rate if args.chat_rate > 0 else 3600)
+        if args.chat_rate > 0:
+            i += 1
+            server.push_chat(f"Survivor (Survivor): message {i}")
+
+if __name__ == "__main__":
+    parser = ArgumentParser()
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=27020)
+    parser.add_argument("--password", default="")
+    parser.add_argument("--latency", type=float, default=0.0)
+    parser.add_argument("--disconnect-rate", type=float, default=0.0)
+    parser.add_argument("--chat-rate", type=float, default=0.0, help="每秒產生的聊天訊息數。")
+    try:
+        asyncio.run(_main(parser.parse_args()))
+    except KeyboardInterrupt:
+        pass
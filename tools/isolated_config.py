@@ -0,0 +1,108 @@
+"""
+工具共用的設置與模組載入。
+
+`use_isolated_config()`複製專案的設置檔(不存在時使用範例)並清空伺服器列表，寫入暫存檔後以環境變數`ARK_CONFIG`指定，
+`modules.config`匯入時便不會對`config.json`中的實際伺服器建立RCON連線，需於匯入任何`modules`之前呼叫。
+"""
+from importlib.util import module_from_spec, spec_from_file_location
+from json import dump, load
+from os import environ
+from os.path import abspath, dirname, isfile, join
+from tempfile import mkstemp
+from types import ModuleType
+
+ROOT = dirname(dirname(abspath(__file__)))
+
+def use_isolated_config(root: str=ROOT) -> str:
+    """
+    建立並指定獨立的設置檔。
+
+    root: :class:`str`
+        專案根目錄。
+
+    return: :class:`str`
+        暫存設置檔路徑，結束時由呼叫端刪除。
+    """
+    source_path = join(root, "config.json")
+    if not isfile(source_path):
+        source_path = join(root, "config-example.json")
+    with open(source_path, mode="r", encoding="utf-8") as source_file:
+        data = load(source_file)
+    data["servers"] = []
+    fd, path = mkstemp(prefix="ark-tool-", suffix=".json")
+    with open(fd, mode="w", encoding="utf-8") as config_file:
+        dump(data, config_file, ensure_ascii=False, indent=4)
+    environ["ARK_CONFIG"] = path
+    return path
+
+def load_module(name: str, *path: str) -> ModuleType:
+    """
+    直接載入專案中的模組檔案，不執行所屬套件的`__init__.py`。
+    `modules/__init__.py`會啟動設置檔與系統狀態線程，`discord_bot/__init__.py`會匯入Discord 套件。
+
+    name: :class:`str`
+        模組名稱。
+    path: :class:`str`
+        相對於專案根目錄的路徑。
+
+    return: :class:`ModuleType`
+    """
+    spec = spec_from_file_location(name, join(ROOT, *path))
+    module = module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+def fake_server_config(
+    name: str,
+    index: int,
+    port: int,
+    password: str,
+    dir_path: str,
+    save_table: str="",
+    restart_table: str=""
+):
+    """
+    建立連線至`Fake_Ark_Server`的伺服器設置，需於`use_isolated_config()`之後呼叫。
+
+    name: :class:`str`
+        名稱前綴，與`index`組成`key`與顯示名稱。
+    index: :class:`int`
+        編號，同時作為聊天與狀態頻道ID。
+    port: :class:`int`
+        模擬伺服器的連接埠。
+    password: :class:`str`
+        RCON 密碼。
+    dir_path: :class:`str`
+        伺服器資料夾。
+    save_table: :class:`str`
+        存檔表名稱。
+    restart_table: :class:`str`
+        重啟表名稱。
+
+    return: :class:`_Ark_Server`
+    """
+    from modules.config import Config, _Ark_Server
+    return _Ark_Server(
+        {
+            "key": f"{name}{index}",
+            "local": True,
+            "dir_path": dir_path,
+            "file_name": "TheIsland.ark",
+            "display_name": f"{name}{index}",
+            "rcon": {
+                "address": "127.0.0.1",
+                "port": port,
+                "password": password,
+                "timeout": 10,
+                "m_filter": next(iter(Config.other_setting.m_filter_tables)),
+            },
+            "discord": {
+                "chat_channel": index,
+                "state_channel": index,
+                "message_forward": False,
+            },
+            "save": save_table,
+            "restart": restart_table,
+            "clear_dino": False,
+        }
+    )
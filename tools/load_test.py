@@ -0,0 +1,140 @@
+"""
+多伺服器RCON壓力測試。
+
+啟動 N 個`Fake_Ark_Server`，為每個伺服器建立`Rcon_Session`，持續送出指令與聊天訊息，
+統計指令吞吐量、聊天訊息進入Discord佇列的延遲、CPU 使用量與線程數。
+
+加上`--bridge`時，聊天訊息改由`Chat_Bridge`推送至獨立的事件迴圈，延遲量測至送出為止(含合併等待)。
+
+以config.json(不存在時為config-example.json)中伺服器以外的設置執行，不會連線至設置檔中的伺服器。
+
+用法(於專案根目錄):
+    python tools/load_test.py --servers 20 --duration 30 --command-rate 5 --chat-rate 2 [--bridge]
+"""
+from argparse import ArgumentParser
+import asyncio
+from os import chdir, remove, _exit
+from os.path import dirname, abspath
+import sys
+import threading
+from time import perf_counter, sleep
+
+ROOT = dirname(dirname(abspath(__file__)))
+chdir(ROOT)
+sys.path.insert(0, ROOT)
+
+from isolated_config import fake_server_config, load_module, use_isolated_config
+# 不對設置檔中的實際伺服器建立連線
+CONFIG_PATH = use_isolated_config(ROOT)
+
+from fake_ark_server import Fake_Ark_Server
+from modules.config import Config
+from modules.rcon import Rcon_Session, TAG_DISCORD, TAG_WEB
+from modules.threading import Thread
+import psutil
+
+_CHAT_MARK = "lt:"
+
+def _percentile(values: list[float], percent: float) -> float:
+    if not values:
+        return 0.0
+    values = sorted(values)
+    return values[min(len(values) - 1, int(len(values) * percent))]
+
+def main():
+    parser = ArgumentParser()
+    parser.add_argument("--servers", type=int, default=10)
+    parser.add_argument("--duration", type=float, default=30)
+    parser.add_argument("--command-rate", type=float, default=2, help="每台伺服器每秒送出的指令數。")
+    parser.add_argument("--chat-rate", type=float, default=1, help="每台伺服器每秒產生的聊天訊息數。")
+    parser.add_argument("--latency", type=float, default=0.005, help="模擬伺服器的指令延遲(秒)。")
+    parser.add_argument("--disconnect-rate", type=float, default=0.0)
+    parser.add_argument("--bridge", action="store_true", help="以Chat_Bridge推送聊天訊息，取代輪詢。")
+    args = parser.parse_args()
+
+    while not Config.updated: sleep(0.1)
+
+    # 模擬伺服器在獨立的事件迴圈中執行，不與RCON_Engine共用
+    fake_loop = asyncio.new_event_loop()
+    Thread(target=fake_loop.run_forever, name="Fake_Ark_Servers", daemon=True).start()
+    fake_servers: list[Fake_Ark_Server] = []
+    for i in range(args.servers):
+        fake_server = Fake_Ark_Server(password="load", latency=args.latency, disconnect_rate=args.disconnect_rate, seed=i)
+        asyncio.run_coroutine_threadsafe(fake_server.start(), fake_loop).result()
+        fake_servers.append(fake_server)
+
+    base_threads = threading.active_count()
+    sessions = [Rcon_Session(fake_server_config("Load", i, server.port, "load", f"load-test/Server{i}")) for i, server in enumerate(fake_servers)]
+    while not all(session.rcon_alive for session in sessions): sleep(0.1)
+    print(f"{len(sessions)} sessions connected.")
+    chat_latency: list[float] = []
+
+    if args.bridge:
+        async def deliver(messages: list[dict]) -> None:
+            now = perf_counter()
+            for data in messages:
+                reply: str = data["reply"]
+                if _CHAT_MARK in reply:
+                    chat_latency.append(now - float(reply.split(_CHAT_MARK, 1)[1]))
+
+        async def start_bridge() -> None:
+            bridge = Chat_Bridge(asyncio.get_running_loop())
+            for session in sessions:
+                bridge.attach(session)
+            asyncio.get_running_loop().create_task(bridge.run(deliver))
+
+        Chat_Bridge = load_module("bridge", "discord_bot", "bridge.py").Chat_Bridge
+        bridge_loop = asyncio.new_event_loop()
+        Thread(target=bridge_loop.run_forever, name="Chat_Bridge", daemon=True).start()
+        asyncio.run_coroutine_threadsafe(start_bridge(), bridge_loop).result()
+
+    process = psutil.Process()
+    process.cpu_percent()
+    cpu_start = process.cpu_times()
+    futures = []
+    chat_sent = 0
+    start_time = perf_counter()
+    next_command = next_chat = start_time
+    while perf_counter() - start_time < args.duration:
+        now = perf_counter()
+        if args.command_rate > 0 and now >= next_command:
+            for session in sessions:
+                futures.append(session.add("ListPlayers", TAG_WEB, reply=False))
+            next_command += 1 / args.command_rate
+        if args.chat_rate > 0 and now >= next_chat:
+            for server in fake_servers:
+                fake_loop.call_soon_threadsafe(server.push_chat, f"Survivor (Survivor): {_CHAT_MARK}{perf_counter()}")
+                chat_sent += 1
+            next_chat += 1 / args.chat_rate
+        if not args.bridge:
+            for session in sessions:
+                data = session.get(TAG_DISCORD)
+                while data != None:
+                    reply: str = data["reply"]
+                    if _CHAT_MARK in reply:
+                        chat_latency.append(perf_counter() - float(reply.split(_CHAT_MARK, 1)[1]))
+                    data = session.get(TAG_DISCORD)
+        sleep(0.001)
+    elapsed = perf_counter() - start_time
+    cpu_end = process.cpu_times()
+    cpu_percent = process.cpu_percent()
+    threads = threading.active_count()
+
+    done = [future for future in futures if future.done() and not future.cancelled() and future.exception() == None]
+    print(f"Servers:            {args.servers}")
+    print(f"Duration:           {elapsed:.1f} s")
+    print(f"Commands completed: {len(done)}/{len(futures)} ({len(done) / elapsed:.1f} cmd/s)")
+    print(f"RCON requests seen: {sum(server.commands for server in fake_servers) / elapsed:.1f} req/s (incl. GetChat)")
+    print(f"Chat delivered:     {len(chat_latency)}/{chat_sent}")
+    print(f"Chat latency:       p50 {_percentile(chat_latency, 0.5) * 1000:.1f} ms, p95 {_percentile(chat_latency, 0.95) * 1000:.1f} ms, max {max(chat_latency, default=0) * 1000:.1f} ms")
+    print(f"CPU:                {cpu_percent:.1f} % ({(cpu_end.user + cpu_end.system - cpu_start.user - cpu_start.system):.2f} s)")
+    print(f"Threads:            {threads} (before sessions: {base_threads})")
+    print(f"Connections:        {sum(server.connections for server in fake_servers)}")
+
+if __name__ == "__main__":
+    try:
+        main()
+    finally:
+        remove(CONFIG_PATH)
+    # 背景線程(設置檔、系統狀態、RCON_Engine)不會自行結束
+    _exit(0)
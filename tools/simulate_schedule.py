@@ -0,0 +1,198 @@
+"""
+排程模擬。
+
+以虛擬時鐘(`modules.clock.Clock`)加速時間，對數個`Fake_Ark_Server`執行設置檔中的存檔與重啟表，
+輸出每次排程、公告、存檔、備份與重啟的時間軸，可用於比對調整排程前後的差異。
+RCON 連線本身仍以實際時間執行，因此指令往返與重連在時間軸上會依倍率放大(3600倍時約數秒至十餘分鐘)。
+
+以config.json(不存在時為config-example.json)中伺服器以外的設置執行，不會連線至設置檔中的伺服器。
+
+用法(於專案根目錄):
+    python tools/simulate_schedule.py --servers 3 --hours 24 --speed 3600 [--output timeline.txt]
+"""
+from argparse import ArgumentParser
+import asyncio
+from datetime import datetime, time as d_time
+import logging
+from os import chdir, makedirs, remove, _exit
+from os.path import abspath, dirname, join
+import sys
+from shutil import rmtree
+from tempfile import mkdtemp
+from threading import Lock
+from time import sleep
+
+ROOT = dirname(dirname(abspath(__file__)))
+chdir(ROOT)
+sys.path.insert(0, ROOT)
+
+from isolated_config import fake_server_config, use_isolated_config
+# 不對設置檔中的實際伺服器建立連線
+CONFIG_PATH = use_isolated_config(ROOT)
+
+from fake_ark_server import Fake_Ark_Server
+from modules.clock import Clock
+from modules.config import Config
+from modules.rcon import Rcon_Session
+from modules.reconnect import Connect_Budget, Reconnect_Supervisor
+from modules.scheduler import Save_Scheduler
+from modules.threading import Thread
+
+_SAVED_ARKS = "ShooterGame\\Saved\\SavedArks"
+
+class Timeline():
+    """
+    以虛擬時間記錄事件。
+    """
+    def __init__(self) -> None:
+        self.events: list[tuple[float, str, str, str]] = []
+        self._lock = Lock()
+
+    def record(self, server: str, kind: str, detail: str="") -> None:
+        with self._lock:
+            self.events.append((Clock.time(), server, kind, detail))
+
+    def lines(self) -> list[str]:
+        with self._lock:
+            events = sorted(self.events, key=lambda event: event[0])
+        return [
+            f"{datetime.fromtimestamp(timestamp, Config.time_setting.time_zone).replace(microsecond=0, tzinfo=None).isoformat()} [{server}] {kind} {detail}".rstrip()
+            for timestamp, server, kind, detail in events
+        ]
+
+class _Schedule_Handler(logging.Handler):
+    """
+    將排程觸發的紀錄寫入時間軸。
+    """
+    def __init__(self, timeline: Timeline) -> None:
+        super().__init__(logging.INFO)
+        self.timeline = timeline
+
+    def emit(self, record: logging.LogRecord) -> None:
+        message = record.getMessage()
+        if message.startswith("Schedule "):
+            self.timeline.record("scheduler", "schedule", message[len("Schedule "):])
+
+class Sim_Session(Rcon_Session):
+    """
+    以模擬伺服器取代實際程序啟動與偵測的`Rcon_Session`。
+    """
+    fake_server: Fake_Ark_Server
+    fake_loop: asyncio.AbstractEventLoop
+    timeline: Timeline
+
+    def start(self, tag: int) -> None:
+        self.timeline.record(self.server_config.display_name, "start")
+        asyncio.run_coroutine_threadsafe(self.fake_server.start(), self.fake_loop).result()
+        self.server_first_connect = True
+
+    def backup(self, tag: int, staging_dir=None):
+        job = super().backup(tag, staging_dir)
+        if job != None:
+            job.future.add_done_callback(
+                lambda future: self.timeline.record(
+                    self.server_config.display_name,
+                    "backup",
+                    f"{job.name} {job.state} {job.done_bytes} bytes {job.elapsed:.0f} s"
+                )
+            )
+        return job
+
+    def _process_alive(self) -> bool:
+        return self.fake_server.running
+
+def _on_command(timeline: Timeline, name: str, save_path: str, save_size: int):
+    def on_command(server: Fake_Ark_Server, command: str) -> None:
+        command_name = command.split(" ", 1)[0].lower()
+        if command_name == "broadcast":
+            timeline.record(name, "broadcast", command[len("Broadcast "):].split("\n", 1)[0])
+        elif command_name in ("save", "saveworld"):
+            # 模擬存檔改寫地圖檔
+            with open(save_path, mode="wb") as save_file:
+                save_file.write(bytes([len(timeline.events) % 256]) * save_size)
+            timeline.record(name, "save")
+        elif command_name == "doexit":
+            timeline.record(name, "exit")
+    return on_command
+
+def main():
+    parser = ArgumentParser()
+    parser.add_argument("--servers", type=int, default=3)
+    parser.add_argument("--hours", type=float, default=24)
+    parser.add_argument("--speed", type=float, default=3600, help="時間流逝倍率。")
+    parser.add_argument("--start", type=str, default=None, help="虛擬起始時間(ISO格式)，預設為今日00:00。")
+    parser.add_argument("--save-table", type=str, default=None)
+    parser.add_argument("--restart-table", type=str, default=None)
+    parser.add_argument("--save-size", type=int, default=1024 * 1024, help="模擬地圖檔大小(位元組)。")
+    parser.add_argument("--output", type=str, default=None)
+    args = parser.parse_args()
+
+    while not Config.updated: sleep(0.1)
+    time_zone = Config.time_setting.time_zone
+    if args.start != None:
+        start_time = datetime.fromisoformat(args.start).replace(tzinfo=time_zone)
+    else:
+        start_time = datetime.combine(datetime.now(time_zone).date(), d_time(0), tzinfo=time_zone)
+    save_table = args.save_table or next(iter(Config.time_setting.save_tables), "")
+    restart_table = args.restart_table or next(iter(Config.time_setting.restart_tables), "")
+    Clock.set_virtual(start_time.timestamp(), args.speed)
+    # RCON 連線使用實際時間，重連限制依加速倍率放寬
+    Connect_Budget.rate = Connect_Budget.capacity = Connect_Budget._tokens = 1000.0
+
+    timeline = Timeline()
+    logging.getLogger("main").addHandler(_Schedule_Handler(timeline))
+    logging.getLogger("main").setLevel(logging.INFO)
+
+    # 模擬伺服器在獨立的事件迴圈中執行
+    fake_loop = asyncio.new_event_loop()
+    Thread(target=fake_loop.run_forever, name="Fake_Ark_Servers", daemon=True).start()
+    work_dir = mkdtemp(prefix="ark-sim-")
+    sessions: list[Sim_Session] = []
+    server_configs = []
+    for i in range(args.servers):
+        dir_path = join(work_dir, f"Server{i}")
+        makedirs(join(dir_path, _SAVED_ARKS), exist_ok=True)
+        save_path = join(dir_path, _SAVED_ARKS, "TheIsland.ark")
+        with open(save_path, mode="wb") as save_file:
+            save_file.write(b"\0" * args.save_size)
+        fake_server = Fake_Ark_Server(password="sim", seed=i, on_command=_on_command(timeline, f"Sim{i}", save_path, args.save_size))
+        asyncio.run_coroutine_threadsafe(fake_server.start(), fake_loop).result()
+        server_config = fake_server_config("Sim", i, fake_server.port, "sim", dir_path, save_table, restart_table)
+        session = Sim_Session.__new__(Sim_Session)
+        session.fake_server = fake_server
+        session.fake_loop = fake_loop
+        session.timeline = timeline
+        Rcon_Session.__init__(session, server_config)
+        # 重連間隔依加速倍率縮短
+        session.supervisor = Reconnect_Supervisor(base_delay=0.001, max_delay=0.005, open_timeout=0.01)
+        server_config.rcon_session = session
+        sessions.append(session)
+        server_configs.append(server_config)
+    while not all(session.rcon_alive for session in sessions): sleep(0.01)
+    Config.use_servers(server_configs)
+
+    print(f"Simulating {args.hours} h from {start_time.isoformat()} at {args.speed:g}x, {args.servers} servers, save table {save_table!r}, restart table {restart_table!r}.")
+    Save_Scheduler.start()
+    end_time = start_time.timestamp() + args.hours * 3600
+    while Clock.time() < end_time:
+        sleep(0.05)
+
+    lines = timeline.lines()
+    if args.output != None:
+        with open(args.output, mode="w", encoding="utf-8") as output_file:
+            output_file.write("\n".join(lines) + "\n")
+    else:
+        print("\n".join(lines))
+    kinds: dict[str, int] = {}
+    for _, _, kind, _ in timeline.events:
+        kinds[kind] = kinds.get(kind, 0) + 1
+    print(f"Events: {kinds}")
+    rmtree(work_dir, True)
+
+if __name__ == "__main__":
+    try:
+        main()
+    finally:
+        remove(CONFIG_PATH)
+    # 背景線程(設置檔、RCON_Engine、排程)不會自行結束
+    _exit(0)
@@ -1,7 +1,10 @@
 from flask import Flask, render_template, redirect, request, Request, url_for
 import logging
+from modules.backup_pool import Backup_Pool
 from modules.config import Config
+from discord_bot.dispatcher import Discord_Dispatcher
 from modules.json import Json
+from modules.scheduler import Save_Scheduler
 from modules.system_state import State
 
 logger = logging.getLogger("main")
@@ -42,6 +45,51 @@ class Console():
     def api_system_state():
         return State.request_config
     
+    @app.route("/api/v1.0/rcon_metrics")
+    def api_rcon_metrics():
+        return Json.dumps(
+            {
+                server_config.key: server_config.rcon_session.metrics_info()
+                for server_config in Config.servers
+                if server_config.rcon_session != None
+            }
+        )
+    
+    @app.route("/api/v1.0/backup_jobs")
+    def api_backup_jobs():
+        return Json.dumps(
+            {
+                "pending": Backup_Pool.pending(),
+                "stats": Backup_Pool.stats(),
+                "jobs": Backup_Pool.jobs()
+            }
+        )
+    
+    @app.route("/api/v1.0/backups")
+    def api_backups():
+        server_key = request.args.get("server")
+        limit = request.args.get("limit", type=int)
+        return Json.dumps(
+            {
+                server_config.key: server_config.rcon_session.backups(limit)
+                for server_config in Config.servers
+                if server_config.rcon_session != None and server_key in (None, server_config.key)
+            }
+        )
+    
+    @app.route("/api/v1.0/schedule")
+    def api_schedule():
+        return Json.dumps(Save_Scheduler.upcoming(request.args.get("limit", 10, type=int)))
+    
+    @app.route("/api/v1.0/config_reload")
+    def api_config_reload():
+        return Json.dumps(dict(Config.last_reload))
+
+    @app.route("/api/v1.0/discord_queue")
+    def api_discord_queue():
+        dispatcher = Discord_Dispatcher.current
+        return Json.dumps({} if dispatcher == None else dispatcher.stats())
+    
     def run(self):
         self.app.run(
             host=Config.web_console.host,